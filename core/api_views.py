@@ -2,6 +2,8 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
+from notifications.models import Notification
+
 from .serializers import DashboardSerializer
 
 class DashboardAPIView(APIView):
@@ -12,7 +14,7 @@ class DashboardAPIView(APIView):
 
         balance = getattr(user.balance, 'amount', 0)
         vehicles_count = user.vehicles.count()
-        notifications_count = user.notifications.filter(is_read=False).count()
+        notifications_count = Notification.unread_count(user)
         unpaid_fines_count = user.fines.filter(is_paid=False).count()
 
         data = {
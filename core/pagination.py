@@ -0,0 +1,175 @@
+import base64
+from datetime import datetime
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+# ======================================================
+# 📜 PAGINATION PAR CURSEUR (KEYSET)
+# ======================================================
+# Tri (created_at DESC, id DESC). La page suivante se lit avec
+#   WHERE created_at < t OR (created_at = t AND id < pk)
+# au lieu d'un OFFSET : coût constant quelle que soit la profondeur,
+# et pas de COUNT(*). À adosser à un index (user, created_at, id).
+
+
+def encode_cursor(value, pk) -> str:
+    raw = f"{value.isoformat()}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor, pk_field=None):
+    """
+    (datetime, pk) ou None si le curseur est absent / invalide.
+    Avec `pk_field`, le pk est converti (UUID, int...) : un curseur
+    falsifié retombe sur la première page au lieu d'une erreur SQL.
+    """
+    if not cursor:
+        return None
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value, pk = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        value = parse_datetime(value)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+    if not isinstance(value, datetime) or not pk:
+        return None
+
+    if pk_field is not None:
+        try:
+            pk = pk_field.to_python(pk)
+        except (ValidationError, ValueError, TypeError):
+            return None
+
+    return value, pk
+
+
+class KeysetPage:
+    def __init__(self, object_list, next_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def keyset_paginate(queryset, cursor=None, page_size=20, field="created_at"):
+    """
+    Une page de `queryset` triée par (field DESC, pk DESC) après `cursor`.
+    Lit page_size + 1 lignes pour savoir s'il existe une suite.
+    """
+    queryset = queryset.order_by(f"-{field}", "-pk")
+
+    position = decode_cursor(cursor, queryset.model._meta.pk)
+    if position:
+        value, pk = position
+        queryset = queryset.filter(
+            Q(**{f"{field}__lt": value}) | Q(**{field: value, "pk__lt": pk})
+        )
+
+    rows = list(queryset[:page_size + 1])
+    next_cursor = None
+
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, field), last.pk)
+
+    return KeysetPage(rows, next_cursor)
+
+
+# ======================================================
+# VUES HTML ("CHARGER PLUS")
+# ======================================================
+class KeysetListMixin:
+    """
+    Pour une ListView : `page` (KeysetPage) dans le contexte et,
+    sur une requête htmx, seul `rows_template_name` est rendu
+    (lignes suivantes + bouton "Chaje plis").
+    """
+    page_size = 20
+    keyset_field = "created_at"
+    rows_template_name = None
+
+    def get_template_names(self):
+        if self.rows_template_name and self.request.headers.get("HX-Request"):
+            return [self.rows_template_name]
+        return super().get_template_names()
+
+    def get_context_data(self, **kwargs):
+        page = keyset_paginate(
+            self.object_list,
+            self.request.GET.get("cursor"),
+            self.page_size,
+            self.keyset_field,
+        )
+        return super().get_context_data(object_list=page.object_list, page=page, **kwargs)
+
+
+# ======================================================
+# API (DRF)
+# ======================================================
+class KeysetPagination(BasePagination):
+    """
+    Pagination DRF par curseur opaque sur (created_at, id).
+    La vue peut définir `keyset_field` pour un autre horodatage.
+    """
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    keyset_field = "created_at"
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page = keyset_paginate(
+            queryset,
+            request.query_params.get(self.cursor_query_param),
+            self.get_page_size(request),
+            getattr(view, "keyset_field", self.keyset_field),
+        )
+        return list(self.page)
+
+    def get_next_link(self):
+        if not self.page.has_next:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(), self.cursor_query_param, self.page.next_cursor
+        )
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "next_cursor": self.page.next_cursor,
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "next_cursor": {"type": "string", "nullable": True},
+                "results": schema,
+            },
+        }
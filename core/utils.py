@@ -1,40 +1,30 @@
 from decimal import Decimal
-from django.db.models import Sum
-from payments.models import BalanceCurrency
+from payments.services.exchange_rate_service import ExchangeRateService
+from payments.utils.balance_cache import get_cached_totals
 from payments.utils.formatting import format_balance
+from payments.utils.minor_units import from_minor
 
-TAUX_HTG = {
-    "usdt": Decimal("132.50"),
-    "btc": Decimal("8500000"),
-    "jmu": Decimal("0.001"),
-}
+def total_htg(soldes):
+    """
+    {devise: Decimal} ➜ total converti en HTG (devises sans taux ignorées).
+    """
+    return ExchangeRateService.total(soldes, "htg")
 
 def get_user_balances(user):
-    balances_qs = (
-        BalanceCurrency.objects
-        .filter(balance__user=user)
-        .values("currency")
-        .annotate(total=Sum("amount"))
-    )
+    """
+    Soldes formatés pour les templates.
+    Lus depuis le cache des soldes (aucun agrégat SQL si la clé est chaude).
+    """
+    totals = get_cached_totals(user.pk)
 
-    soldes = {
-        "btc": Decimal("0"),
-        "usdt": Decimal("0"),
-        "jmu": Decimal("0"),
-    }
+    soldes = {currency: Decimal("0") for currency in ExchangeRateService.get_rates()}
 
-    for b in balances_qs:
-        currency = b["currency"].lower()   # ✅ NORMALISATION
-        soldes[currency] = b["total"] or Decimal("0")
+    for currency, minor in totals.items():
+        soldes[currency] = from_minor(minor, currency)
 
-    solde_total_htg = sum(
-        (soldes[c] * TAUX_HTG[c] for c in soldes),
-        start=Decimal("0")   # ✅ START SAFE
-    )
+    solde_total_htg = total_htg(soldes)
 
     return {
-        "solde_btc": format_balance(soldes["btc"]),
-        "solde_usdt": format_balance(soldes["usdt"]),
-        "solde_jmu": format_balance(soldes["jmu"]),
+        **{f"solde_{c}": format_balance(v) for c, v in soldes.items()},
         "solde_total_htg": format_balance(solde_total_htg),
-    }
\ No newline at end of file
+    }
@@ -10,7 +10,7 @@ from vehicles.models import Vehicle
 from contracts.models import Contract
 from notifications.models import Notification
 from fines.models import Fine
-from payments.services.wallet_service import create_wallet_for_user
+from payments.services.wallet_service import get_wallet_for_user
 from users.models import Client, Employee, BusinessProfile, SimpleProfile 
 from documents.models import Document
 from django.contrib.auth import get_user_model
@@ -42,7 +42,7 @@ def dashboard_user(request):
     
     DEFAULT_NETWORK = "btc"
 
-    wallet = create_wallet_for_user(user=user, network=DEFAULT_NETWORK)
+    wallet = get_wallet_for_user(user=user, network=DEFAULT_NETWORK)
     
     # Debug info
     print("USER_TYPE =", request.user.user_type)
@@ -55,7 +55,7 @@ def dashboard_user(request):
     balances = get_user_balances(user)
 
     vehicles = Vehicle.objects.filter(owner_simple=user)
-    notifications = Notification.objects.filter(user=user, is_read=False)
+    notifications = Notification.unread_count(user)
     fines = Fine.objects.filter(driver=user, is_paid=False)
     documents = Document.objects.filter(user=user)
     clients = Client.objects.visible_for(request.user)
@@ -63,7 +63,7 @@ def dashboard_user(request):
 
     stats_cards = [
         {"icon": "🚗", "title": "Veyikil", "count": vehicles.count(), "url": reverse("vehicles:vehicles_list")},
-        {"icon": "🔔", "title": "Notifikasyon", "count": notifications.count(), "url": reverse("notifications:notification_list")},
+        {"icon": "🔔", "title": "Notifikasyon", "count": notifications, "url": reverse("notifications:notification_list")},
         {"icon": "📄", "title": "Kontravansyon", "count": fines.count(), "url": reverse("fines:fine_list")},
         {"icon": "📁", "title": "Dokiman", "count": documents.count(), "url": reverse("documents:document_list")},
         {"icon": "💰", "title": "Kontra", "count": contracts.count(), "url": reverse("contracts:contract_list")},
@@ -99,7 +99,7 @@ def dashboard_business(request):
 
     DEFAULT_NETWORK = "btc"
 
-    wallet = create_wallet_for_user(user=user, network=DEFAULT_NETWORK)
+    wallet = get_wallet_for_user(user=user, network=DEFAULT_NETWORK)
 
     print("USER_TYPE =", user.user_type)
     print("EMAIL =", user.email)
@@ -116,7 +116,7 @@ def dashboard_business(request):
 
     vehicles = Vehicle.objects.filter(owner=user)
     documents = Document.objects.filter(user=user)
-    notifications = Notification.objects.filter(user=user, is_read=False)
+    notifications = Notification.unread_count(user)
 
     # 🔥 QuerySet centralisé
     contracts = Contract.objects.visible_for(user)
@@ -128,7 +128,7 @@ def dashboard_business(request):
     stats_cards = [
         {"icon": "🚗", "title": "Veyikil", "count": vehicles.count(), "url": reverse("vehicles:vehicles_list")},
         {"icon": "📁", "title": "Dokiman", "count": documents.count(), "url": reverse("documents:document_list")},
-        {"icon": "🔔", "title": "Notifikasyon", "count": notifications.count(), "url": reverse("notifications:notification_list")},
+        {"icon": "🔔", "title": "Notifikasyon", "count": notifications, "url": reverse("notifications:notification_list")},
         {"icon": "👥", "title": "Kliyan", "count": clients.count(), "url": reverse("users:client_list")},
     ]
 
@@ -111,6 +111,7 @@ TEMPLATES = [
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
+                "notifications.context_processors.unread_notifications",
             ],
         },
     },
@@ -225,6 +226,21 @@ CHANNEL_LAYERS = {
     },
 }
 
+# Cache partagé (soldes, etc.) : Redis si configuré, sinon mémoire locale
+# Cache partagé par tous les processus (gunicorn, celery) : invalidation
+# des soldes / wallets, limite de débit du push. Même Redis que le broker
+# et le channel layer, base 1.
+REDIS_CACHE_URL = os.getenv("REDIS_CACHE_URL", "redis://127.0.0.1:6379/1")
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_CACHE_URL,
+    },
+}
+
+BALANCE_CACHE_TTL = int(os.getenv("BALANCE_CACHE_TTL", "300"))
+
 
 # Récupérer les valeurs des variables d'environnement
 TWILIO_ACCOUNT_SID = os.getenv("TWILIO_ACCOUNT_SID")
@@ -241,4 +257,66 @@ RECAPTCHA_SECRET_KEY = os.getenv("RECAPTCHA_SECRET_KEY")
 
 CELERY_BROKER_URL = 'redis://localhost:6379/0'
 CELERY_ACCEPT_CONTENT = ['json']
-CELERY_TASK_SERIALIZER = 'json'
\ No newline at end of file
+CELERY_TASK_SERIALIZER = 'json'
+CELERY_BEAT_SCHEDULE = {
+    # Agrégats jour / mois du ledger (relevés, courbes de solde)
+    "refresh-ledger-rollups": {
+        "task": "payments.tasks.refresh_ledger_rollups",
+        "schedule": 300.0,
+    },
+    # Filet de sécurité si un réveil de l'outbox s'est perdu
+    "drain-outbox": {
+        "task": "payments.tasks.drain_outbox",
+        "schedule": 60.0,
+    },
+    "refill-wallet-address-pool": {
+        "task": "payments.tasks.refill_wallet_address_pool",
+        "schedule": 600.0,
+    },
+    "purge-idempotency-keys": {
+        "task": "payments.tasks.purge_idempotency_keys",
+        "schedule": 3600.0,
+    },
+    # Filet de sécurité si un réveil de la file d'emails s'est perdu
+    "send-queued-emails": {
+        "task": "notifications.tasks.send_queued_emails",
+        "schedule": 60.0,
+    },
+    # Auto-correction des compteurs de notifications non lues
+    "recount-unread-notifications": {
+        "task": "notifications.tasks.recount_unread_notifications",
+        "schedule": 3600.0,
+    },
+    # Règlement groupé des passages aux péages (et nouvel essai des impayés)
+    "settle-pending-toll-detections": {
+        "task": "tolls.tasks.settle_pending_toll_detections",
+        "schedule": 60.0,
+    },
+    # Quelques blocs BSC par passage ; un retard est rattrapé par relance
+    "watch-chain-deposits": {
+        "task": "payments.tasks.watch_chain_deposits",
+        "schedule": 15.0,
+    },
+}
+
+# Dépôts on-chain : jetons ERC-20 surveillés par réseau
+# (contrat -> (devise, décimales))
+CHAIN_WATCHERS = {
+    "bsc": {
+        "rpc_url": config("BSC_RPC_URL", default="https://bsc-dataseed.bnbchain.org"),
+        "confirmations": 15,
+        "tokens": {
+            "0x55d398326f99059ff775485246999027b3197955": ("usd", 18),  # USDT (BEP-20)
+        },
+    },
+    "eth": {
+        "rpc_url": config("ETH_RPC_URL", default="https://ethereum-rpc.publicnode.com"),
+        "confirmations": 12,
+        "tokens": {
+            "0xdac17f958d2ee523a2206206994597c13d831ec7": ("usd", 6),  # USDT (ERC-20)
+        },
+    },
+}
+
+# Durée de conservation des réponses Idempotency-Key (secondes)
+IDEMPOTENCY_KEY_TTL = 24 * 3600
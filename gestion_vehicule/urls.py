@@ -32,6 +32,7 @@ urlpatterns = [
     path("documents/", include("documents.urls", namespace='documents')),
     path("vehicles/", include("vehicles.urls", namespace='vehicles')),
     path("notifications/", include("notifications.urls", namespace="notifications")),
+    path("api/notifications/", include("notifications.api_urls")),  # API
     path("accounts/", include("django.contrib.auth.urls")),
     path("tolls/", include("tolls.urls", namespace="tolls")),
     
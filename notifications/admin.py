@@ -1,3 +1,17 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import QueuedEmail, UserNotificationStats
+
+
+@admin.register(QueuedEmail)
+class QueuedEmailAdmin(admin.ModelAdmin):
+    list_display = ("to_email", "subject", "status", "attempts", "available_at", "sent_at")
+    list_filter = ("status",)
+    search_fields = ("to_email", "subject")
+    readonly_fields = ("body", "last_error")
+
+
+@admin.register(UserNotificationStats)
+class UserNotificationStatsAdmin(admin.ModelAdmin):
+    list_display = ("user", "unread_count")
+    search_fields = ("user__email",)
@@ -0,0 +1,10 @@
+# notifications/api_urls.py
+
+from rest_framework.routers import SimpleRouter
+from .viewset import NotificationViewSet
+
+# Préfixe vide : la liste est servie sur /api/notifications/ même
+router = SimpleRouter()
+router.register(r"", NotificationViewSet, basename="notification")
+
+urlpatterns = router.urls
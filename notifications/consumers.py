@@ -1,18 +1,31 @@
-from channels.generic.websocket import AsyncWebsocketConsumer
-import json
+from urllib.parse import parse_qs
 
-class NotificationConsumer(AsyncWebsocketConsumer):
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from notifications.services.push import catch_up_message, user_group
+
+
+class NotificationConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Canal temps réel des notifications.
+
+    - connexion : `?since=<id>` renvoie d'abord les notifications manquées
+    - client → serveur : {"action": "catchup", "since": <id>}
+    - serveur → client : {"type": "notifications", "items": [...], "more": bool,
+      "unread_count": int}
+      et {"type": "resync"} (le client relance un catchup)
+    """
 
     async def connect(self):
         user = self.scope["user"]
-        print("🔥 WEBSOCKET CONNECT – USER =", user)
+        self.group_name = None
 
         if user.is_anonymous:
-            print("❌ UTILISATEUR ANONYME → WS REFUSÉ")
             await self.close()
             return
 
-        self.group_name = f"user_{user.id}"
+        self.group_name = user_group(user.id)
 
         await self.channel_layer.group_add(
             self.group_name,
@@ -21,14 +34,51 @@ class NotificationConsumer(AsyncWebsocketConsumer):
 
         await self.accept()
 
+        since = parse_qs(self.scope.get("query_string", b"").decode()).get("since")
+        if since:
+            await self.send_catch_up(since[0])
+
     async def disconnect(self, close_code):
-        await self.channel_layer.group_discard(
-            self.group_name,
-            self.channel_name
-        )
+        if self.group_name:
+            await self.channel_layer.group_discard(
+                self.group_name,
+                self.channel_name
+            )
+
+    async def receive_json(self, content, **kwargs):
+        if content.get("action") == "catchup":
+            await self.send_catch_up(content.get("since"))
+
+    async def send_catch_up(self, since):
+        try:
+            since = int(since)
+        except (TypeError, ValueError):
+            return
+
+        message = await database_sync_to_async(catch_up_message)(self.scope["user"], since)
+        await self.send_json(message)
+
+    # ======================================================
+    # ÉVÉNEMENTS DU CHANNEL LAYER
+    # ======================================================
+    async def notify_batch(self, event):
+        await self.send_json({
+            "type": "notifications",
+            "items": event["items"],
+            "more": False,
+            "unread_count": event.get("unread_count"),
+        })
+
+    async def notify_resync(self, event):
+        await self.send_json({"type": "resync"})
 
     async def notify(self, event):
-        await self.send(text_data=json.dumps({
-            "title": event["title"],
+        # Message simple sans ligne Notification (NotificationService)
+        payload = {
+            "type": "message",
+            "title": event.get("title", ""),
             "message": event["message"],
-        }))
\ No newline at end of file
+        }
+        if "extra" in event:
+            payload["extra"] = event["extra"]
+        await self.send_json(payload)
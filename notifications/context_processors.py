@@ -0,0 +1,19 @@
+from notifications.models import Notification
+
+
+def unread_notifications(request):
+    """
+    Compteur de la cloche (base.html) ; mis à jour ensuite
+    par le WebSocket, sans rechargement.
+    """
+    user = getattr(request, "user", None)
+    if user is None or not user.is_authenticated:
+        return {}
+    return {
+        "unread_notifications": Notification.unread_count(user),
+        # Point de départ du rattrapage WebSocket (data-last-id de la cloche)
+        "latest_notification_id": (
+            Notification.objects.filter(user=user)
+            .order_by("-pk").values_list("pk", flat=True).first() or 0
+        ),
+    }
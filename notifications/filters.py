@@ -0,0 +1,53 @@
+from datetime import datetime, time, timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+# ======================================================
+# 🔎 FILTRES DE LA LISTE DES NOTIFICATIONS
+# ======================================================
+# Partagés par la page HTML et l'API. Le filtre lu / non lu reste sur
+# l'index (user, is_read, created_at, id) : le curseur continue de
+# parcourir l'index sans OFFSET ni tri en mémoire.
+
+STATUS_UNREAD = "unread"
+STATUS_READ = "read"
+
+
+def _day_start(value):
+    """Minuit (fuseau courant) du jour AAAA-MM-JJ, ou None."""
+    try:
+        day = parse_date(value or "")
+    except ValueError:
+        return None
+    if day is None:
+        return None
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def filter_notifications(queryset, params):
+    """
+    Paramètres reconnus : status (unread / read), query (titre ou
+    message), start_date / end_date (AAAA-MM-JJ, bornes incluses).
+    """
+    status = params.get("status")
+    if status == STATUS_UNREAD:
+        queryset = queryset.filter(is_read=False)
+    elif status == STATUS_READ:
+        queryset = queryset.filter(is_read=True)
+
+    query = (params.get("query") or "").strip()
+    if query:
+        queryset = queryset.filter(Q(title__icontains=query) | Q(message__icontains=query))
+
+    # Bornes en datetime (pas de __date) : la plage reste sur l'index
+    start = _day_start(params.get("start_date"))
+    if start:
+        queryset = queryset.filter(created_at__gte=start)
+
+    end = _day_start(params.get("end_date"))
+    if end:
+        queryset = queryset.filter(created_at__lt=end + timedelta(days=1))
+
+    return queryset
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:26
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0006_queued_email'),
+        ('users', '0004_alter_customuser_role_alter_loginhistory_device_type'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserNotificationStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='notification_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('unread_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Estatistik Notifikasyon',
+                'verbose_name_plural': 'Estatistik Notifikasyon',
+            },
+        ),
+    ]
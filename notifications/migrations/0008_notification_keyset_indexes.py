@@ -0,0 +1,29 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0003_remove_contract_created_by_contract_created_by_owner_and_more'),
+        ('documents', '0003_alter_document_options_alter_documentrenewal_options_and_more'),
+        ('fines', '0003_remove_deletedfine_amount_remove_deletedfine_reason_and_more'),
+        ('notifications', '0007_user_notification_stats'),
+        ('payments', '0025_wallet_key_rotation'),
+        ('tolls', '0003_alter_toll_options_rename_user_tolldebt_driver_and_more'),
+        ('vehicles', '0002_alter_vehicle_agency_alter_vehicle_dealer_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='notif_user_crt_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', 'is_read', 'created_at', 'id'], name='notif_user_read_crt_idx'),
+        ),
+    ]
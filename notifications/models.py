@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 
 
 class Notification(models.Model):
@@ -129,6 +130,11 @@ class Notification(models.Model):
         verbose_name = "Notifikasyon"
         verbose_name_plural = "Notifikasyon"
         ordering = ["-created_at"]
+        indexes = [
+            # Pagination par curseur : liste complète / filtre lu-non lu
+            models.Index(fields=["user", "created_at", "id"], name="notif_user_crt_idx"),
+            models.Index(fields=["user", "is_read", "created_at", "id"], name="notif_user_read_crt_idx"),
+        ]
 
     # ======================================================
     # MÉTHODES
@@ -138,16 +144,108 @@ class Notification(models.Model):
 
     def mark_as_read(self):
         """Ekri notifikasyon an tankou yo li li deja"""
+        from notifications.services.unread_counter import mark_read
+
         if not self.is_read:
-            self.is_read = True
-            self.save(update_fields=["is_read"])
+            mark_read(self)
 
     @classmethod
     def unread_count(cls, user):
-        """Kantite notifikasuon ki poko li"""
-        return cls.objects.filter(user=user, is_read=False).count()
+        """Kantite notifikasuon ki poko li (compteur dénormalisé, O(1))"""
+        from notifications.services.unread_counter import unread_count
+
+        return unread_count(user)
 
     @classmethod
     def latest_for_user(cls, user, limit=5):
         """Dernières notifications"""
-        return cls.objects.filter(user=user).order_by("-created_at")[:limit]
\ No newline at end of file
+        return cls.objects.filter(user=user).order_by("-created_at")[:limit]
+
+
+# ======================================================
+# 🔢 COMPTEUR DE NOTIFICATIONS NON LUES
+# ======================================================
+class UserNotificationStats(models.Model):
+    """
+    Nombre de notifications non lues, tenu à jour à l'insertion, à la
+    lecture et à la suppression ; recalculé périodiquement.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="notification_stats"
+    )
+
+    unread_count = models.PositiveIntegerField(
+        default=0
+    )
+
+    class Meta:
+        verbose_name = "Estatistik Notifikasyon"
+        verbose_name_plural = "Estatistik Notifikasyon"
+
+    def __str__(self):
+        return f"{self.user_id} | {self.unread_count} pa li"
+
+
+# ======================================================
+# ✉️ FILE D'ATTENTE DES EMAILS
+# ======================================================
+class QueuedEmail(models.Model):
+    """
+    Email écrit dans la transaction de l'appelant, envoyé par un worker
+    Celery (une connexion SMTP par lot, nouvel essai avec délai croissant).
+    """
+    STATUS_PENDING = "pending"
+    STATUS_SENT = "sent"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "An atant"),
+        (STATUS_SENT, "Voye"),
+        (STATUS_FAILED, "Echwe"),
+    ]
+
+    to_email = models.EmailField()
+
+    subject = models.CharField(
+        max_length=255
+    )
+
+    body = models.TextField()
+
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING
+    )
+
+    attempts = models.PositiveSmallIntegerField(
+        default=0
+    )
+
+    available_at = models.DateTimeField(
+        default=timezone.now
+    )
+
+    last_error = models.TextField(
+        blank=True
+    )
+
+    created_at = models.DateTimeField(
+        auto_now_add=True
+    )
+
+    sent_at = models.DateTimeField(
+        null=True,
+        blank=True
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "available_at", "id"], name="notif_email_ready_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.to_email} | {self.subject} ({self.status})"
@@ -0,0 +1,12 @@
+from rest_framework import serializers
+from .models import Notification
+
+
+class NotificationSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Notification
+        fields = [
+            "id", "title", "message", "notification_type", "is_read", "created_at",
+            "transaction", "contract", "vehicle", "document", "fine", "toll",
+        ]
+        read_only_fields = fields
@@ -1,6 +1,5 @@
-from django.core.mail import send_mail
-from django.conf import settings
-from notifications.models import Notification
+from notifications.services.email_queue import queue_email
+from notifications.services.notification_buffer import notify
 
 def create_notification(
     user,
@@ -30,10 +29,15 @@ def create_notification(
         fine: Optionnel, objet Fine associé.
         document: Optionnel, objet DocumentRenewal associé.
         vehicle: Optionnel, objet Vehicle associé.
-        send_email: Si True, envoie un email à l'utilisateur.
+        send_email: Si True, met en file un email pour l'utilisateur.
+
+    Returns:
+        La Notification. Dans un bloc atomique elle n'est insérée qu'au
+        commit : l'instance retournée n'a pas encore de pk (None).
     """
 
-    notification = Notification.objects.create(
+    # Insérée au commit (un seul INSERT par transaction), voir notification_buffer
+    notification = notify(
         user=user,
         title=title,
         message=message,
@@ -49,18 +53,8 @@ def create_notification(
         #recharge=recharge
     )
 
-    # Envoi d'email optionnel
+    # Email optionnel : mis en file, envoyé par le worker après le commit
     if send_email and user.email:
-        try:
-            send_mail(
-                subject=title,
-                message=message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[user.email],
-                fail_silently=True
-            )
-        except Exception as e:
-            # Ici on peut logger l'erreur si nécessaire
-            print(f"Erreur envoi email notification: {e}")
+        queue_email(user.email, title, message)
 
     return notification
\ No newline at end of file
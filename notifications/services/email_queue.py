@@ -0,0 +1,132 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from notifications.models import QueuedEmail
+
+logger = logging.getLogger(__name__)
+
+# ======================================================
+# ✉️ ENVOI DIFFÉRÉ DES EMAILS
+# ======================================================
+# queue_email() n'écrit qu'une ligne (dans la transaction de l'appelant)
+# et réveille le worker au commit : la requête HTTP n'attend plus la
+# poignée de main SMTP. Le worker envoie chaque lot sur UNE connexion
+# (get_connection + send_messages) ; un échec est rejoué avec un délai
+# croissant, puis abandonné après EMAIL_MAX_ATTEMPTS. Aucun verrou n'est
+# tenu pendant l'échange SMTP : le lot est d'abord réservé.
+
+EMAIL_BATCH_SIZE = getattr(settings, "EMAIL_BATCH_SIZE", 100)
+EMAIL_MAX_ATTEMPTS = 6
+# Durée de réservation d'un lot par un worker (envoi SMTP compris)
+EMAIL_CLAIM_TIMEOUT = timedelta(minutes=10)
+
+
+def _backoff(attempts):
+    return timedelta(seconds=min(2 ** attempts * 30, 6 * 3600))
+
+
+def queue_email(to_email, subject, body):
+    """
+    Met un email en file ; envoyé après le commit par le worker.
+    """
+    email = QueuedEmail.objects.create(to_email=to_email, subject=subject[:255], body=body)
+    transaction.on_commit(_wake_worker)
+    return email
+
+
+def _wake_worker():
+    from notifications.tasks import send_queued_emails
+
+    try:
+        send_queued_emails.delay()
+    except Exception:
+        # Broker indisponible : la tâche périodique prendra le relais
+        logger.warning("Emails : réveil du worker impossible", exc_info=True)
+
+
+def _fail(email, error):
+    email.attempts += 1
+    email.last_error = repr(error)[:2000]
+    email.available_at = timezone.now() + _backoff(email.attempts)
+    if email.attempts >= EMAIL_MAX_ATTEMPTS:
+        email.status = QueuedEmail.STATUS_FAILED
+    logger.warning(f"Email {email.pk} non envoyé ({email.attempts}) : {error!r}")
+
+
+def _claim(batch_size):
+    """
+    Réserve un lot dans une transaction courte : available_at est repoussé
+    de EMAIL_CLAIM_TIMEOUT, les autres workers ne le voient plus. Si le
+    worker meurt avant d'enregistrer le résultat, le lot redevient
+    disponible à l'expiration de la réservation.
+    """
+    with transaction.atomic():
+        emails = list(
+            QueuedEmail.objects
+            .select_for_update(skip_locked=True)
+            .filter(status=QueuedEmail.STATUS_PENDING, available_at__lte=timezone.now())
+            .order_by("available_at", "id")[:batch_size]
+        )
+        if emails:
+            QueuedEmail.objects.filter(pk__in=[e.pk for e in emails]).update(
+                available_at=timezone.now() + EMAIL_CLAIM_TIMEOUT
+            )
+    return emails
+
+
+def _deliver(emails):
+    """Envoi SMTP sur une seule connexion, hors de toute transaction."""
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as e:
+        for email in emails:
+            _fail(email, e)
+        return
+
+    try:
+        for email in emails:
+            message = EmailMessage(
+                subject=email.subject,
+                body=email.body,
+                from_email=settings.DEFAULT_FROM_EMAIL,
+                to=[email.to_email],
+                connection=connection,
+            )
+            # Un message à la fois sur la même connexion :
+            # un destinataire refusé ne fait pas échouer le lot
+            try:
+                connection.send_messages([message])
+            except Exception as e:
+                _fail(email, e)
+            else:
+                email.status = QueuedEmail.STATUS_SENT
+                email.sent_at = timezone.now()
+    finally:
+        connection.close()
+
+
+def send_queued_emails(batch_size=EMAIL_BATCH_SIZE):
+    """
+    Envoie jusqu'à `batch_size` emails prêts sur une seule connexion.
+    Trois temps : réservation (transaction courte), envoi SMTP sans
+    verrou, enregistrement des résultats (transaction courte).
+    Retourne le nombre d'emails traités (envoyés ou non).
+    """
+    emails = _claim(batch_size)
+    if not emails:
+        return 0
+
+    _deliver(emails)
+
+    with transaction.atomic():
+        QueuedEmail.objects.bulk_update(
+            emails, ["status", "attempts", "available_at", "last_error", "sent_at"]
+        )
+
+    return len(emails)
@@ -0,0 +1,161 @@
+import weakref
+
+from django.db import connection, transaction
+from django.dispatch import Signal
+
+from notifications.models import Notification
+
+# ======================================================
+# 🧺 TAMPON DE NOTIFICATIONS PAR TRANSACTION
+# ======================================================
+# Dans un bloc atomique, notify() / notify_many() n'écrivent rien : les
+# notifications sont regroupées puis insérées en UN bulk_create au commit
+# (transaction.on_commit). Les doublons (même user, même titre, même objet
+# lié) ne sont gardés qu'une fois. Hors bloc atomique, l'écriture est
+# immédiate.
+#
+# Un tampon par savepoint (connection.savepoint_ids), dont le flush est
+# enregistré par on_commit DANS ce savepoint : si le savepoint est annulé,
+# Django abandonne le callback et le tampon avec lui, même si le bloc
+# englobant est validé. Les tampons ne sont référencés que par leur
+# callback (WeakValueDictionary) : ceux qui restent au commit sont
+# exactement ceux à insérer, et le premier flush les insère tous.
+#
+# Pour regrouper tout un flux (vue, tâche Celery, import), il suffit
+# de l'entourer d'un `transaction.atomic()`.
+#
+# bulk_create n'émet pas de post_save : les abonnés (push, compteurs...)
+# écoutent `notifications_created`, envoyé après chaque insertion.
+
+notifications_created = Signal()  # kwargs : notifications=[Notification, ...]
+
+_LINKS = ("transaction_id", "contract_id", "vehicle_id", "document_id", "fine_id", "toll_id")
+
+
+def _dedup_key(notification):
+    return (
+        notification.user_id,
+        notification.title,
+        *(getattr(notification, field) for field in _LINKS),
+    )
+
+
+def _insert(notifications):
+    if not notifications:
+        return []
+    # Les abonnés (compteurs...) écrivent dans la même transaction que l'INSERT
+    with transaction.atomic():
+        created = Notification.objects.bulk_create(notifications)
+        notifications_created.send(sender=Notification, notifications=created)
+    return created
+
+
+def _buffers():
+    buffers = getattr(connection, "_notification_buffers", None)
+    if buffers is None:
+        buffers = connection._notification_buffers = weakref.WeakValueDictionary()
+    return buffers
+
+
+def _savepoint_chain():
+    """
+    Clés des tampons visibles depuis le bloc courant, de l'extérieur vers
+    l'intérieur. None : bloc le plus externe (pas de savepoint). Un bloc
+    `savepoint=False` partage le tampon du savepoint englobant.
+    """
+    return [None] + [sid for sid in connection.savepoint_ids if sid is not None]
+
+
+class NotificationBuffer:
+
+    def __init__(self):
+        self.items = {}
+
+    def flush(self):
+        _flush_all()
+
+
+def _flush_all():
+    # Tampons encore vivants (leur savepoint n'a pas été annulé), insérés
+    # ensemble avec dédoublonnage entre savepoints. Une fois vidés ils sont
+    # oubliés : un notify() suivant repart d'un tampon neuf.
+    buffers = _buffers()
+    merged = {}
+    for buffer in list(buffers.values()):
+        for key, notification in buffer.items.items():
+            merged.setdefault(key, notification)
+        buffer.items = {}
+    buffers.clear()
+    _insert(list(merged.values()))
+
+
+def _current_buffer():
+    """Tampon du savepoint courant, créé (et son flush enregistré) au besoin."""
+    buffers = _buffers()
+    key = _savepoint_chain()[-1]
+
+    buffer = buffers.get(key)
+    if buffer is None:
+        buffer = buffers[key] = NotificationBuffer()
+        transaction.on_commit(buffer.flush)
+    return buffer
+
+
+def _buffered(key):
+    """Notification déjà en tampon pour `key` dans un bloc englobant."""
+    buffers = _buffers()
+    for sid in _savepoint_chain():
+        buffer = buffers.get(sid)
+        if buffer is not None and key in buffer.items:
+            return buffer.items[key]
+    return None
+
+
+def flush_notifications():
+    """
+    Insère tout de suite les notifications en tampon, dans la transaction
+    (ex : tâche longue qui veut libérer la mémoire, tests). Les lignes
+    suivent alors le sort du bloc courant.
+    """
+    _flush_all()
+
+
+def notify_many(notifications):
+    """
+    Enregistre des Notification (non sauvegardées) : au commit si une
+    transaction est ouverte, sinon tout de suite. Retourne les instances
+    retenues (sans pk tant que le tampon n'est pas vidé).
+    """
+    notifications = list(notifications)
+
+    if not connection.in_atomic_block:
+        unique = {}
+        for n in notifications:
+            unique.setdefault(_dedup_key(n), n)
+        return _insert(list(unique.values()))
+
+    buffer = _current_buffer()
+    retained = []
+    for n in notifications:
+        key = _dedup_key(n)
+        existing = _buffered(key)
+        if existing is None:
+            existing = buffer.items[key] = n
+        retained.append(existing)
+    return retained
+
+
+def notify(user, title, message, notification_type=Notification.ALERT, **links):
+    """
+    Équivalent bufferisé de Notification.objects.create(...).
+    Dans un bloc atomique, l'instance retournée n'a pas de pk avant le commit.
+    """
+    return notify_many([
+        Notification(
+            user=user,
+            title=title,
+            message=message,
+            notification_type=notification_type,
+            **links,
+        )
+    ])[0]
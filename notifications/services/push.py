@@ -0,0 +1,175 @@
+import logging
+import time
+from collections import defaultdict
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.urls import reverse
+
+from notifications.models import Notification
+from notifications.services import unread_counter
+
+logger = logging.getLogger(__name__)
+
+# ======================================================
+# 📡 PUSH WEBSOCKET DES NOTIFICATIONS
+# ======================================================
+# Branché sur `notifications_created` : après le commit, les nouvelles
+# notifications sont regroupées par utilisateur et publiées en UN
+# message par utilisateur (event "notify.batch") sur le groupe du
+# consumer. Tous les group_send d'un lot partagent un seul aller-retour
+# async_to_sync.
+#
+# Limite par utilisateur : NOTIFICATION_PUSH_RATE messages par fenêtre
+# de NOTIFICATION_PUSH_WINDOW secondes. Au-delà rien n'est publié ;
+# un seul "notify.resync" est programmé pour la fin de la fenêtre et le
+# navigateur rattrape alors tout via son dernier id connu (catch_up).
+#
+# Chaque message porte "unread_count" (compteur dénormalisé) : la cloche
+# affiche cette valeur au lieu d'additionner les éléments reçus.
+
+PUSH_RATE = getattr(settings, "NOTIFICATION_PUSH_RATE", 10)
+PUSH_WINDOW = getattr(settings, "NOTIFICATION_PUSH_WINDOW", 10)
+CATCHUP_LIMIT = 50
+
+
+def user_group(user_id):
+    """Groupe channels d'un utilisateur (rejoint par NotificationConsumer)."""
+    return f"user_{user_id}"
+
+
+def serialize(notification):
+    return {
+        "id": notification.pk,
+        "title": notification.title,
+        "message": notification.message,
+        "notification_type": notification.notification_type,
+        "is_read": notification.is_read,
+        "created_at": notification.created_at.isoformat() if notification.created_at else None,
+        "url": reverse("notifications:notification_detail", args=[notification.pk]),
+    }
+
+
+def catch_up(user, since_id, limit=CATCHUP_LIMIT):
+    """
+    Notifications de `user` postérieures à `since_id` (ordre croissant).
+    Retourne (items, more) ; `more` indique qu'il en reste après la limite.
+    """
+    rows = list(
+        Notification.objects
+        .filter(user=user, pk__gt=since_id)
+        .order_by("pk")[:limit + 1]
+    )
+    return [serialize(n) for n in rows[:limit]], len(rows) > limit
+
+
+def catch_up_message(user, since_id):
+    """Message de rattrapage envoyé au navigateur, compteur compris."""
+    items, more = catch_up(user, since_id)
+    return {
+        "type": "notifications",
+        "items": items,
+        "more": more,
+        "unread_count": unread_counter.unread_count(user),
+    }
+
+
+def _allow(user_id):
+    """
+    Fenêtre fixe dans le cache partagé. Retourne (autorisé, secondes
+    restantes dans la fenêtre).
+    """
+    now = time.time()
+    window = int(now // PUSH_WINDOW)
+    key = f"notif_push:{user_id}:{window}"
+
+    cache.add(key, 0, PUSH_WINDOW * 2)
+    try:
+        count = cache.incr(key)
+    except ValueError:
+        # Clé expirée entre add et incr : nouvelle fenêtre
+        cache.set(key, 1, PUSH_WINDOW * 2)
+        count = 1
+
+    remaining = PUSH_WINDOW - (now % PUSH_WINDOW)
+    return count <= PUSH_RATE, remaining
+
+
+def _schedule_resync(user_id, countdown):
+    # Un seul rattrapage programmé par utilisateur et par fenêtre
+    if not cache.add(f"notif_push_resync:{user_id}", 1, PUSH_WINDOW):
+        return
+
+    from notifications.tasks import push_resync
+
+    try:
+        push_resync.apply_async(args=[user_id], countdown=countdown)
+    except Exception:
+        logger.warning(f"Push : rattrapage non programmé pour user {user_id}", exc_info=True)
+
+
+def _send(messages):
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+
+    async def send_all():
+        for group, event in messages:
+            await channel_layer.group_send(group, event)
+
+    try:
+        async_to_sync(send_all)()
+    except Exception:
+        # Redis indisponible : le navigateur rattrapera à la reconnexion
+        logger.warning("Push : publication WebSocket impossible", exc_info=True)
+
+
+def publish(notifications):
+    """
+    Publie des notifications déjà enregistrées : un message par
+    utilisateur, sous réserve de la limite de débit.
+    """
+    by_user = defaultdict(list)
+    for n in notifications:
+        if n.pk is not None:
+            by_user[n.user_id].append(n)
+
+    allowed_users = {}
+    for user_id, items in by_user.items():
+        allowed, remaining = _allow(user_id)
+        if allowed:
+            allowed_users[user_id] = items
+        else:
+            _schedule_resync(user_id, remaining)
+
+    # Après le commit : les compteurs incluent déjà ce lot
+    counts = unread_counter.unread_counts(allowed_users) if allowed_users else {}
+
+    messages = []
+    for user_id, items in allowed_users.items():
+        items.sort(key=lambda n: n.pk)
+        messages.append((
+            user_group(user_id),
+            {
+                "type": "notify.batch",
+                "items": [serialize(n) for n in items],
+                "unread_count": counts.get(user_id, 0),
+            },
+        ))
+
+    _send(messages)
+    return len(messages)
+
+
+def publish_on_commit(notifications):
+    """Publie après le commit (immédiatement hors transaction)."""
+    notifications = list(notifications)
+    transaction.on_commit(lambda: publish(notifications))
+
+
+def resync(user_id):
+    """Demande au navigateur de rattraper depuis son dernier id."""
+    _send([(user_group(user_id), {"type": "notify.resync"})])
@@ -0,0 +1,161 @@
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F
+from django.db.models.functions import Greatest
+
+from notifications.models import Notification, UserNotificationStats
+
+# ======================================================
+# 🔢 COMPTEUR DE NOTIFICATIONS NON LUES
+# ======================================================
+# La cloche lit UserNotificationStats.unread_count (lecture par clé
+# primaire) au lieu d'un COUNT(*) sur les notifications :
+#   - insertion (notifications_created) : +n, dans la transaction de l'INSERT
+#   - lecture / suppression d'une non lue : -1 (jamais sous zéro)
+#   - "tout marquer comme lu" : un UPDATE des notifications, un UPDATE du compteur
+# Une ligne absente est initialisée par un vrai COUNT ; recount_unread()
+# (tâche périodique) corrige toute dérive.
+
+RECOUNT_CHUNK_SIZE = 1000
+
+
+def _initialize(user_ids):
+    """Crée les compteurs manquants à partir d'un vrai COUNT."""
+    counts = dict(
+        Notification.objects
+        .filter(user_id__in=user_ids, is_read=False)
+        .order_by()
+        .values_list("user_id")
+        .annotate(n=Count("id"))
+    )
+    UserNotificationStats.objects.bulk_create(
+        [UserNotificationStats(user_id=uid, unread_count=counts.get(uid, 0)) for uid in user_ids],
+        ignore_conflicts=True,
+    )
+    return counts
+
+
+def increment(notifications):
+    """
+    +n par utilisateur pour des notifications non lues déjà insérées.
+    Un UPDATE par valeur distincte de n (1 en général).
+    """
+    per_user = Counter(n.user_id for n in notifications if not n.is_read)
+    if not per_user:
+        return
+
+    existing = set(
+        UserNotificationStats.objects
+        .filter(user_id__in=per_user)
+        .values_list("user_id", flat=True)
+    )
+
+    by_amount = defaultdict(list)
+    for user_id, amount in per_user.items():
+        if user_id in existing:
+            by_amount[amount].append(user_id)
+
+    for amount, user_ids in by_amount.items():
+        UserNotificationStats.objects.filter(user_id__in=user_ids).update(
+            unread_count=F("unread_count") + amount
+        )
+
+    missing = [uid for uid in per_user if uid not in existing]
+    if missing:
+        # Le COUNT inclut déjà les lignes qui viennent d'être insérées
+        _initialize(missing)
+
+
+def decrement(user_id, amount=1):
+    UserNotificationStats.objects.filter(user_id=user_id).update(
+        unread_count=Greatest(F("unread_count") - amount, 0)
+    )
+
+
+def mark_read(notification):
+    """
+    Marque une notification comme lue ; ne décrémente que si
+    l'UPDATE l'a réellement fait passer de non lue à lue.
+    """
+    with transaction.atomic():
+        updated = Notification.objects.filter(pk=notification.pk, is_read=False).update(is_read=True)
+        if updated:
+            decrement(notification.user_id)
+    notification.is_read = True
+    return bool(updated)
+
+
+def mark_all_read(user):
+    """Toutes les notifications de `user` lues ; compteur remis à zéro."""
+    with transaction.atomic():
+        updated = Notification.objects.filter(user=user, is_read=False).update(is_read=True)
+        UserNotificationStats.objects.filter(user=user).update(unread_count=0)
+    return updated
+
+
+def unread_count(user):
+    """Compteur de `user` ; initialisé par un COUNT la première fois."""
+    count = (
+        UserNotificationStats.objects
+        .filter(user_id=user.pk)
+        .values_list("unread_count", flat=True)
+        .first()
+    )
+    if count is None:
+        count = _initialize([user.pk]).get(user.pk, 0)
+    return count
+
+
+def unread_counts(user_ids):
+    """Compteurs de plusieurs utilisateurs en une lecture (lot de push)."""
+    user_ids = list(user_ids)
+    counts = dict(
+        UserNotificationStats.objects
+        .filter(user_id__in=user_ids)
+        .values_list("user_id", "unread_count")
+    )
+    missing = [uid for uid in user_ids if uid not in counts]
+    if missing:
+        initialized = _initialize(missing)
+        counts.update({uid: initialized.get(uid, 0) for uid in missing})
+    return counts
+
+
+def recount_unread(chunk_size=RECOUNT_CHUNK_SIZE):
+    """
+    Recalcule tous les compteurs existants par lots et corrige ceux qui
+    ont dérivé. Retourne le nombre de compteurs corrigés.
+    """
+    fixed = 0
+    last_user_id = None
+
+    while True:
+        stats = UserNotificationStats.objects.order_by("user_id")
+        if last_user_id is not None:
+            stats = stats.filter(user_id__gt=last_user_id)
+        stats = list(stats[:chunk_size])
+        if not stats:
+            return fixed
+        last_user_id = stats[-1].user_id
+
+        counts = dict(
+            Notification.objects
+            .filter(user_id__in=[s.user_id for s in stats], is_read=False)
+            .order_by()
+            .values_list("user_id")
+            .annotate(n=Count("id"))
+        )
+
+        drifted = []
+        for s in stats:
+            actual = counts.get(s.user_id, 0)
+            if s.unread_count != actual:
+                s.unread_count = actual
+                drifted.append(s)
+
+        if drifted:
+            # Une incrémentation concurrente entre le COUNT et cet UPDATE
+            # peut être écrasée : elle sera corrigée au prochain passage
+            UserNotificationStats.objects.bulk_update(drifted, ["unread_count"])
+            fixed += len(drifted)
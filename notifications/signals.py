@@ -1,10 +1,14 @@
-from django.db.models.signals import pre_save, post_save
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
 from django.utils import timezone
 from datetime import timedelta
 from django.contrib.auth import get_user_model
 
 from notifications.models import Notification
+from notifications.services.create_notification import create_notification
+from notifications.services.notification_buffer import notify, notifications_created
+from notifications.services.push import publish_on_commit
+from notifications.services import unread_counter
 from contracts.models import Contract
 from documents.models import Document, DocumentRenewal
 from fines.models import Fine, DeletedFine
@@ -33,7 +37,7 @@ def notify_contract_created(sender, instance, created, **kwargs):
     if not created:
         return
 
-    Notification.objects.create(
+    notify(
         user=instance.new_user,
         title="Nouveau contrat 📄",
         message=(
@@ -79,7 +83,7 @@ def notify_contract_status_change(sender, instance, **kwargs):
 
     notif_type, title = status_map[instance.contract_status]
 
-    Notification.objects.create(
+    notify(
         user=instance.new_user,
         title=title,
         message=(
@@ -103,7 +107,7 @@ def notify_contract_paid(sender, instance, **kwargs):
         return
 
     if not old.is_paid and instance.is_paid:
-        Notification.objects.create(
+        notify(
             user=instance.new_user,
             title="Paiement du contrat reçu 💳",
             message=(
@@ -134,7 +138,7 @@ def notify_rent_overdue(sender, instance, created, **kwargs):
     if today <= instance.end_date:
         return
 
-    Notification.objects.create(
+    notify(
         user=instance.new_user,
         title="Location en retard ⏰",
         message=(
@@ -156,7 +160,7 @@ def notify_rent_penalty(sender, instance, created, **kwargs):
         return
 
     if instance.penalty_amount and instance.penalty_amount > 0:
-        Notification.objects.create(
+        notify(
             user=instance.new_user,
             title="Pénalité de retard 💸",
             message=(
@@ -176,7 +180,7 @@ def notify_document_created(sender, instance, created, **kwargs):
         return
 
     if instance.mandatory:
-        Notification.objects.create(
+        notify(
             user=instance.user,
             title="Document obligatoire ajouté",
             message=(
@@ -201,7 +205,7 @@ def notify_document_expiry(sender, instance, created, **kwargs):
 
     # Rappel à 30 jours
     if days_left == 30:
-        Notification.objects.create(
+        notify(
             user=instance.user,
             title="Document bientôt expiré ⏳",
             message=(
@@ -214,7 +218,7 @@ def notify_document_expiry(sender, instance, created, **kwargs):
 
     # Expiré
     if days_left < 0:
-        Notification.objects.create(
+        notify(
             user=instance.user,
             title="Document expiré ⚠️",
             message=(
@@ -234,7 +238,7 @@ def notify_document_renewed(sender, instance, created, **kwargs):
     if not created:
         return
 
-    Notification.objects.create(
+    notify(
         user=instance.document.user,
         title="Document renouvelé ✅",
         message=(
@@ -254,7 +258,7 @@ def notify_document_renewal_paid(sender, instance, created, **kwargs):
     if not instance.is_paid:
         return
 
-    Notification.objects.create(
+    notify(
         user=instance.document.user,
         title="Renouvellement payé 💳",
         message=(
@@ -274,7 +278,7 @@ def notify_fine_created(sender, instance, created, **kwargs):
     if not created:
         return
 
-    Notification.objects.create(
+    notify(
         user=instance.owner,
         title="Nouvelle contravention 🚨",
         message=(
@@ -296,7 +300,7 @@ def notify_fine_paid(sender, instance, created, **kwargs):
     if not instance.is_paid:
         return
 
-    Notification.objects.create(
+    notify(
         user=instance.owner,
         title="Contravention payée ✅",
         message=(
@@ -327,7 +331,7 @@ def notify_fine_penalty(sender, instance, created, **kwargs):
     if instance.penalty_applied_at:
         return
 
-    Notification.objects.create(
+    notify(
         user=instance.owner,
         title="Pénalité appliquée ⚠️",
         message=(
@@ -350,7 +354,7 @@ def notify_fine_deleted(sender, instance, created, **kwargs):
     if not created or not instance.owner:
         return
 
-    Notification.objects.create(
+    notify(
         user=instance.owner,
         title="Contravention supprimée 🗑️",
         message=(
@@ -478,7 +482,7 @@ def notify_user_signup(sender, instance, created, **kwargs):
         return
 
     # Notification bienvenue
-    Notification.objects.create(
+    notify(
         user=instance,
         title="Byenvini 🎉",
         message="Byenvini sou platfòm nou an.",
@@ -497,7 +501,7 @@ def notify_user_signup(sender, instance, created, **kwargs):
 
     # Parrainage
     if instance.referred_by:
-        Notification.objects.create(
+        notify(
             user=instance.referred_by,
             title="Parenn 👥",
             message=f"felisitasyon, {instance.email} enskri gras ak kòd envitasyon ou an.",
@@ -522,7 +526,7 @@ def notify_user_verification(sender, instance, created, **kwargs):
     update_fields = kwargs.get("update_fields") or []
 
     if "email_verified" in update_fields and instance.email_verified:
-        Notification.objects.create(
+        notify(
             user=instance,
             title="Email vérifié ✅",
             message="Votre adresse email a été vérifiée avec succès.",
@@ -530,7 +534,7 @@ def notify_user_verification(sender, instance, created, **kwargs):
         )
 
     if "phone_verified" in update_fields and instance.phone_verified:
-        Notification.objects.create(
+        notify(
             user=instance,
             title="Téléphone vérifié ✅",
             message="Votre numéro de téléphone a été vérifié.",
@@ -548,7 +552,7 @@ def notify_employee_added(sender, instance, created, **kwargs):
 
     owner = instance.business.user
 
-    Notification.objects.create(
+    notify(
         user=owner,
         title="Nouvel employé ajouté",
         message=(
@@ -573,7 +577,7 @@ def notify_account_locked(sender, instance, created, **kwargs):
         return
 
     if instance.locked_until > timezone.now():
-        Notification.objects.create(
+        notify(
             user=instance.user,
             title="Compte temporairement verrouillé 🚫",
             message="Plusieurs tentatives de connexion ont échoué. "
@@ -591,7 +595,7 @@ def notify_transaction_completed(sender, instance, created, **kwargs):
 
     notif_type = Notification.SUCCESS if instance.transaction_type == Transaction.CREDIT else Notification.WARNING
 
-    Notification.objects.create(
+    notify(
         user=instance.user,
         title="💳 Tranzaksyon",
         message=(
@@ -608,17 +612,10 @@ def notify_transaction_completed(sender, instance, created, **kwargs):
 # ======================================================
 @receiver(post_save, sender=Payment)
 def notify_payment(sender, instance, created, **kwargs):
-    if instance.status == Payment.STATUS_COMPLETED:
-        Notification.objects.create(
-            user=instance.user,
-            title="Paiement réussi ✅",
-            message=f"Votre paiement de {instance.amount} {instance.currency} a été confirmé.",
-            notification_type=Notification.SUCCESS,
-            transaction=instance.transaction
-        )
-
-    elif instance.status == Payment.STATUS_FAILED:
-        Notification.objects.create(
+    # Paiement réussi : notifié par l'outbox avec l'effet métier
+    # (payments.services.payment_service.apply_completed_payment)
+    if instance.status == Payment.STATUS_FAILED:
+        notify(
             user=instance.user,
             title="Paiement échoué ❌",
             message=f"Votre paiement de {instance.amount} {instance.currency} a échoué.",
@@ -634,7 +631,7 @@ def notify_recharge(sender, instance, created, **kwargs):
     if instance.status != Recharge.STATUS_SUCCESS:
         return
 
-    Notification.objects.create(
+    notify(
         user=instance.user,
         title="Recharge réussie 🔋",
         message=f"Votre compte a été rechargé de {instance.amount} {instance.currency}.",
@@ -652,7 +649,7 @@ def notify_fund_transfer(sender, instance, created, **kwargs):
         return
 
     # Expéditeur
-    Notification.objects.create(
+    notify(
         user=instance.sender,
         title="Transfert envoyé",
         message=(
@@ -664,7 +661,7 @@ def notify_fund_transfer(sender, instance, created, **kwargs):
     )
 
     # Destinataire
-    Notification.objects.create(
+    notify(
         user=instance.receiver,
         title="Fonds reçus 🎉",
         message=(
@@ -684,7 +681,7 @@ def notify_wallet_verified(sender, instance, created, **kwargs):
     if not instance.is_verified:
         return
 
-    Notification.objects.create(
+    notify(
         user=instance.user,
         title="Wallet vérifié 🔐",
         message=f"Votre wallet {instance.network.upper()} a été vérifié avec succès.",
@@ -705,7 +702,7 @@ def notify_vehicle_status_change(sender, instance, created, **kwargs):
     if not owner:
         return
 
-    Notification.objects.create(
+    notify(
         user=owner,
         title="Statut du véhicule modifié",
         message=(
@@ -715,3 +712,22 @@ def notify_vehicle_status_change(sender, instance, created, **kwargs):
         ),
         notification_type=Notification.ALERT
     )
+
+
+# =====================================================
+# 🔢 COMPTEUR DE NON LUES + 📡 PUSH WEBSOCKET
+# =====================================================
+@receiver(notifications_created)
+def count_new_notifications(sender, notifications, **kwargs):
+    unread_counter.increment(notifications)
+
+
+@receiver(notifications_created)
+def push_new_notifications(sender, notifications, **kwargs):
+    publish_on_commit(notifications)
+
+
+@receiver(post_delete, sender=Notification)
+def uncount_deleted_notification(sender, instance, **kwargs):
+    if not instance.is_read:
+        unread_counter.decrement(instance.user_id)
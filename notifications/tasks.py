@@ -0,0 +1,38 @@
+from celery import shared_task
+
+
+@shared_task
+def send_queued_emails():
+    """
+    Envoie un lot d'emails en attente ; se relance tant que
+    des lots complets restent à traiter.
+    """
+    from notifications.services.email_queue import EMAIL_BATCH_SIZE
+    from notifications.services.email_queue import send_queued_emails as send_batch
+
+    processed = send_batch(EMAIL_BATCH_SIZE)
+    if processed >= EMAIL_BATCH_SIZE:
+        send_queued_emails.delay()
+    return processed
+
+
+@shared_task
+def push_resync(user_id):
+    """
+    Fin de fenêtre de limitation : le navigateur rattrape
+    les notifications non poussées.
+    """
+    from notifications.services.push import resync
+
+    resync(user_id)
+
+
+@shared_task
+def recount_unread_notifications():
+    """
+    Filet de sécurité : recalcule les compteurs de non lues
+    et corrige ceux qui ont dérivé.
+    """
+    from notifications.services.unread_counter import recount_unread
+
+    return recount_unread()
@@ -1,3 +1,376 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail.backends.locmem import EmailBackend
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from notifications.models import Notification, QueuedEmail, UserNotificationStats
+from notifications.services.create_notification import create_notification
+from notifications.services.email_queue import EMAIL_MAX_ATTEMPTS, send_queued_emails
+from notifications.services.notification_buffer import (
+    flush_notifications,
+    notifications_created,
+    notify,
+    notify_many,
+)
+from notifications.services.push import PUSH_RATE, catch_up, catch_up_message, publish, user_group
+from notifications.services.unread_counter import mark_all_read, recount_unread
+
+User = get_user_model()
+
+
+@override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend")
+class EmailQueueTest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="mail@test.com", password="test1234", phone="+50934500001"
+        )
+        QueuedEmail.objects.all().delete()
+        mail.outbox = []
+
+    def test_notification_email_is_sent_by_worker_on_one_connection(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            for i in range(3):
+                create_notification(self.user, f"Tit {i}", "Mesaj")
+
+        self.assertEqual(len(callbacks), 3)
+        self.assertEqual(mail.outbox, [])
+
+        with mock.patch(
+            "notifications.services.email_queue.get_connection",
+            wraps=mail.get_connection,
+        ) as get_connection:
+            self.assertEqual(send_queued_emails(), 3)
+
+        get_connection.assert_called_once()
+        self.assertEqual([m.subject for m in mail.outbox], ["Tit 0", "Tit 1", "Tit 2"])
+        self.assertEqual(mail.outbox[0].to, ["mail@test.com"])
+        self.assertFalse(QueuedEmail.objects.exclude(status=QueuedEmail.STATUS_SENT).exists())
+        self.assertEqual(send_queued_emails(), 0)
+
+    def test_failures_back_off_then_give_up(self):
+        create_notification(self.user, "Tit", "Mesaj")
+
+        with mock.patch(
+            "django.core.mail.backends.locmem.EmailBackend.send_messages",
+            side_effect=ConnectionError("SMTP"),
+        ):
+            self.assertEqual(send_queued_emails(), 1)
+            email = QueuedEmail.objects.get()
+            self.assertEqual(email.attempts, 1)
+            self.assertGreater(email.available_at, timezone.now())
+            self.assertEqual(send_queued_emails(), 0)
+
+            for _ in range(EMAIL_MAX_ATTEMPTS - 1):
+                QueuedEmail.objects.update(available_at=timezone.now())
+                send_queued_emails()
+
+        self.assertEqual(QueuedEmail.objects.get().status, QueuedEmail.STATUS_FAILED)
+        self.assertEqual(mail.outbox, [])
+
+    def test_batch_is_claimed_before_smtp(self):
+        create_notification(self.user, "Tit", "Mesaj")
+        send_messages = EmailBackend.send_messages
+        during_send = []
+
+        def send_while_claimed(backend, messages):
+            # Un second worker pendant l'échange SMTP ne reprend pas le lot
+            during_send.append(send_queued_emails())
+            return send_messages(backend, messages)
+
+        with mock.patch(
+            "django.core.mail.backends.locmem.EmailBackend.send_messages",
+            autospec=True,
+            side_effect=send_while_claimed,
+        ):
+            self.assertEqual(send_queued_emails(), 1)
+
+        self.assertEqual(during_send, [0])
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(QueuedEmail.objects.get().status, QueuedEmail.STATUS_SENT)
+
+
+class NotificationBufferTest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="buffer@test.com", password="test1234", phone="+50934500002"
+        )
+        # Notifications d'inscription : hors du périmètre des tests
+        flush_notifications()
+        Notification.objects.all().delete()
+
+    def test_one_insert_per_transaction_with_dedup(self):
+        received = []
+
+        def receiver(notifications, **kwargs):
+            received.extend(notifications)
+
+        notifications_created.connect(receiver)
+        self.addCleanup(notifications_created.disconnect, receiver)
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            with transaction.atomic(), self.assertNumQueries(0):
+                for _ in range(3):
+                    notify(self.user, "Alèt", "Mesaj")
+                notify_many([
+                    Notification(user=self.user, title=f"Lot {i}", message="Mesaj")
+                    for i in range(50)
+                ])
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertFalse(Notification.objects.exists())
+
+        with CaptureQueriesContext(connection) as queries:
+            callbacks[0]()
+
+        inserts = [q for q in queries if q["sql"].startswith('INSERT INTO "notifications_notification"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(Notification.objects.filter(user=self.user).count(), 51)
+        self.assertEqual(len(received), 51)
+
+    def test_rollback_discards_buffer(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    notify(self.user, "Anile", "Mesaj")
+                    raise ValueError
+            except ValueError:
+                pass
+
+            notify(self.user, "Kenbe", "Mesaj")
+
+        self.assertEqual(
+            list(Notification.objects.values_list("title", flat=True)), ["Kenbe"]
+        )
+
+
+    def test_savepoint_rollback_discards_its_notifications(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                notify(self.user, "Kenbe", "Mesaj")
+                try:
+                    with transaction.atomic():
+                        notify(self.user, "Anile", "Mesaj")
+                        # Doublon d'un bloc englobant : instance déjà retenue
+                        kept = notify(self.user, "Kenbe", "Mesaj")
+                        raise ValueError
+                except ValueError:
+                    pass
+
+                with transaction.atomic():
+                    notify(self.user, "Apre", "Mesaj")
+
+        self.assertIsNotNone(kept.pk)
+        self.assertEqual(
+            sorted(Notification.objects.values_list("title", flat=True)), ["Apre", "Kenbe"]
+        )
+
+
+IN_MEMORY_LAYER = {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+
+
+@override_settings(CHANNEL_LAYERS=IN_MEMORY_LAYER)
+class NotificationPushTest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="push@test.com", password="test1234", phone="+50934500003"
+        )
+        flush_notifications()
+        cache.clear()
+
+        self.layer = get_channel_layer()
+        self.channel = async_to_sync(self.layer.new_channel)()
+        async_to_sync(self.layer.group_add)(user_group(self.user.id), self.channel)
+
+    def receive(self):
+        return async_to_sync(self.layer.receive)(self.channel)
+
+    def pending(self):
+        queue = self.layer.channels.get(self.channel)
+        return 0 if queue is None else queue.qsize()
+
+    def test_one_message_per_user_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                for i in range(3):
+                    notify(self.user, f"Tit {i}", "Mesaj")
+                # Rien n'est publié avant le commit
+                self.assertEqual(self.pending(), 0)
+
+        event = self.receive()
+        self.assertEqual(event["type"], "notify.batch")
+        self.assertEqual([i["title"] for i in event["items"]], ["Tit 0", "Tit 1", "Tit 2"])
+        # La cloche reçoit le compteur serveur, lot compris
+        self.assertEqual(event["unread_count"], Notification.unread_count(self.user))
+        self.assertEqual(self.pending(), 0)
+
+    def test_rate_limit_schedules_single_resync(self):
+        notification = Notification.objects.create(user=self.user, title="T", message="M")
+
+        with mock.patch("notifications.tasks.push_resync.apply_async") as resync:
+            sent = [publish([notification]) for _ in range(PUSH_RATE + 3)]
+
+        self.assertEqual(sum(sent), PUSH_RATE)
+        resync.assert_called_once()
+        self.assertEqual(resync.call_args.kwargs["args"], [self.user.id])
+
+    def test_catch_up_since_id(self):
+        rows = Notification.objects.bulk_create(
+            Notification(user=self.user, title=f"N{i}", message="M") for i in range(5)
+        )
+
+        items, more = catch_up(self.user, rows[1].pk, limit=2)
+
+        self.assertEqual([i["title"] for i in items], ["N2", "N3"])
+        self.assertTrue(more)
+        self.assertEqual(catch_up(self.user, rows[-1].pk), ([], False))
+
+    def test_catch_up_message_carries_unread_count(self):
+        Notification.objects.filter(user=self.user).delete()
+        Notification.objects.bulk_create([
+            Notification(user=self.user, title="Li", message="M", is_read=True),
+            Notification(user=self.user, title="Pa li", message="M"),
+        ])
+        recount_unread()
+
+        # Depuis 0 (aucune notification connue) : tout est rattrapé
+        message = catch_up_message(self.user, 0)
+
+        self.assertEqual([(i["title"], i["is_read"]) for i in message["items"]],
+                         [("Li", True), ("Pa li", False)])
+        self.assertEqual(message["unread_count"], 1)
+
+
+@override_settings(CHANNEL_LAYERS=IN_MEMORY_LAYER)
+class UnreadCounterTest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="unread@test.com", password="test1234", phone="+50934500004"
+        )
+        flush_notifications()
+        Notification.objects.all().delete()
+        UserNotificationStats.objects.all().delete()
+
+    def test_counter_follows_create_read_delete(self):
+        self.assertEqual(Notification.unread_count(self.user), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                for i in range(4):
+                    notify(self.user, f"Tit {i}", "Mesaj")
+
+        with self.assertNumQueries(1):
+            self.assertEqual(Notification.unread_count(self.user), 4)
+
+        first, second, *_ = Notification.objects.filter(user=self.user)
+        first.mark_as_read()
+        Notification.objects.get(pk=first.pk).mark_as_read()
+        second.delete()
+        first.delete()
+        self.assertEqual(Notification.unread_count(self.user), 2)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(mark_all_read(self.user), 2)
+        self.assertEqual(sum(q["sql"].startswith("UPDATE") for q in queries), 2)
+        self.assertEqual(Notification.unread_count(self.user), 0)
+
+    def test_recount_heals_drift(self):
+        notify(self.user, "Tit", "Mesaj")
+        flush_notifications()
+        UserNotificationStats.objects.filter(user=self.user).update(unread_count=9)
+
+        self.assertEqual(recount_unread(chunk_size=1), 1)
+        self.assertEqual(Notification.unread_count(self.user), 1)
+        self.assertEqual(recount_unread(), 0)
+
+
+@override_settings(CHANNEL_LAYERS=IN_MEMORY_LAYER)
+class NotificationAPITest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="api@test.com", password="test1234", phone="+50934500005"
+        )
+        flush_notifications()
+        Notification.objects.all().delete()
+        UserNotificationStats.objects.all().delete()
+
+        Notification.objects.bulk_create(
+            Notification(user=self.user, title=f"N{i}", message="M", is_read=i % 3 == 0)
+            for i in range(12)
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def walk(self, params):
+        titles, params = [], dict(params, page_size=5)
+        while True:
+            response = self.client.get("/api/notifications/", params, secure=True)
+            self.assertEqual(response.status_code, 200)
+            titles += [n["title"] for n in response.data["results"]]
+            if not response.data["next_cursor"]:
+                return titles
+            params["cursor"] = response.data["next_cursor"]
+
+    def test_keyset_pages_and_status_filter(self):
+        newest_first = [f"N{i}" for i in reversed(range(12))]
+
+        self.assertEqual(self.walk({}), newest_first)
+        self.assertEqual(
+            self.walk({"status": "unread"}),
+            [t for t in newest_first if int(t[1:]) % 3],
+        )
+        self.assertEqual(self.walk({"status": "read"}), ["N9", "N6", "N3", "N0"])
+
+    def test_read_actions_update_counter(self):
+        unread = Notification.objects.filter(user=self.user, is_read=False).first()
+
+        response = self.client.post(f"/api/notifications/{unread.pk}/read/", secure=True)
+        self.assertEqual(response.data["unread_count"], 7)
+
+        response = self.client.post("/api/notifications/read-all/", secure=True)
+        self.assertEqual(response.data["updated"], 7)
+        self.assertEqual(self.client.get("/api/notifications/unread-count/", secure=True).data["unread_count"], 0)
+
+        other = User.objects.create_user(
+            email="other@test.com", password="test1234", phone="+50934500006"
+        )
+        foreign = Notification.objects.create(user=other, title="X", message="M")
+        self.assertEqual(self.client.post(f"/api/notifications/{foreign.pk}/read/", secure=True).status_code, 404)
+
+    def test_html_list_loads_next_rows_with_filters(self):
+        client = self.client_class()
+        client.force_login(self.user)
+        session = client.session
+        session["otp_verified"] = True
+        session.save()
+
+        response = client.get("/notifications/?status=unread", secure=True)
+        self.assertEqual(len(response.context["page"]), 8)
+        self.assertFalse(response.context["page"].has_next)
+
+        Notification.objects.bulk_create(
+            Notification(user=self.user, title=f"P{i}", message="M") for i in range(20)
+        )
+        response = client.get("/notifications/?status=unread", secure=True)
+        cursor = response.context["page"].next_cursor
+        self.assertContains(response, f"?status=unread&cursor={cursor}")
+
+        response = client.get(
+            f"/notifications/?status=unread&cursor={cursor}", secure=True, HTTP_HX_REQUEST="true"
+        )
+        self.assertTemplateUsed(response, "notifications/partials/notification_rows.html")
+        self.assertTemplateNotUsed(response, "notifications/notification_list.html")
+        self.assertEqual(len(response.context["page"]), 8)
@@ -2,7 +2,11 @@ from django.http import JsonResponse
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
+from django.views.decorators.http import require_POST
+from core.pagination import keyset_paginate
+from .filters import filter_notifications
 from .models import Notification
+from .services.unread_counter import mark_all_read
 from users.decorators import verified_required
 
 # --- Helpers ---
@@ -14,9 +18,19 @@ def user_can_access_notification(user, notification):
 @login_required
 @verified_required
 def notification_list(request):
-    notifications = Notification.objects.filter(user=request.user).order_by('-created_at')
-    # Pagination optionnelle si tu veux
-    return render(request, 'notifications/notification_list.html', {'notifications': notifications})
+    notifications = filter_notifications(
+        Notification.objects.filter(user=request.user), request.GET
+    )
+    page = keyset_paginate(notifications, request.GET.get('cursor'), page_size=20)
+
+    # Filtres à conserver dans le lien "Chaje plis"
+    params = request.GET.copy()
+    params.pop('cursor', None)
+    context = {'page': page, 'filter_query': params.urlencode()}
+
+    if request.headers.get("HX-Request"):
+        return render(request, 'notifications/partials/notification_rows.html', context)
+    return render(request, 'notifications/notification_list.html', context)
 
 # --- Détail d'une notification ---
 @login_required
@@ -34,12 +48,20 @@ def notification_detail(request, notification_id):
 def notification_mark_as_read(request, notification_id):
     notification = get_object_or_404(Notification, id=notification_id)
     if request.method == "POST":
-        notification.is_read = True
-        notification.save()
+        notification.mark_as_read()
         messages.success(request, "Notification marquée comme lue.")
         return redirect('notifications:notification_list')
     return render(request, "notifications/mark_as_read.html", {"notification": notification})
 
+# --- Tout marquer comme lu ---
+@login_required
+@verified_required
+@require_POST
+def notification_mark_all_as_read(request):
+    updated = mark_all_read(request.user)
+    messages.success(request, f"{updated} notification(s) marquée(s) comme lue(s).")
+    return redirect('notifications:notification_list')
+
 # --- Supprimer une notification ---
 @login_required
 @verified_required
@@ -0,0 +1,40 @@
+from rest_framework import viewsets, permissions
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from core.pagination import KeysetPagination
+from .filters import filter_notifications
+from .models import Notification
+from .serializers import NotificationSerializer
+from .services.unread_counter import mark_all_read
+
+
+class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Notifications de l'utilisateur, par curseur (created_at, id).
+    Filtres : ?status=unread|read, query, start_date, end_date.
+    """
+    pagination_class = KeysetPagination
+    serializer_class = NotificationSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        queryset = Notification.objects.filter(user=self.request.user)
+        if self.action == "list":
+            queryset = filter_notifications(queryset, self.request.query_params)
+        return queryset
+
+    @action(detail=True, methods=["post"])
+    def read(self, request, pk=None):
+        notification = self.get_object()
+        notification.mark_as_read()
+        return Response({"unread_count": Notification.unread_count(request.user)})
+
+    @action(detail=False, methods=["post"], url_path="read-all")
+    def read_all(self, request):
+        updated = mark_all_read(request.user)
+        return Response({"updated": updated, "unread_count": 0})
+
+    @action(detail=False, methods=["get"], url_path="unread-count")
+    def unread_count(self, request):
+        return Response({"unread_count": Notification.unread_count(request.user)})
@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Recharge, Transaction, Payment, BalanceCurrency, Wallet, FundTransfer
+from .models import Recharge, Transaction, Payment, BalanceCurrency, Wallet, FundTransfer, RewardClaim, RewardCampaign, ExchangeRate, JobCheckpoint, LedgerDailyRollup, LedgerMonthlyRollup, IdempotencyKey, OutboxEvent, PooledWalletAddress, SystemAccountShard, SystemAccountBalance
+from .services.exchange_rate_service import ExchangeRateService
 
 @admin.register(BalanceCurrency)
 class BalanceCurrencyAdmin(admin.ModelAdmin):
@@ -36,4 +37,99 @@ class RechargeAdmin(admin.ModelAdmin):
 class FundTransferAdmin(admin.ModelAdmin):
     list_display = ("sender", "amount", "currency", "method", "status", "created_at")
     list_filter = ("currency", "method", "status")
-    search_fields = ("user__email",)
\ No newline at end of file
+    search_fields = ("user__email",)
+
+@admin.register(RewardClaim)
+class RewardClaimAdmin(admin.ModelAdmin):
+    list_display = ("user", "reward_key", "day", "created_at")
+    list_filter = ("reward_key", "day")
+    search_fields = ("user__email",)
+
+
+@admin.register(RewardCampaign)
+class RewardCampaignAdmin(admin.ModelAdmin):
+    list_display = ("key", "amount", "currency", "status", "processed_count", "created_at")
+    list_filter = ("status", "currency")
+    search_fields = ("key",)
+
+
+@admin.register(ExchangeRate)
+class ExchangeRateAdmin(admin.ModelAdmin):
+    list_display = ("currency", "rate", "version", "source", "created_by", "created_at")
+    list_filter = ("currency", "source")
+    fields = ("currency", "rate")
+
+    def has_change_permission(self, request, obj=None):
+        # Un taux publié est immuable : on ajoute une nouvelle version
+        return obj is None and super().has_change_permission(request, obj)
+
+    def save_model(self, request, obj, form, change):
+        published = ExchangeRateService.publish(
+            obj.currency, obj.rate, created_by=request.user
+        )
+        obj.pk = published.pk
+
+
+@admin.register(JobCheckpoint)
+class JobCheckpointAdmin(admin.ModelAdmin):
+    list_display = ("name", "last_timestamp", "last_position", "updated_at")
+    search_fields = ("name",)
+
+
+@admin.register(LedgerDailyRollup)
+class LedgerDailyRollupAdmin(admin.ModelAdmin):
+    list_display = ("user", "day", "currency", "transaction_type", "bonus_type", "amount", "tx_count")
+    list_filter = ("currency", "transaction_type", "bonus_type")
+    search_fields = ("user__email",)
+    date_hierarchy = "day"
+
+
+@admin.register(LedgerMonthlyRollup)
+class LedgerMonthlyRollupAdmin(admin.ModelAdmin):
+    list_display = ("user", "month", "currency", "transaction_type", "bonus_type", "amount", "tx_count")
+    list_filter = ("currency", "transaction_type", "bonus_type")
+    search_fields = ("user__email",)
+
+
+@admin.register(IdempotencyKey)
+class IdempotencyKeyAdmin(admin.ModelAdmin):
+    list_display = ("user", "scope", "key", "created_at", "expires_at")
+    list_filter = ("scope",)
+    search_fields = ("user__email", "key")
+    readonly_fields = ("fingerprint", "response")
+
+
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = ("topic", "status", "attempts", "available_at", "created_at", "processed_at")
+    list_filter = ("topic", "status")
+    search_fields = ("dedup_key",)
+    readonly_fields = ("payload", "last_error")
+
+
+@admin.register(PooledWalletAddress)
+class PooledWalletAddressAdmin(admin.ModelAdmin):
+    list_display = ("network", "address", "created_at")
+    list_filter = ("network",)
+
+
+@admin.register(SystemAccountShard)
+class SystemAccountShardAdmin(admin.ModelAdmin):
+    list_display = ("account", "currency", "shard", "amount", "updated_at")
+    list_filter = ("account", "currency")
+    readonly_fields = ("amount_minor",)
+
+
+@admin.register(SystemAccountBalance)
+class SystemAccountBalanceAdmin(admin.ModelAdmin):
+    list_display = ("account", "currency", "amount", "shard_count", "updated_at")
+    list_filter = ("account", "currency")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
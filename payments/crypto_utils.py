@@ -1,15 +1,39 @@
 # utilise cryptography.Fernet pour chiffrer la clé privée avant stockage
-from cryptography.fernet import Fernet
+from cryptography.fernet import Fernet, MultiFernet
+import hashlib
 import os
 
 # GENERE UNE FOIS et stocker en .env (FERNET_KEY)
 # Fernet.generate_key().decode()
+#
+# Rotation : la nouvelle clé devient FERNET_KEY, les anciennes passent
+# dans FERNET_OLD_KEYS (séparées par des virgules) le temps de lancer
+# `manage.py rotate_wallet_keys`, puis peuvent être retirées.
 
 FERNET_KEY = os.environ.get("FERNET_KEY")  # ex: base64 key
-fernet = Fernet(FERNET_KEY.encode())
+FERNET_OLD_KEYS = [k.strip() for k in os.environ.get("FERNET_OLD_KEYS", "").split(",") if k.strip()]
+
+# La première clé chiffre ; toutes sont essayées pour déchiffrer
+fernet = MultiFernet([Fernet(k.encode()) for k in [FERNET_KEY, *FERNET_OLD_KEYS]])
+
+# Identifie la clé primaire sans l'exposer (point de reprise de rotation)
+FERNET_KEY_ID = hashlib.sha256(FERNET_KEY.encode()).hexdigest()[:12]
 
 def encrypt_privkey(priv_hex: str) -> str:
     return fernet.encrypt(priv_hex.encode()).decode()
 
 def decrypt_privkey(token: str) -> str:
-    return fernet.decrypt(token.encode()).decode()
\ No newline at end of file
+    return fernet.decrypt(token.encode()).decode()
+
+def rotate_privkey(token: str) -> str:
+    """
+    Re-chiffre un jeton avec la clé primaire (sans exposer le clair).
+    """
+    return fernet.rotate(token.encode()).decode()
+
+def rotate_privkeys(rows):
+    """
+    [(pk, jeton), ...] -> [(pk, nouveau jeton), ...] ; exécutable dans
+    un worker de ProcessPoolExecutor (aucune dépendance Django).
+    """
+    return [(pk, rotate_privkey(token)) for pk, token in rows]
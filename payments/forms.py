@@ -68,9 +68,9 @@ class RechargeForm(forms.ModelForm):
 class FundTransferForm(forms.ModelForm):
     class Meta:
         model = FundTransfer
-        fields = ['sender', 'amount', 'currency', 'method', 'description']
+        fields = ['receiver', 'amount', 'currency', 'method', 'description']
         widgets = {
-            'reciever': forms.Select(attrs={'class': 'form-select'}),
+            'receiver': forms.Select(attrs={'class': 'form-select'}),
             'amount': forms.NumberInput(attrs={'class': 'form-control', 'step': '0.01'}),
             'currency': forms.Select(attrs={'class': 'form-select'}),
             'method': forms.Select(attrs={'class': 'form-select'}),
@@ -81,15 +81,15 @@ class FundTransferForm(forms.ModelForm):
         sender = kwargs.pop('sender', None)
         super().__init__(*args, **kwargs)
         if sender:
-            self.fields['reciever'].queryset = self.fields['reciever'].queryset.exclude(id=sender.id)
+            self.fields['receiver'].queryset = self.fields['receiver'].queryset.exclude(id=sender.id)
             self.initial['sender'] = sender
 
-    def clean_reciever(self):
-        reciever = self.cleaned_data.get('reciever')
+    def clean_receiver(self):
+        receiver = self.cleaned_data.get('receiver')
         sender = self.initial.get('sender')
-        if sender and reciever == sender:
+        if sender and receiver == sender:
             raise forms.ValidationError("Vous ne pouvez pas vous transférer des fonds à vous-même.")
-        return reciever
+        return receiver
     
 # ---------------- TRANSACTION ---------------- 
 class TransactionForm(forms.ModelForm):
@@ -0,0 +1,138 @@
+from functools import wraps
+
+from django.http import HttpResponse
+from rest_framework.response import Response
+
+from payments.services.idempotency_service import (
+    IdempotencyConflict,
+    IdempotencyService,
+    fingerprint,
+)
+
+# ======================================================
+# 🔁 EN-TÊTE Idempotency-Key (VUES HTML ET API)
+# ======================================================
+# Les clients mobiles envoient l'en-tête ; les formulaires HTML
+# un champ caché (voir {% idempotency_field %}).
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+IDEMPOTENCY_FIELD = "idempotency_key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+_IGNORED_FIELDS = {"csrfmiddlewaretoken", IDEMPOTENCY_FIELD}
+
+
+def get_idempotency_key(request):
+    return (
+        request.headers.get(IDEMPOTENCY_HEADER)
+        or request.POST.get(IDEMPOTENCY_FIELD)
+        or None
+    )
+
+
+# ==========================
+# VUES DJANGO
+# ==========================
+def _dump_response(response):
+    """
+    Seuls les succès sont enregistrés : redirection (PRG) ou 201.
+    Un formulaire réaffiché avec ses erreurs libère la clé.
+    """
+    if response.status_code in (301, 302, 303, 307, 308):
+        return {"status": response.status_code, "location": response["Location"]}
+    if response.status_code == 201:
+        return {
+            "status": 201,
+            "content": response.content.decode(),
+            "content_type": response["Content-Type"],
+        }
+    return None
+
+
+def _load_response(payload):
+    response = HttpResponse(
+        payload.get("content", ""),
+        status=payload["status"],
+        content_type=payload.get("content_type"),
+    )
+    if "location" in payload:
+        response["Location"] = payload["location"]
+    response[REPLAYED_HEADER] = "true"
+    return response
+
+
+def idempotent_view(scope):
+    """
+    Décorateur de vue POST : un nouvel essai avec la même clé renvoie
+    la réponse d'origine sans réexécuter la vue.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            key = get_idempotency_key(request) if request.method == "POST" else None
+            if not key or not request.user.is_authenticated:
+                return view(request, *args, **kwargs)
+
+            request_fingerprint = fingerprint(
+                request.path,
+                sorted(
+                    (name, values)
+                    for name, values in request.POST.lists()
+                    if name not in _IGNORED_FIELDS
+                ),
+            )
+
+            try:
+                return IdempotencyService.run(
+                    request.user,
+                    scope,
+                    key,
+                    request_fingerprint,
+                    lambda: view(request, *args, **kwargs),
+                    dump=_dump_response,
+                    load=_load_response,
+                )
+            except IdempotencyConflict as e:
+                return HttpResponse(str(e), status=e.status_code)
+
+        return wrapper
+    return decorator
+
+
+# ==========================
+# API (DRF)
+# ==========================
+def _dump_api_response(response):
+    if 200 <= response.status_code < 300:
+        return {"status": response.status_code, "data": response.data}
+    return None
+
+
+def _load_api_response(payload):
+    return Response(payload["data"], status=payload["status"], headers={REPLAYED_HEADER: "true"})
+
+
+class IdempotentCreateMixin:
+    """
+    Pour un ViewSet : `create` honore l'en-tête Idempotency-Key.
+    """
+    idempotency_scope = None
+
+    def create(self, request, *args, **kwargs):
+        create = super().create
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return create(request, *args, **kwargs)
+
+        try:
+            return IdempotencyService.run(
+                request.user,
+                self.idempotency_scope or self.basename,
+                key,
+                fingerprint(request.path, request.data),
+                lambda: create(request, *args, **kwargs),
+                dump=_dump_api_response,
+                load=_load_api_response,
+            )
+        except IdempotencyConflict as e:
+            return Response({"detail": str(e)}, status=e.status_code)
@@ -0,0 +1,65 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from payments.models import Transaction
+from payments.services.export_service import EXPORT_FORMATS, filter_transactions, iter_export
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Exporte le ledger (Transaction) en CSV ou JSONL, en flux"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="user_id ou email (par défaut : tous)")
+        parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+        parser.add_argument("--start", help="AAAA-MM-JJ (inclus)")
+        parser.add_argument("--end", help="AAAA-MM-JJ (inclus)")
+        parser.add_argument("--currency")
+        parser.add_argument("--type", dest="transaction_type")
+        parser.add_argument("--output", "-o", help="Fichier de sortie (par défaut : stdout)")
+
+    def handle(self, *args, **options):
+        queryset = Transaction.objects.all()
+
+        if options["user"]:
+            lookup = {"email__iexact": options["user"]} if "@" in options["user"] else {"pk": options["user"]}
+            try:
+                user = User.objects.get(**lookup)
+            except (User.DoesNotExist, ValueError):
+                raise CommandError(f"Itilizatè introuvable : {options['user']}")
+            queryset = queryset.filter(user=user)
+
+        dates = {}
+        for key in ("start", "end"):
+            try:
+                dates[key] = parse_date(options[key]) if options[key] else None
+            except ValueError:
+                # Bien formée mais impossible (ex : 2024-02-30)
+                dates[key] = None
+            if options[key] and dates[key] is None:
+                raise CommandError(f"Date invalide : --{key}")
+
+        queryset = filter_transactions(
+            queryset,
+            start=dates["start"],
+            end=dates["end"],
+            currency=options["currency"],
+            transaction_type=options["transaction_type"],
+        )
+
+        if options["output"]:
+            with open(options["output"], "w", newline="", encoding="utf-8") as out:
+                count = self._write(out.write, queryset, options["format"])
+            self.stderr.write(self.style.SUCCESS(f"{count} lignes écrites dans {options['output']}"))
+        else:
+            self._write(lambda chunk: self.stdout.write(chunk, ending=""), queryset, options["format"])
+
+    def _write(self, write, queryset, fmt):
+        count = 0
+        for chunk in iter_export(queryset, fmt):
+            write(chunk)
+            count += 1
+        # L'en-tête CSV n'est pas une transaction
+        return count - (1 if fmt == "csv" else 0)
@@ -0,0 +1,60 @@
+import csv
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from payments.services.deposit_service import (
+    DEPOSIT_BATCH_SIZE,
+    DEPOSIT_FORMATS,
+    REJECT_DUPLICATE,
+    REJECT_INVALID,
+    REJECT_UNMATCHED,
+    DepositMatcher,
+    iter_deposit_feed,
+)
+
+
+class Command(BaseCommand):
+    help = "Crédite les dépôts d'un fichier fournisseur (JSONL ou CSV : reference, address, amount, currency)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Fichier de dépôts ('-' pour stdin)")
+        parser.add_argument("--format", choices=DEPOSIT_FORMATS)
+        parser.add_argument("--provider", default="", help="Fournisseur par défaut")
+        parser.add_argument("--batch-size", type=int, default=DEPOSIT_BATCH_SIZE)
+        parser.add_argument("--rejects", help="CSV des lignes écartées (motif + ligne)")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or ("csv" if path.endswith(".csv") else "jsonl")
+
+        try:
+            stream = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8")
+        except OSError as e:
+            raise CommandError(f"Fichier de dépôts illisible : {e}")
+
+        try:
+            report = DepositMatcher.ingest(
+                iter_deposit_feed(stream, fmt),
+                provider=options["provider"],
+                batch_size=options["batch_size"],
+            )
+        except ValueError as e:
+            raise CommandError(f"Flux de dépôts invalide : {e}")
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        if options["rejects"]:
+            with open(options["rejects"], "w", newline="", encoding="utf-8") as out:
+                writer = csv.writer(out)
+                writer.writerow(["reason", "row"])
+                for reason, row in report.rejected:
+                    writer.writerow([reason, row])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{report.credited} dépôts crédités | "
+            f"{report.count(REJECT_DUPLICATE)} doublons | "
+            f"{report.count(REJECT_UNMATCHED)} sans wallet | "
+            f"{report.count(REJECT_INVALID)} invalides"
+        ))
@@ -0,0 +1,87 @@
+import csv
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from payments.services.reward_service import JMU, issue_campaign
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Émet une récompense de campagne à un grand nombre d'utilisateurs (reprise possible)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--key", required=True, help="Identifiant unique de la campagne")
+        parser.add_argument("--amount", type=Decimal)
+        parser.add_argument("--reason", default="Bonis kanpay")
+        parser.add_argument("--currency", default=JMU)
+        parser.add_argument("--csv", help="Fichier CSV avec une colonne user_id ou email")
+        parser.add_argument("--all", action="store_true", help="Tous les utilisateurs actifs")
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if bool(options["csv"]) == options["all"]:
+            raise CommandError("Utiliser --csv OU --all")
+
+        if options["all"]:
+            users = User.objects.filter(is_active=True)
+        else:
+            users = self._read_csv(options["csv"], options["chunk_size"])
+
+        def progress(campaign):
+            self.stdout.write(
+                f"{campaign.key}: {campaign.processed_count} crédités "
+                f"(dernier user_id {campaign.last_user_id})"
+            )
+
+        unknown = []
+
+        campaign = issue_campaign(
+            users,
+            campaign_key=options["key"],
+            amount=options["amount"],
+            reason=options["reason"],
+            currency=options["currency"],
+            chunk_size=options["chunk_size"],
+            progress=progress,
+            skipped=unknown.extend,
+        )
+
+        if unknown:
+            self.stdout.write(self.style.WARNING(
+                f"{len(unknown)} user_id inconnus ignorés : "
+                + ", ".join(str(uid) for uid in unknown)
+            ))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Campagne {campaign.key} terminée : {campaign.processed_count} utilisateurs"
+        ))
+
+    def _read_csv(self, path, chunk_size):
+        """
+        Lit le CSV en flux et résout les emails par lots.
+        """
+        ids, emails = [], []
+
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+
+            for row in reader:
+                if row.get("user_id"):
+                    ids.append(int(row["user_id"]))
+                elif row.get("email"):
+                    emails.append(row["email"].strip().lower())
+
+                if len(emails) >= chunk_size:
+                    ids.extend(self._resolve_emails(emails))
+                    emails = []
+
+        if emails:
+            ids.extend(self._resolve_emails(emails))
+
+        return ids
+
+    def _resolve_emails(self, emails):
+        return User.objects.filter(email__in=emails).values_list("id", flat=True)
@@ -0,0 +1,42 @@
+import csv
+import json
+from decimal import Decimal, InvalidOperation
+
+from django.core.management.base import BaseCommand, CommandError
+
+from payments.models import ExchangeRate
+from payments.services.exchange_rate_service import ExchangeRateService
+
+
+class Command(BaseCommand):
+    help = "Publie de nouvelles versions de taux (HTG) depuis un fichier JSON ou CSV"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help='JSON {"usd": "132.50"} ou CSV currency,rate')
+
+    def handle(self, *args, **options):
+        path = options["path"]
+
+        try:
+            rates = self._read(path)
+        except (OSError, ValueError, InvalidOperation) as e:
+            raise CommandError(f"Fichier de taux invalide : {e}")
+
+        for currency, rate in rates.items():
+            obj = ExchangeRateService.publish(
+                currency, rate, source=ExchangeRate.SOURCE_FILE
+            )
+            self.stdout.write(str(obj))
+
+        self.stdout.write(self.style.SUCCESS(f"{len(rates)} taux publiés"))
+
+    def _read(self, path):
+        with open(path, newline="", encoding="utf-8") as f:
+            if path.endswith(".json"):
+                data = json.load(f)
+                return {c.lower(): Decimal(str(r)) for c, r in data.items()}
+
+            return {
+                row["currency"].strip().lower(): Decimal(row["rate"].strip())
+                for row in csv.DictReader(f)
+            }
@@ -0,0 +1,53 @@
+import csv
+
+from django.core.management.base import BaseCommand
+
+from payments.services.reconciliation_service import RECONCILE_CHUNK_SIZE, ReconciliationService
+from payments.utils.minor_units import from_minor
+
+
+class Command(BaseCommand):
+    help = "Compare les soldes BalanceCurrency à la somme du ledger (Transaction)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=RECONCILE_CHUNK_SIZE)
+        parser.add_argument("--currency")
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Ajoute une écriture ADJUSTMENT pour chaque écart",
+        )
+        parser.add_argument("--output", "-o", help="Rapport CSV des écarts")
+
+    def handle(self, *args, **options):
+        out = open(options["output"], "w", newline="", encoding="utf-8") if options["output"] else None
+        writer = csv.writer(out) if out else None
+        if writer:
+            writer.writerow(["user_id", "currency", "balance", "ledger", "drift"])
+
+        count = 0
+        try:
+            for drift in ReconciliationService.iter_drifts(
+                chunk_size=options["chunk_size"],
+                currency=options["currency"],
+                fix=options["fix"],
+            ):
+                count += 1
+                row = [
+                    drift.user_id,
+                    drift.currency,
+                    from_minor(drift.balance_minor, drift.currency),
+                    from_minor(drift.ledger_minor, drift.currency),
+                    drift.drift,
+                ]
+                if writer:
+                    writer.writerow(row)
+                else:
+                    self.stdout.write(" | ".join(str(v) for v in row))
+        finally:
+            if out:
+                out.close()
+
+        action = "corrigés" if options["fix"] else "détectés"
+        style = self.style.WARNING if count else self.style.SUCCESS
+        self.stderr.write(style(f"{count} écarts {action}"))
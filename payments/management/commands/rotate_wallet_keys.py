@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from payments.services.key_rotation_service import KEY_ROTATION_CHUNK_SIZE, KeyRotationService
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-chiffre les clés privées des wallets avec la clé FERNET_KEY courante "
+        "(anciennes clés dans FERNET_OLD_KEYS)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=KEY_ROTATION_CHUNK_SIZE)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Processus pour le chiffrement (1 = dans le process courant)",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Ignore le point de reprise et repart du premier wallet",
+        )
+
+    def handle(self, *args, **options):
+        total = KeyRotationService.rotate_wallets(
+            chunk_size=options["chunk_size"],
+            workers=options["workers"],
+            restart=options["restart"],
+            progress=lambda n: self.stderr.write(f"{n} wallets…"),
+        )
+        self.stdout.write(self.style.SUCCESS(f"{total} clés re-chiffrées"))
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.3 on 2026-10-18 11:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0011_rewardclaim'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RewardCampaign',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.SlugField(max_length=40, unique=True)),
+                ('amount', models.DecimalField(decimal_places=18, max_digits=30)),
+                ('currency', models.CharField(choices=[('jmu', 'JMU'), ('htg', 'HTG'), ('usd', 'USD')], default='jmu', max_length=10)),
+                ('reason', models.CharField(max_length=255)),
+                ('status', models.CharField(choices=[('pending', 'En attente'), ('running', 'En cours'), ('completed', 'Terminée')], default='pending', max_length=20)),
+                ('last_user_id', models.BigIntegerField(default=0)),
+                ('processed_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
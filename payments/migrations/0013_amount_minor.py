@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-18 11:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0012_rewardcampaign'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='balancecurrency',
+            name='amount_minor',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='amount_minor',
+            field=models.BigIntegerField(default=0),
+        ),
+    ]
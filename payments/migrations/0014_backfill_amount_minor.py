@@ -0,0 +1,45 @@
+# Generated by Django 5.2.3 on 2026-10-18 11:13
+
+from django.db import migrations
+
+from payments.utils.minor_units import to_minor
+
+BATCH_SIZE = 2000
+
+# Colonnes encore en BIGINT à ce stade : les montants qui n'y tiennent
+# pas (JMU >= 9.22) restent à 0 et sont remplis par 0026
+BIGINT_MAX = 2 ** 63 - 1
+
+
+def backfill(model_name):
+    def run(apps, schema_editor):
+        Model = apps.get_model("payments", model_name)
+        batch = []
+
+        for obj in Model.objects.only("pk", "amount", "currency").iterator(chunk_size=BATCH_SIZE):
+            minor = to_minor(obj.amount, obj.currency)
+            if abs(minor) > BIGINT_MAX:
+                continue
+            obj.amount_minor = minor
+            batch.append(obj)
+
+            if len(batch) >= BATCH_SIZE:
+                Model.objects.bulk_update(batch, ["amount_minor"])
+                batch = []
+
+        if batch:
+            Model.objects.bulk_update(batch, ["amount_minor"])
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0013_amount_minor'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill("BalanceCurrency"), migrations.RunPython.noop),
+        migrations.RunPython(backfill("Transaction"), migrations.RunPython.noop),
+    ]
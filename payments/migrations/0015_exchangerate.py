@@ -0,0 +1,32 @@
+# Generated by Django 5.2.3 on 2026-10-18 11:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0014_backfill_amount_minor'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExchangeRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('currency', models.CharField(max_length=10)),
+                ('rate', models.DecimalField(decimal_places=18, max_digits=30)),
+                ('version', models.PositiveIntegerField()),
+                ('source', models.CharField(choices=[('admin', 'Administrateur'), ('file', 'Fichier'), ('seed', 'Valeur initiale')], default='admin', max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['currency', '-version'],
+                'unique_together': {('currency', 'version')},
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.3 on 2026-10-18 11:24
+
+from decimal import Decimal
+
+from django.db import migrations
+
+# Anciennes constantes core.utils.TAUX_HTG
+INITIAL_RATES = {
+    "usd": Decimal("132.50"),
+    "usdt": Decimal("132.50"),
+    "btc": Decimal("8500000"),
+    "jmu": Decimal("0.001"),
+}
+
+
+def seed(apps, schema_editor):
+    ExchangeRate = apps.get_model("payments", "ExchangeRate")
+
+    for currency, rate in INITIAL_RATES.items():
+        if not ExchangeRate.objects.filter(currency=currency).exists():
+            ExchangeRate.objects.create(
+                currency=currency, rate=rate, version=1, source="seed"
+            )
+
+
+def unseed(apps, schema_editor):
+    ExchangeRate = apps.get_model("payments", "ExchangeRate")
+    ExchangeRate.objects.filter(source="seed", version=1).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0015_exchangerate'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed, unseed),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.3 on 2026-10-18 11:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0016_seed_exchange_rates'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='fundtransfer',
+            index=models.Index(fields=['sender', 'created_at', 'id'], name='pay_transfer_sender_crt_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='pay_payment_user_crt_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recharge',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='pay_recharge_user_crt_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='pay_tx_user_crt_idx'),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.3 on 2026-10-18 11:33
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0017_keyset_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('last_timestamp', models.DateTimeField(blank=True, null=True)),
+                ('last_position', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='LedgerDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('currency', models.CharField(max_length=10)),
+                ('transaction_type', models.CharField(choices=[('CREDIT', 'ajoute'), ('DEBIT', 'retire')], max_length=30)),
+                ('bonus_type', models.CharField(choices=[('signup', 'Création de compte'), ('referral', 'Parrainage'), ('payment_success', 'Paiement'), ('create_first_vehicle', 'Création du Premier Vehiéhicule'), ('random', 'Aléatoire'), ('daily_login', 'Bonus quotidien'), ('contract', 'Contrat'), ('transfer', 'Transfert')], max_length=30)),
+                ('amount_minor', models.BigIntegerField(default=0)),
+                ('tx_count', models.PositiveIntegerField(default=0)),
+                ('day', models.DateField()),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-day'],
+                'unique_together': {('user', 'day', 'currency', 'transaction_type', 'bonus_type')},
+            },
+        ),
+        migrations.CreateModel(
+            name='LedgerMonthlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('currency', models.CharField(max_length=10)),
+                ('transaction_type', models.CharField(choices=[('CREDIT', 'ajoute'), ('DEBIT', 'retire')], max_length=30)),
+                ('bonus_type', models.CharField(choices=[('signup', 'Création de compte'), ('referral', 'Parrainage'), ('payment_success', 'Paiement'), ('create_first_vehicle', 'Création du Premier Vehiéhicule'), ('random', 'Aléatoire'), ('daily_login', 'Bonus quotidien'), ('contract', 'Contrat'), ('transfer', 'Transfert')], max_length=30)),
+                ('amount_minor', models.BigIntegerField(default=0)),
+                ('tx_count', models.PositiveIntegerField(default=0)),
+                ('month', models.DateField()),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-month'],
+                'unique_together': {('user', 'month', 'currency', 'transaction_type', 'bonus_type')},
+            },
+        ),
+    ]
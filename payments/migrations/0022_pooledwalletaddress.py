@@ -0,0 +1,26 @@
+# Generated by Django 5.2.3 on 2026-10-18 11:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0021_payment_type_outbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PooledWalletAddress',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('network', models.CharField(max_length=50)),
+                ('public_key', models.CharField(max_length=255, unique=True)),
+                ('address', models.CharField(max_length=255, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['network', 'id'], name='pay_pool_network_idx')],
+            },
+        ),
+    ]
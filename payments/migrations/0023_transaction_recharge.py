@@ -0,0 +1,28 @@
+# Generated by Django 5.2.3 on 2026-10-18 11:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0022_pooledwalletaddress'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='ledgerdailyrollup',
+            name='bonus_type',
+            field=models.CharField(choices=[('signup', 'Création de compte'), ('referral', 'Parrainage'), ('payment_success', 'Paiement'), ('create_first_vehicle', 'Création du Premier Vehiéhicule'), ('random', 'Aléatoire'), ('daily_login', 'Bonus quotidien'), ('contract', 'Contrat'), ('transfer', 'Transfert'), ('adjustment', 'Ajustement'), ('recharge', 'Recharge')], max_length=30),
+        ),
+        migrations.AlterField(
+            model_name='ledgermonthlyrollup',
+            name='bonus_type',
+            field=models.CharField(choices=[('signup', 'Création de compte'), ('referral', 'Parrainage'), ('payment_success', 'Paiement'), ('create_first_vehicle', 'Création du Premier Vehiéhicule'), ('random', 'Aléatoire'), ('daily_login', 'Bonus quotidien'), ('contract', 'Contrat'), ('transfer', 'Transfert'), ('adjustment', 'Ajustement'), ('recharge', 'Recharge')], max_length=30),
+        ),
+        migrations.AlterField(
+            model_name='transaction',
+            name='bonus_type',
+            field=models.CharField(choices=[('signup', 'Création de compte'), ('referral', 'Parrainage'), ('payment_success', 'Paiement'), ('create_first_vehicle', 'Création du Premier Vehiéhicule'), ('random', 'Aléatoire'), ('daily_login', 'Bonus quotidien'), ('contract', 'Contrat'), ('transfer', 'Transfert'), ('adjustment', 'Ajustement'), ('recharge', 'Recharge')], default='signup', max_length=30),
+        ),
+    ]
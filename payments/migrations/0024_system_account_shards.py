@@ -0,0 +1,58 @@
+# Generated by Django 5.2.3 on 2026-10-18 11:54
+
+from django.db import migrations, models
+
+SYSTEM_ACCOUNT_BALANCE_VIEW = """
+CREATE VIEW payments_systemaccountbalance AS
+SELECT
+    account || ':' || currency AS id,
+    account,
+    currency,
+    SUM(amount_minor) AS amount_minor,
+    COUNT(*) AS shard_count,
+    MAX(updated_at) AS updated_at
+FROM payments_systemaccountshard
+GROUP BY account, currency
+"""
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0023_transaction_recharge'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SystemAccountBalance',
+            fields=[
+                ('id', models.CharField(max_length=40, primary_key=True, serialize=False)),
+                ('account', models.CharField(choices=[('treasury', 'Trésorerie (récompenses)'), ('revenue', 'Recettes (péages, frais)')], max_length=20)),
+                ('currency', models.CharField(choices=[('jmu', 'JMU'), ('htg', 'HTG'), ('usd', 'USD')], max_length=10)),
+                ('amount_minor', models.BigIntegerField()),
+                ('shard_count', models.IntegerField()),
+                ('updated_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'payments_systemaccountbalance',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='SystemAccountShard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('account', models.CharField(choices=[('treasury', 'Trésorerie (récompenses)'), ('revenue', 'Recettes (péages, frais)')], max_length=20)),
+                ('currency', models.CharField(choices=[('jmu', 'JMU'), ('htg', 'HTG'), ('usd', 'USD')], max_length=10)),
+                ('shard', models.PositiveSmallIntegerField()),
+                ('amount_minor', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('account', 'currency', 'shard')},
+            },
+        ),
+        migrations.RunSQL(
+            SYSTEM_ACCOUNT_BALANCE_VIEW,
+            "DROP VIEW IF EXISTS payments_systemaccountbalance",
+        ),
+    ]
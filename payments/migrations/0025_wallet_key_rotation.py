@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0024_system_account_shards'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobcheckpoint',
+            name='last_key',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='wallet',
+            name='encrypted_private_key',
+            field=models.TextField(blank=True, default=''),
+        ),
+    ]
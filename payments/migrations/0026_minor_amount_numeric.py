@@ -0,0 +1,87 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:47
+
+import payments.utils.minor_units
+from django.db import migrations
+from django.db.models import Q
+
+from payments.utils.minor_units import to_minor
+
+BATCH_SIZE = 2000
+
+# PostgreSQL refuse de changer le type d'une colonne lue par une vue
+DROP_VIEW = "DROP VIEW IF EXISTS payments_systemaccountbalance"
+
+SYSTEM_ACCOUNT_BALANCE_VIEW = """
+CREATE VIEW payments_systemaccountbalance AS
+SELECT
+    account || ':' || currency AS id,
+    account,
+    currency,
+    SUM(amount_minor) AS amount_minor,
+    COUNT(*) AS shard_count,
+    MAX(updated_at) AS updated_at
+FROM payments_systemaccountshard
+GROUP BY account, currency
+"""
+
+
+def backfill(model_name):
+    """
+    Lignes que 0014 n'a pas pu remplir (hors BIGINT, ex : >= 9.22 JMU).
+    """
+    def run(apps, schema_editor):
+        Model = apps.get_model("payments", model_name)
+        batch = []
+
+        rows = Model.objects.filter(amount_minor=0).exclude(Q(amount=0) | Q(amount__isnull=True))
+        for obj in rows.only("pk", "amount", "currency").iterator(chunk_size=BATCH_SIZE):
+            obj.amount_minor = to_minor(obj.amount, obj.currency)
+            batch.append(obj)
+
+            if len(batch) >= BATCH_SIZE:
+                Model.objects.bulk_update(batch, ["amount_minor"])
+                batch = []
+
+        if batch:
+            Model.objects.bulk_update(batch, ["amount_minor"])
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0025_wallet_key_rotation'),
+    ]
+
+    operations = [
+        migrations.RunSQL(DROP_VIEW, SYSTEM_ACCOUNT_BALANCE_VIEW),
+        migrations.AlterField(
+            model_name='balancecurrency',
+            name='amount_minor',
+            field=payments.utils.minor_units.MinorAmountField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='ledgerdailyrollup',
+            name='amount_minor',
+            field=payments.utils.minor_units.MinorAmountField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='ledgermonthlyrollup',
+            name='amount_minor',
+            field=payments.utils.minor_units.MinorAmountField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='systemaccountshard',
+            name='amount_minor',
+            field=payments.utils.minor_units.MinorAmountField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='transaction',
+            name='amount_minor',
+            field=payments.utils.minor_units.MinorAmountField(default=0),
+        ),
+        migrations.RunSQL(SYSTEM_ACCOUNT_BALANCE_VIEW, DROP_VIEW),
+        migrations.RunPython(backfill("BalanceCurrency"), migrations.RunPython.noop),
+        migrations.RunPython(backfill("Transaction"), migrations.RunPython.noop),
+    ]
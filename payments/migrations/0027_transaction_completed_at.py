@@ -0,0 +1,35 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:56
+
+import payments.models
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill(apps, schema_editor):
+    # Faute de mieux, l'existant est réputé complété à sa création
+    Transaction = apps.get_model("payments", "Transaction")
+    Transaction.objects.filter(status="completed", completed_at__isnull=True).update(
+        completed_at=F("created_at")
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0026_minor_amount_numeric'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transaction',
+            name='completed_at',
+            field=payments.models.CompletionTimestampField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['completed_at'], name='pay_tx_completed_idx'),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -2,15 +2,36 @@ import uuid
 from decimal import Decimal
 
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models, transaction
 from django.utils import timezone
 
+from .querysets import BalanceCurrencyQuerySet
+from .utils.balance_cache import invalidate_balances
+from .utils.minor_units import MinorAmountField, from_minor, to_minor
+from .utils.wallet_cache import invalidate_wallet
+
 # ======================================================
 # CONFIG
 # ======================================================
 LEDGER_DECIMAL_PLACES = 18
 LEDGER_PRECISION = Decimal("1." + "0" * 18)
 
+
+class CompletionTimestampField(models.DateTimeField):
+    """
+    Horodatage du passage à l'état "completed" : rempli par save() comme
+    par bulk_create (pre_save), sans appel explicite dans les services.
+    """
+
+    def pre_save(self, model_instance, add):
+        value = getattr(model_instance, self.attname)
+        if value is None and model_instance.status == model_instance.STATUS_COMPLETED:
+            value = timezone.now()
+            setattr(model_instance, self.attname, value)
+        return value
+
+
 # ======================================================
 # 💰 BALANCE (COMPTE PRINCIPAL UTILISATEUR)
 # ======================================================
@@ -38,21 +59,20 @@ class Balance(models.Model):
 
     @transaction.atomic
     def credit(self, amount, currency):
-        bc = self.get_currency(currency)
-        amount = Decimal(str(amount)).quantize(LEDGER_PRECISION)
-        bc.amount += amount
-        bc.save(update_fields=["amount"])
+        """
+        Crédit atomique (UPDATE amount_minor = amount_minor + x).
+        Retourne le nouveau solde de la devise.
+        """
+        return BalanceCurrency.objects.credit(self, currency, to_minor(amount, currency))
 
     @transaction.atomic
     def debit(self, amount, currency):
-        bc = self.get_currency(currency)
-        amount = Decimal(str(amount)).quantize(LEDGER_PRECISION)
-        if bc.amount < amount:
-            raise ValueError("Solde insuffisant")
-
-        amount = Decimal(str(amount)).quantize(LEDGER_PRECISION)
-        bc.amount -= amount
-        bc.save(update_fields=["amount"])
+        """
+        Débit atomique conditionnel (UPDATE ... WHERE amount_minor >= x).
+        Lève ValueError si le solde est insuffisant.
+        Retourne le nouveau solde de la devise.
+        """
+        return BalanceCurrency.objects.debit(self, currency, to_minor(amount, currency))
 
 
 # ======================================================
@@ -87,16 +107,33 @@ class BalanceCurrency(models.Model):
         default=Decimal("0")
     )
 
+    # Même solde en unités mineures (voir payments.utils.minor_units)
+    amount_minor = MinorAmountField(
+        default=0
+    )
+
     updated_at = models.DateTimeField(
         auto_now=True
     )
 
+    objects = BalanceCurrencyQuerySet.as_manager()
+
     class Meta:
         unique_together = ("balance", "currency")
 
     def __str__(self):
         return f"{self.balance.user} | {self.amount} {self.currency}"
 
+    def save(self, *args, **kwargs):
+        if self.amount is not None:
+            self.amount_minor = to_minor(self.amount, self.currency)
+        super().save(*args, **kwargs)
+        invalidate_balances([self.balance_id])
+
+    @property
+    def display_amount(self):
+        return from_minor(self.amount_minor, self.currency)
+
 
 # ======================================================
 # 📜 TRANSACTIONS (LEDGER / AUDIT)
@@ -111,6 +148,8 @@ class Transaction(models.Model):
     RANDOM = "random"
     CONTRACT = "contract"
     TRANSFER = "transfer"
+    ADJUSTMENT = "adjustment"
+    RECHARGE = "recharge"
 
     BONUS_TYPE = [
         (SIGNUP, "Création de compte"),
@@ -121,6 +160,8 @@ class Transaction(models.Model):
         (DAILY_LOGIN, "Bonus quotidien"),
         (CONTRACT, "Contrat"),
         (TRANSFER, "Transfert"),
+        (ADJUSTMENT, "Ajustement"),
+        (RECHARGE, "Recharge"),
     ]
 
     CREDIT = "CREDIT"
@@ -178,6 +219,10 @@ class Transaction(models.Model):
         decimal_places=LEDGER_DECIMAL_PLACES,
     )
 
+    amount_minor = MinorAmountField(
+        default=0
+    )
+
     currency = models.CharField(
         max_length=10,
         choices=CURRENCY_TYPES,
@@ -222,9 +267,33 @@ class Transaction(models.Model):
         auto_now_add=True
     )
 
+    # Point de reprise des agrégats : une transaction créée "pending"
+    # puis complétée plus tard y entre à sa date de complétion
+    completed_at = CompletionTimestampField(
+        null=True,
+        blank=True
+    )
+
+    class Meta:
+        indexes = [
+            # Pagination par curseur (created_at, id) par utilisateur
+            models.Index(fields=["user", "created_at", "id"], name="pay_tx_user_crt_idx"),
+            models.Index(fields=["completed_at"], name="pay_tx_completed_idx"),
+        ]
+
     def __str__(self):
         return f"{self.user} | {self.bonus_type} | {self.amount} {self.currency}"
 
+    def save(self, *args, **kwargs):
+        if self.amount is not None:
+            self.amount_minor = to_minor(self.amount, self.currency)
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "status" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "completed_at"}
+
+        super().save(*args, **kwargs)
+
 
 # ======================================================
 # 💳 PAYMENT (PAIEMENT INTERNE)
@@ -243,11 +312,27 @@ class Payment(models.Model):
     STATUS_PENDING = "pending"
     STATUS_COMPLETED = "completed"
     STATUS_FAILED = "failed"
+    STATUS_REFUNDED = "refunded"
 
     STATUS_CHOICES = [
         (STATUS_PENDING, "En attente"),
         (STATUS_COMPLETED, "Réussi"),
         (STATUS_FAILED, "Échoué"),
+        (STATUS_REFUNDED, "Remboursé"),
+    ]
+
+    TYPE_FINE = "fine"
+    TYPE_TOLL = "toll"
+    TYPE_RENEWAL = "renewal"
+    TYPE_CONTRACT = "contract"
+    TYPE_DOCUMENT = "document"
+
+    PAYMENT_TYPES = [
+        (TYPE_FINE, "Amende"),
+        (TYPE_TOLL, "Péage"),
+        (TYPE_RENEWAL, "Renouvellement"),
+        (TYPE_CONTRACT, "Contrat"),
+        (TYPE_DOCUMENT, "Document"),
     ]
     
     JMU = "jmu"
@@ -272,6 +357,12 @@ class Payment(models.Model):
         related_name="payments"
     )
 
+    payment_type = models.CharField(
+        max_length=20,
+        choices=PAYMENT_TYPES,
+        blank=True
+    )
+
     amount = models.DecimalField(
         max_digits=30,
         decimal_places=LEDGER_DECIMAL_PLACES
@@ -320,6 +411,12 @@ class Payment(models.Model):
         blank=True
     )
 
+    class Meta:
+        indexes = [
+            # Pagination par curseur (created_at, id) par utilisateur
+            models.Index(fields=["user", "created_at", "id"], name="pay_payment_user_crt_idx"),
+        ]
+
     def __str__(self):
         return f"Payment {self.amount} {self.currency} - {self.user}"
 
@@ -415,6 +512,12 @@ class Recharge(models.Model):
         blank=True
     )
 
+    class Meta:
+        indexes = [
+            # Pagination par curseur (created_at, id) par utilisateur
+            models.Index(fields=["user", "created_at", "id"], name="pay_recharge_user_crt_idx"),
+        ]
+
     def __str__(self):
         return f"Recharge {self.amount} {self.currency} - {self.user}"
 
@@ -517,6 +620,12 @@ class FundTransfer(models.Model):
         auto_now_add=True
     )
 
+    class Meta:
+        indexes = [
+            # Pagination par curseur (created_at, id) par utilisateur
+            models.Index(fields=["sender", "created_at", "id"], name="pay_transfer_sender_crt_idx"),
+        ]
+
     def __str__(self):
         return f"{self.sender} ➜ {self.receiver} ({self.amount} {self.currency})"
 
@@ -618,6 +727,12 @@ class Wallet(models.Model):
         default=dict, 
         blank=True
         )
+
+    # Clé privée chiffrée (payments.crypto_utils.encrypt_privkey)
+    encrypted_private_key = models.TextField(
+        blank=True,
+        default=""
+    )
         
     created_at = models.DateTimeField(
         auto_now_add=True
@@ -627,4 +742,507 @@ class Wallet(models.Model):
         unique_together = ("user", "network", "public_key", "address")
 
     def __str__(self):
-        return f"{self.user} | {self.network} | {self.address}"
\ No newline at end of file
+        return f"{self.user} | {self.network} | {self.address}"
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        invalidate_wallet(self.user_id, self.network)
+
+    def delete(self, *args, **kwargs):
+        invalidate_wallet(self.user_id, self.network)
+        return super().delete(*args, **kwargs)
+
+
+class PooledWalletAddress(models.Model):
+    """
+    Paire (public_key, address) générée à l'avance par une tâche de fond.
+    Créer un wallet réclame (et supprime) une ligne du réseau voulu.
+    """
+    network = models.CharField(
+        max_length=50
+    )
+
+    public_key = models.CharField(
+        max_length=255,
+        unique=True
+    )
+
+    address = models.CharField(
+        max_length=255,
+        unique=True
+    )
+
+    created_at = models.DateTimeField(
+        auto_now_add=True
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["network", "id"], name="pay_pool_network_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.network} | {self.address}"
+
+# ======================================================
+# 🎁 REWARD CLAIM (1 RÉCOMPENSE / JOUR / CLÉ)
+# ======================================================
+class RewardClaim(models.Model):
+    """
+    Index dédié anti-doublon des récompenses.
+    L'unicité (user, reward_key, day) transforme la vérification
+    en une seule écriture indexée (insert-or-skip).
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="reward_claims"
+    )
+
+    reward_key = models.CharField(
+        max_length=50
+    )
+
+    day = models.DateField()
+
+    created_at = models.DateTimeField(
+        auto_now_add=True
+    )
+
+    class Meta:
+        unique_together = ("user", "reward_key", "day")
+
+    def __str__(self):
+        return f"{self.user} | {self.reward_key} | {self.day}"
+
+
+# ======================================================
+# 📣 CAMPAGNE DE RÉCOMPENSES (ÉMISSION EN MASSE)
+# ======================================================
+class RewardCampaign(models.Model):
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_COMPLETED = "completed"
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "En attente"),
+        (STATUS_RUNNING, "En cours"),
+        (STATUS_COMPLETED, "Terminée"),
+    ]
+
+    key = models.SlugField(
+        max_length=40,
+        unique=True
+    )
+
+    amount = models.DecimalField(
+        max_digits=30,
+        decimal_places=LEDGER_DECIMAL_PLACES
+    )
+
+    currency = models.CharField(
+        max_length=10,
+        choices=BalanceCurrency.CURRENCY_TYPES,
+        default=BalanceCurrency.JMU
+    )
+
+    reason = models.CharField(
+        max_length=255
+    )
+
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING
+    )
+
+    # Point de reprise : dernier user_id traité (ordre croissant)
+    last_user_id = models.BigIntegerField(
+        default=0
+    )
+
+    processed_count = models.PositiveIntegerField(
+        default=0
+    )
+
+    created_at = models.DateTimeField(
+        auto_now_add=True
+    )
+
+    completed_at = models.DateTimeField(
+        null=True,
+        blank=True
+    )
+
+    @property
+    def reward_key(self):
+        return f"CAMPAIGN:{self.key}"
+
+    def __str__(self):
+        return f"Campagne {self.key} ({self.processed_count})"
+
+
+# ======================================================
+# 💱 TAUX DE CHANGE (VERSIONNÉS)
+# ======================================================
+class ExchangeRate(models.Model):
+    """
+    Valeur d'une unité de `currency` en HTG.
+    Un taux n'est jamais modifié : chaque changement crée une nouvelle
+    version, la plus récente par devise fait foi.
+    """
+    SOURCE_ADMIN = "admin"
+    SOURCE_FILE = "file"
+    SOURCE_SEED = "seed"
+
+    SOURCE_CHOICES = [
+        (SOURCE_ADMIN, "Administrateur"),
+        (SOURCE_FILE, "Fichier"),
+        (SOURCE_SEED, "Valeur initiale"),
+    ]
+
+    currency = models.CharField(
+        max_length=10
+    )
+
+    rate = models.DecimalField(
+        max_digits=30,
+        decimal_places=LEDGER_DECIMAL_PLACES
+    )
+
+    version = models.PositiveIntegerField()
+
+    source = models.CharField(
+        max_length=10,
+        choices=SOURCE_CHOICES,
+        default=SOURCE_ADMIN
+    )
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+"
+    )
+
+    created_at = models.DateTimeField(
+        auto_now_add=True
+    )
+
+    class Meta:
+        unique_together = ("currency", "version")
+        ordering = ["currency", "-version"]
+
+    def __str__(self):
+        return f"1 {self.currency.upper()} = {self.rate} HTG (v{self.version})"
+
+
+# ======================================================
+# 📍 POINT DE REPRISE DES TÂCHES (HIGH-WATER MARK)
+# ======================================================
+class JobCheckpoint(models.Model):
+    """
+    Position atteinte par une tâche incrémentale (horodatage et/ou
+    entier : bloc, id...). Verrouillée pendant un lot pour qu'un seul
+    worker avance la même tâche à la fois.
+    """
+    name = models.CharField(
+        max_length=100,
+        unique=True
+    )
+
+    last_timestamp = models.DateTimeField(
+        null=True,
+        blank=True
+    )
+
+    last_position = models.BigIntegerField(
+        default=0
+    )
+
+    # Curseur non entier (ex : UUID de la dernière ligne traitée)
+    last_key = models.CharField(
+        max_length=255,
+        blank=True
+    )
+
+    updated_at = models.DateTimeField(
+        auto_now=True
+    )
+
+    def __str__(self):
+        return f"{self.name} @ {self.last_timestamp or self.last_key or self.last_position}"
+
+
+# ======================================================
+# 📊 AGRÉGATS DU LEDGER (JOUR / MOIS)
+# ======================================================
+class LedgerRollup(models.Model):
+    """
+    Somme (unités mineures) et nombre de transactions réussies
+    par (user, devise, type, bonus_type) sur une période.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+"
+    )
+
+    currency = models.CharField(
+        max_length=10
+    )
+
+    transaction_type = models.CharField(
+        max_length=30,
+        choices=Transaction.TRANSACTION_TYPES
+    )
+
+    bonus_type = models.CharField(
+        max_length=30,
+        choices=Transaction.BONUS_TYPE
+    )
+
+    amount_minor = MinorAmountField(
+        default=0
+    )
+
+    tx_count = models.PositiveIntegerField(
+        default=0
+    )
+
+    class Meta:
+        abstract = True
+
+    @property
+    def amount(self):
+        return from_minor(self.amount_minor, self.currency)
+
+
+class LedgerDailyRollup(LedgerRollup):
+    day = models.DateField()
+
+    class Meta:
+        unique_together = ("user", "day", "currency", "transaction_type", "bonus_type")
+        ordering = ["-day"]
+
+    def __str__(self):
+        return f"{self.user} {self.day} {self.transaction_type} {self.amount} {self.currency.upper()}"
+
+
+class LedgerMonthlyRollup(LedgerRollup):
+    # Premier jour du mois
+    month = models.DateField()
+
+    class Meta:
+        unique_together = ("user", "month", "currency", "transaction_type", "bonus_type")
+        ordering = ["-month"]
+
+    def __str__(self):
+        return f"{self.user} {self.month:%Y-%m} {self.transaction_type} {self.amount} {self.currency.upper()}"
+
+
+# ======================================================
+# 🔁 CLÉS D'IDEMPOTENCE (Idempotency-Key)
+# ======================================================
+class IdempotencyKey(models.Model):
+    """
+    Une clé par (user, scope) : empreinte de la requête d'origine et
+    résultat enregistré, renvoyé tel quel si le client rejoue la requête.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+"
+    )
+
+    scope = models.CharField(
+        max_length=50
+    )
+
+    key = models.CharField(
+        max_length=255
+    )
+
+    fingerprint = models.CharField(
+        max_length=64
+    )
+
+    response = models.JSONField(
+        default=dict,
+        encoder=DjangoJSONEncoder
+    )
+
+    created_at = models.DateTimeField(
+        auto_now_add=True
+    )
+
+    expires_at = models.DateTimeField(
+        db_index=True
+    )
+
+    class Meta:
+        unique_together = ("user", "scope", "key")
+
+    def __str__(self):
+        return f"{self.scope}:{self.key} ({self.user})"
+
+
+# ======================================================
+# 📮 OUTBOX (EFFETS DIFFÉRÉS)
+# ======================================================
+class OutboxEvent(models.Model):
+    """
+    Effet de bord écrit dans la même transaction que le changement
+    d'état, puis appliqué par un worker Celery (au moins une fois).
+    `dedup_key` empêche d'enregistrer deux fois le même effet.
+    """
+    STATUS_PENDING = "pending"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "En attente"),
+        (STATUS_DONE, "Traité"),
+        (STATUS_FAILED, "Abandonné"),
+    ]
+
+    topic = models.CharField(
+        max_length=100
+    )
+
+    dedup_key = models.CharField(
+        max_length=200,
+        unique=True,
+        null=True,
+        blank=True
+    )
+
+    payload = models.JSONField(
+        default=dict,
+        encoder=DjangoJSONEncoder
+    )
+
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING
+    )
+
+    attempts = models.PositiveSmallIntegerField(
+        default=0
+    )
+
+    available_at = models.DateTimeField(
+        default=timezone.now
+    )
+
+    last_error = models.TextField(
+        blank=True
+    )
+
+    created_at = models.DateTimeField(
+        auto_now_add=True
+    )
+
+    processed_at = models.DateTimeField(
+        null=True,
+        blank=True
+    )
+
+    class Meta:
+        indexes = [
+            # File d'attente : événements prêts, dans l'ordre d'écriture
+            models.Index(fields=["status", "available_at", "id"], name="pay_outbox_ready_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.topic} #{self.pk} ({self.status})"
+
+
+# ======================================================
+# 🏦 COMPTES SYSTÈME (CONTREPARTIE, SHARDÉS)
+# ======================================================
+class SystemAccountShard(models.Model):
+    """
+    Sous-solde d'un compte système. Chaque écriture système ne verrouille
+    qu'un shard (choisi par hash) : les rafales de crédits ne se
+    sérialisent plus sur une seule ligne. Le solde d'un compte est la
+    somme de ses shards (vue SystemAccountBalance).
+
+    Le solde peut être négatif : la trésorerie émet les récompenses.
+    """
+    TREASURY = "treasury"
+    REVENUE = "revenue"
+
+    ACCOUNT_TYPES = [
+        (TREASURY, "Trésorerie (récompenses)"),
+        (REVENUE, "Recettes (péages, frais)"),
+    ]
+
+    account = models.CharField(
+        max_length=20,
+        choices=ACCOUNT_TYPES
+    )
+
+    currency = models.CharField(
+        max_length=10,
+        choices=BalanceCurrency.CURRENCY_TYPES
+    )
+
+    shard = models.PositiveSmallIntegerField()
+
+    amount_minor = MinorAmountField(
+        default=0
+    )
+
+    updated_at = models.DateTimeField(
+        auto_now=True
+    )
+
+    class Meta:
+        unique_together = ("account", "currency", "shard")
+
+    def __str__(self):
+        return f"{self.account} | {self.currency} #{self.shard}"
+
+    @property
+    def amount(self):
+        return from_minor(self.amount_minor, self.currency)
+
+
+class SystemAccountBalance(models.Model):
+    """
+    Vue SQL (lecture seule) : somme des shards par (compte, devise).
+    """
+    id = models.CharField(
+        max_length=40,
+        primary_key=True
+    )
+
+    account = models.CharField(
+        max_length=20,
+        choices=SystemAccountShard.ACCOUNT_TYPES
+    )
+
+    currency = models.CharField(
+        max_length=10,
+        choices=BalanceCurrency.CURRENCY_TYPES
+    )
+
+    amount_minor = MinorAmountField()
+
+    shard_count = models.IntegerField()
+
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = "payments_systemaccountbalance"
+
+    def __str__(self):
+        return f"{self.account} | {self.amount} {self.currency}"
+
+    @property
+    def amount(self):
+        return from_minor(self.amount_minor, self.currency)
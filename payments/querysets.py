@@ -0,0 +1,121 @@
+from django.db import models
+from django.db.models import Case, DecimalField, F, Q, Value, When
+from django.utils import timezone
+
+from payments.utils.balance_cache import invalidate_balances, invalidate_users
+from payments.utils.minor_units import MinorAmountField, from_minor, minor_value
+
+
+class BalanceCurrencyQuerySet(models.QuerySet):
+    """
+    Toutes les variations sont exprimées en unités mineures (int).
+    `amount_minor` est la colonne de calcul ; `amount` (Decimal)
+    est tenue à jour dans le même UPDATE pour l'existant.
+
+    Chaque mutation invalide le cache des soldes au commit.
+    """
+
+    def _shift(self, currency, minor):
+        return {
+            "amount_minor": F("amount_minor") + minor_value(minor),
+            "amount": F("amount") + from_minor(minor, currency),
+            "updated_at": timezone.now(),
+        }
+
+    def _current(self, rows, currency):
+        return from_minor(rows.values_list("amount_minor", flat=True).get(), currency)
+
+    def credit(self, balance, currency, minor):
+        """
+        Crédit atomique en une seule requête :
+        UPDATE ... SET amount_minor = amount_minor + x
+
+        Retourne le nouveau solde (Decimal).
+        """
+        currency = currency.lower()
+        rows = self.filter(balance=balance, currency=currency)
+
+        updated = rows.update(**self._shift(currency, minor))
+
+        if not updated:
+            # Première opération sur cette devise → on crée la ligne
+            # puis on rejoue l'UPDATE (sûr même si un autre worker l'a créée)
+            self.get_or_create(balance=balance, currency=currency)
+            rows.update(**self._shift(currency, minor))
+
+        invalidate_users([balance.user_id])
+        return self._current(rows, currency)
+
+    def debit(self, balance, currency, minor):
+        """
+        Débit atomique conditionnel en une seule requête :
+        UPDATE ... SET amount_minor = amount_minor - x WHERE amount_minor >= x
+
+        Lève ValueError si le solde est insuffisant (aucune ligne modifiée).
+        Retourne le nouveau solde (Decimal).
+        """
+        currency = currency.lower()
+        rows = self.filter(balance=balance, currency=currency)
+
+        updated = rows.filter(amount_minor__gte=minor).update(
+            **self._shift(currency, -minor)
+        )
+
+        if not updated:
+            raise ValueError("Solde insuffisant")
+
+        invalidate_users([balance.user_id])
+        return self._current(rows, currency)
+
+    def apply_deltas(self, currency, deltas):
+        """
+        Applique plusieurs variations nettes sur une même devise
+        en UN SEUL UPDATE agrégé :
+
+            UPDATE ... SET amount_minor = amount_minor + CASE balance_id
+                                                WHEN 1 THEN x1
+                                                WHEN 2 THEN x2 ... END
+            WHERE balance_id IN (...)  [AND amount_minor >= |x| pour les débits]
+
+        `deltas` : {balance_id: int signé, en unités mineures}.
+        Les lignes doivent exister.
+        Les variations négatives sont conditionnées à amount_minor >= |x| ;
+        si une seule ligne ne passe pas, ValueError est levée
+        (l'appelant doit être dans un bloc atomique pour tout annuler).
+        """
+        currency = currency.lower()
+        deltas = {bid: d for bid, d in deltas.items() if d}
+
+        if not deltas:
+            return 0
+
+        amount_field = self.model._meta.get_field("amount")
+
+        allowed = Q(balance_id__in=[bid for bid, d in deltas.items() if d > 0])
+        for bid, d in deltas.items():
+            if d < 0:
+                allowed |= Q(balance_id=bid, amount_minor__gte=-d)
+
+        updated = self.filter(currency=currency).filter(allowed).update(
+            amount_minor=F("amount_minor") + Case(
+                *[When(balance_id=bid, then=minor_value(d)) for bid, d in deltas.items()],
+                output_field=MinorAmountField(),
+            ),
+            amount=F("amount") + Case(
+                *[
+                    When(balance_id=bid, then=Value(from_minor(d, currency)))
+                    for bid, d in deltas.items()
+                ],
+                output_field=DecimalField(
+                    max_digits=amount_field.max_digits,
+                    decimal_places=amount_field.decimal_places,
+                ),
+            ),
+            updated_at=timezone.now(),
+        )
+
+        if updated != len(deltas):
+            raise ValueError("Solde insuffisant")
+
+        invalidate_balances(deltas)
+        return updated
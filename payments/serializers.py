@@ -1,7 +1,10 @@
 from rest_framework import serializers
-from .models import Recharge, Transaction, Payment, Balance
+from .models import Recharge, Transaction, Payment, Balance, BalanceCurrency
+from .utils.minor_units import scale_for
 
 class TransactionSerializer(serializers.ModelSerializer):
+    amount_minor = serializers.IntegerField(read_only=True)
+
     class Meta:
         model = Transaction
         fields = "__all__"
@@ -22,12 +25,32 @@ class RechargeSerializer(serializers.ModelSerializer):
         read_only_fields = ["user", "status", "requested_at", "completed_at", "transaction"]
 
 
+class BalanceCurrencySerializer(serializers.ModelSerializer):
+    # Montant exact reconstruit depuis les unités mineures
+    amount = serializers.SerializerMethodField()
+    amount_minor = serializers.IntegerField(read_only=True)
+    scale = serializers.SerializerMethodField()
+
+    class Meta:
+        model = BalanceCurrency
+        fields = ["currency", "amount", "amount_minor", "scale", "updated_at"]
+
+    def get_amount(self, obj):
+        return str(obj.display_amount)
+
+    def get_scale(self, obj):
+        return scale_for(obj.currency)
+
+
+class BalanceSummaryCurrencySerializer(BalanceCurrencySerializer):
+    # Construit depuis le cache des soldes : pas de date de mise à jour
+    class Meta(BalanceCurrencySerializer.Meta):
+        fields = ["currency", "amount", "amount_minor", "scale"]
+
+
 class BalanceSerializer(serializers.ModelSerializer):
-    total = serializers.SerializerMethodField()
+    currencies = BalanceCurrencySerializer(many=True, read_only=True)
 
     class Meta:
         model = Balance
-        fields = ["htg_balance", "usd_balance", "btg_balance", "btc_balance", "usdt_balance", "total"]
-
-    def get_total(self, obj):
-        return obj.total_balance()
\ No newline at end of file
+        fields = ["currencies", "created_at"]
@@ -1,14 +1,21 @@
-from decimal import Decimal
 from django.db import transaction
 from django.core.exceptions import ValidationError
 
-from payments.models import Balance, LEDGER_PRECISION
+from payments.models import Balance, BalanceCurrency
+from payments.utils.minor_units import to_minor
 
 
 class BalanceService:
     """
     Service central pour gérer les soldes utilisateurs
     (basé sur BalanceCurrency)
+
+    Toutes les mutations passent par un UPDATE atomique
+    (F-expression) : pas de lecture/écriture en Python,
+    donc pas de mise à jour perdue entre workers concurrents.
+
+    Les montants sont convertis une fois en unités mineures (int) :
+    le reste du calcul est de l'arithmétique entière.
     """
 
     @staticmethod
@@ -22,12 +29,12 @@ class BalanceService:
     @staticmethod
     @transaction.atomic
     def credit(user, amount, currency):
-        amount = Decimal(str(amount)).quantize(LEDGER_PRECISION)
-        if amount <= 0:
+        minor = to_minor(amount, currency)
+        if minor <= 0:
             raise ValidationError("Le montant doit être positif")
 
         balance = BalanceService.get_or_create_balance(user)
-        balance.credit(amount, currency)
+        BalanceCurrency.objects.credit(balance, currency, minor)
 
         return balance
 
@@ -37,12 +44,12 @@ class BalanceService:
     @staticmethod
     @transaction.atomic
     def debit(user, amount, currency):
-        amount = Decimal(str(amount)).quantize(LEDGER_PRECISION)
-        if amount <= 0:
+        minor = to_minor(amount, currency)
+        if minor <= 0:
             raise ValidationError("Le montant doit être positif")
 
         balance = BalanceService.get_or_create_balance(user)
-        balance.debit(amount, currency)
+        BalanceCurrency.objects.debit(balance, currency, minor)
 
         return balance
 
@@ -51,7 +58,8 @@ class BalanceService:
     # ==========================
     @staticmethod
     def has_sufficient_balance(user, amount, currency):
-        amount = Decimal(str(amount)).quantize(LEDGER_PRECISION)
-        balance = BalanceService.get_or_create_balance(user)
-        bc = balance.get_currency(currency)
-        return bc.amount >= amount
\ No newline at end of file
+        return BalanceCurrency.objects.filter(
+            balance__user=user,
+            currency=currency.lower(),
+            amount_minor__gte=to_minor(amount, currency),
+        ).exists()
@@ -0,0 +1,278 @@
+import logging
+from datetime import timedelta
+from decimal import ROUND_DOWN, Decimal
+from itertools import count
+
+import requests
+from django.conf import settings
+from django.db import transaction
+from requests.adapters import HTTPAdapter
+
+from payments.models import JobCheckpoint, Recharge, Wallet
+from payments.services.deposit_service import DepositMatcher, DepositReport
+from payments.utils.minor_units import scale_for
+
+logger = logging.getLogger(__name__)
+
+# ======================================================
+# ⛓️ SURVEILLANCE DES DÉPÔTS ON-CHAIN (EVM)
+# ======================================================
+# Un watcher par réseau (settings.CHAIN_WATCHERS) :
+#   - curseur de bloc persisté dans JobCheckpoint.last_position,
+#   - 1 appel eth_blockNumber + 1 requête JSON-RPC groupée contenant
+#     un eth_getLogs par fenêtre de CHAIN_BLOCKS_PER_CALL blocs,
+#   - filtrage des Transfer ERC-20 sur l'ensemble en mémoire de nos
+#     adresses (rafraîchi par created_at, sans tout relire),
+#   - crédit via DepositMatcher (référence unique = réseau:tx:log).
+#
+# On ne lit que les blocs ayant `confirmations` confirmations : pas de
+# gestion de réorganisation au-delà. Un lot est rejouable sans double
+# crédit (référence unique des Recharge).
+
+TRANSFER_TOPIC = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+
+CHAIN_BLOCKS_PER_CALL = getattr(settings, "CHAIN_BLOCKS_PER_CALL", 500)
+CHAIN_CALLS_PER_BATCH = getattr(settings, "CHAIN_CALLS_PER_BATCH", 10)
+CHAIN_RPC_TIMEOUT = getattr(settings, "CHAIN_RPC_TIMEOUT", 15)
+
+# Recouvrement du rafraîchissement des adresses : un wallet commité en
+# retard avec un created_at plus ancien est quand même relu.
+ADDRESS_REFRESH_OVERLAP = timedelta(minutes=5)
+
+
+class ChainRpcError(Exception):
+    pass
+
+
+# ==========================
+# CLIENT JSON-RPC
+# ==========================
+_SESSIONS = {}
+
+
+def _session(url):
+    """
+    Session HTTP par nœud : connexions keep-alive réutilisées d'un lot à l'autre.
+    """
+    session = _SESSIONS.get(url)
+    if session is None:
+        session = requests.Session()
+        session.mount(url, HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=2))
+        session.headers["Content-Type"] = "application/json"
+        _SESSIONS[url] = session
+    return session
+
+
+class JsonRpcClient:
+
+    def __init__(self, url, timeout=CHAIN_RPC_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+        self._ids = count(1)
+
+    def _post(self, body):
+        response = _session(self.url).post(self.url, json=body, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    @staticmethod
+    def _result(reply):
+        if reply.get("error"):
+            raise ChainRpcError(f"{reply['error'].get('code')} {reply['error'].get('message')}")
+        return reply.get("result")
+
+    def call(self, method, params=()):
+        return self._result(self._post(
+            {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": list(params)}
+        ))
+
+    def batch(self, calls):
+        """
+        Envoie [(method, params), ...] en une seule requête HTTP ;
+        retourne les résultats dans l'ordre des appels.
+        """
+        if not calls:
+            return []
+
+        body = [
+            {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": list(params)}
+            for method, params in calls
+        ]
+        replies = self._post(body)
+        if not isinstance(replies, list):
+            # Certains nœuds répondent par une erreur unique au lot entier
+            raise ChainRpcError(str(replies.get("error") if isinstance(replies, dict) else replies))
+
+        # L'ordre des réponses n'est pas garanti par la spec
+        by_id = {reply.get("id"): reply for reply in replies}
+        try:
+            return [self._result(by_id[call["id"]]) for call in body]
+        except KeyError:
+            raise ChainRpcError("Réponse JSON-RPC groupée incomplète")
+
+
+# ==========================
+# ADRESSES SURVEILLÉES
+# ==========================
+class AddressSet:
+    """
+    Adresses (minuscules) de nos wallets d'un réseau, gardées en mémoire
+    par le worker ; chaque refresh() ne lit que les wallets récents.
+    """
+
+    def __init__(self, network):
+        self.network = network
+        self.addresses = set()
+        self.since = None
+
+    def refresh(self):
+        wallets = Wallet.objects.filter(network=self.network)
+        if self.since:
+            wallets = wallets.filter(created_at__gte=self.since - ADDRESS_REFRESH_OVERLAP)
+
+        for address, created_at in wallets.values_list("address", "created_at").iterator():
+            self.addresses.add(address.lower())
+            if self.since is None or created_at > self.since:
+                self.since = created_at
+
+        return self.addresses
+
+
+_ADDRESS_SETS = {}
+
+
+def watched_addresses(network):
+    address_set = _ADDRESS_SETS.get(network)
+    if address_set is None:
+        address_set = _ADDRESS_SETS[network] = AddressSet(network)
+    return address_set.refresh()
+
+
+# ==========================
+# WATCHER
+# ==========================
+class ChainWatcher:
+
+    def __init__(self, network, config=None, client=None):
+        self.network = network
+        self.config = config or settings.CHAIN_WATCHERS[network]
+        self.client = client or JsonRpcClient(self.config["rpc_url"])
+        # contrat (minuscules) -> (devise, décimales)
+        self.tokens = {
+            contract.lower(): (currency, decimals)
+            for contract, (currency, decimals) in self.config["tokens"].items()
+        }
+        self.confirmations = self.config.get("confirmations", 12)
+        self.blocks_per_call = self.config.get("blocks_per_call", CHAIN_BLOCKS_PER_CALL)
+        self.calls_per_batch = self.config.get("calls_per_batch", CHAIN_CALLS_PER_BATCH)
+
+    @property
+    def checkpoint_name(self):
+        return f"chain_watcher:{self.network}"
+
+    @property
+    def max_blocks(self):
+        return self.blocks_per_call * self.calls_per_batch
+
+    def poll(self):
+        """
+        Traite un lot de blocs confirmés après le curseur.
+        Les logs sont lus avant de verrouiller le curseur ; l'écriture
+        se fait ensuite dans une transaction courte, seulement si le
+        curseur n'a pas bougé entre-temps.
+        Retourne (blocs parcourus, DepositReport) ; (0, ...) = à jour
+        ou un autre worker a déjà traité ce lot.
+        """
+        report = DepositReport()
+
+        safe = int(self.client.call("eth_blockNumber"), 16) - self.confirmations
+
+        # Premier démarrage : départ au bloc sûr courant (ou `start_block`),
+        # sans relire l'historique
+        _, created = JobCheckpoint.objects.get_or_create(
+            name=self.checkpoint_name,
+            defaults={"last_position": self.config.get("start_block", safe)},
+        )
+        if created:
+            return 0, report
+
+        position = (
+            JobCheckpoint.objects
+            .filter(name=self.checkpoint_name)
+            .values_list("last_position", flat=True)
+            .get()
+        )
+        start = position + 1
+        end = min(safe, position + self.max_blocks)
+        if end < start:
+            return 0, report
+
+        # Appels au nœud hors transaction : aucun verrou tenu pendant le HTTP
+        logs = self._fetch_logs(start, end)
+        rows = self._deposits(logs, watched_addresses(self.network))
+
+        with transaction.atomic():
+            checkpoint = (
+                JobCheckpoint.objects
+                .select_for_update(skip_locked=True)
+                .filter(name=self.checkpoint_name)
+                .first()
+            )
+            # Tenu par un autre worker, ou curseur déplacé depuis la lecture :
+            # ce lot a déjà été (ou est en train d'être) traité
+            if checkpoint is None or checkpoint.last_position != position:
+                return 0, report
+
+            if rows:
+                DepositMatcher.ingest(rows, provider=self.network, report=report)
+
+            checkpoint.last_position = end
+            checkpoint.save(update_fields=["last_position", "updated_at"])
+
+        if report.credited:
+            logger.info(f"{self.network} : {report.credited} dépôt(s) crédité(s), blocs {start}-{end}")
+        return end - start + 1, report
+
+    def _fetch_logs(self, start, end):
+        calls = [
+            ("eth_getLogs", [{
+                "fromBlock": hex(lo),
+                "toBlock": hex(min(lo + self.blocks_per_call - 1, end)),
+                "address": list(self.tokens),
+                "topics": [TRANSFER_TOPIC],
+            }])
+            for lo in range(start, end + 1, self.blocks_per_call)
+        ]
+        return [log for logs in self.client.batch(calls) for log in (logs or [])]
+
+    def _deposits(self, logs, addresses):
+        rows = []
+        for log in logs:
+            topics = log.get("topics") or []
+            token = self.tokens.get((log.get("address") or "").lower())
+            if log.get("removed") or token is None or len(topics) < 3:
+                continue
+
+            recipient = "0x" + topics[2][-40:].lower()
+            if recipient not in addresses:
+                continue
+
+            currency, decimals = token
+            # Jetons à 18 décimales : on crédite à l'échelle de la devise
+            # (reste sous l'unité mineure ignoré) ; une poussière est écartée
+            amount = (
+                Decimal(int(log["data"], 16)).scaleb(-decimals)
+                .quantize(Decimal(1).scaleb(-scale_for(currency)), rounding=ROUND_DOWN)
+            )
+            if amount <= 0:
+                continue
+
+            rows.append({
+                "reference": f"{self.network}:{log['transactionHash']}:{int(log['logIndex'], 16)}",
+                "address": recipient,
+                "amount": amount,
+                "currency": currency,
+                "provider": self.network,
+                "method": Recharge.CRYPTO,
+            })
+        return rows
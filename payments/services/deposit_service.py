@@ -0,0 +1,260 @@
+import csv
+import json
+import uuid
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from typing import NamedTuple
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from payments.models import Recharge, Transaction, Wallet
+from payments.services.ledger_service import LedgerEntry, LedgerService
+from payments.utils.minor_units import from_minor, to_minor
+
+# ======================================================
+# 📥 RAPPROCHEMENT DES DÉPÔTS (FICHIERS FOURNISSEURS)
+# ======================================================
+# Le flux (JSONL ou CSV) est lu ligne à ligne et traité par lots.
+# Pour chaque lot, un nombre constant de requêtes :
+#   - 1 SELECT ... WHERE address IN (...) sur l'index unique Wallet.address,
+#   - 1 SELECT ... WHERE reference IN (...) pour écarter les doublons,
+#   - 1 INSERT des Recharge (ON CONFLICT DO NOTHING sur la référence),
+#   - 1 postage ledger groupé (LedgerService.post_batch),
+#   - 1 UPDATE des Recharge (lien vers la transaction) + 1 INSERT des notifications.
+
+DEPOSIT_BATCH_SIZE = 2000
+
+DEPOSIT_FORMATS = ("jsonl", "csv")
+
+REJECT_INVALID = "invalid"
+REJECT_DUPLICATE = "duplicate"
+REJECT_UNMATCHED = "unmatched"
+
+
+class Deposit(NamedTuple):
+    reference: str
+    address: str
+    amount: Decimal
+    currency: str
+    provider: str
+    method: str
+
+
+class DepositReport:
+    def __init__(self):
+        self.credited = 0
+        self.rejected = []
+
+    def reject(self, row, reason):
+        self.rejected.append((reason, row))
+
+    def count(self, reason):
+        return sum(1 for r, _ in self.rejected if r == reason)
+
+
+# ==========================
+# LECTURE DU FLUX
+# ==========================
+def iter_deposit_feed(stream, fmt="jsonl"):
+    """
+    Génère des dicts bruts, une ligne à la fois (mémoire constante).
+    """
+    if fmt not in DEPOSIT_FORMATS:
+        raise ValueError(f"Format de dépôt inconnu : {fmt}")
+
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+        return
+
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            # Ligne illisible : signalée comme invalide, le flux continue
+            yield {"raw": line}
+
+
+def _parse(row, provider):
+    """
+    Deposit normalisé, ou None si la ligne est inutilisable.
+    """
+    try:
+        amount = Decimal(str(row["amount"]).strip())
+        address = str(row["address"]).strip()
+        deposit = Deposit(
+            reference=str(row["reference"]).strip(),
+            # Adresses EVM insensibles à la casse (checksum EIP-55)
+            address=address.lower() if address[:2].lower() == "0x" else address,
+            amount=amount,
+            currency=str(row["currency"]).strip().lower(),
+            provider=str(row.get("provider") or provider).strip(),
+            method=str(row.get("method") or Recharge.CRYPTO).strip().lower(),
+        )
+    except (KeyError, TypeError, AttributeError, InvalidOperation):
+        return None
+
+    if (
+        not deposit.reference
+        or not deposit.address
+        or not amount.is_finite()
+        or amount <= 0
+        or deposit.currency not in LedgerService.CURRENCIES
+        or deposit.method not in dict(Recharge.METHOD_TYPES)
+    ):
+        return None
+
+    # Montant exact à l'échelle de la devise, au moins une unité mineure :
+    # une poussière arrondie à 0 ferait échouer tout le lot au postage,
+    # un arrondi silencieux décalerait Recharge.amount du crédit réel
+    try:
+        minor = to_minor(amount, deposit.currency)
+    except ValidationError:
+        return None
+    if minor == 0 or from_minor(minor, deposit.currency) != amount:
+        return None
+
+    return deposit
+
+
+# ==========================
+# RAPPROCHEMENT
+# ==========================
+class DepositMatcher:
+
+    @staticmethod
+    def ingest(rows, *, provider="", batch_size=DEPOSIT_BATCH_SIZE, report=None):
+        """
+        Crédite les dépôts d'un flux de dicts bruts ; retourne un DepositReport.
+        """
+        report = report or DepositReport()
+        rows = iter(rows)
+
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                return report
+            DepositMatcher._ingest_batch(batch, provider, report)
+
+    @staticmethod
+    def _ingest_batch(batch, provider, report):
+        deposits = {}
+        for row in batch:
+            deposit = _parse(row, provider)
+            if deposit is None:
+                report.reject(row, REJECT_INVALID)
+            elif deposit.reference in deposits:
+                report.reject(row, REJECT_DUPLICATE)
+            else:
+                deposits[deposit.reference] = deposit
+
+        if not deposits:
+            return
+
+        known = set(
+            Recharge.objects
+            .filter(reference__in=deposits.keys())
+            .values_list("reference", flat=True)
+        )
+
+        owners = dict(
+            Wallet.objects
+            .filter(address__in={d.address for d in deposits.values()}, is_active=True)
+            .values_list("address", "user_id")
+        )
+
+        matched = []
+        for reference, deposit in deposits.items():
+            if reference in known:
+                report.reject(deposit._asdict(), REJECT_DUPLICATE)
+            elif deposit.address not in owners:
+                report.reject(deposit._asdict(), REJECT_UNMATCHED)
+            else:
+                matched.append(deposit)
+
+        if matched:
+            report.credited += DepositMatcher._credit(matched, owners, report)
+
+    @staticmethod
+    @transaction.atomic
+    def _credit(deposits, owners, report):
+        now = timezone.now()
+        recharges = [
+            Recharge(
+                id=uuid.uuid4(),
+                user_id=owners[d.address],
+                amount=d.amount,
+                currency=d.currency,
+                provider=d.provider,
+                reference=d.reference,
+                method=d.method,
+                status=Recharge.STATUS_SUCCESS,
+                processed_at=now,
+            )
+            for d in deposits
+        ]
+
+        # Un autre import concurrent a pu insérer la même référence :
+        # seules les lignes réellement insérées sont créditées.
+        Recharge.objects.bulk_create(recharges, ignore_conflicts=True)
+        inserted = set(
+            Recharge.objects
+            .filter(pk__in=[r.pk for r in recharges])
+            .values_list("pk", flat=True)
+        )
+
+        credited = []
+        for recharge, deposit in zip(recharges, deposits):
+            if recharge.pk in inserted:
+                credited.append(recharge)
+            else:
+                report.reject(deposit._asdict(), REJECT_DUPLICATE)
+
+        if not credited:
+            return 0
+
+        transactions = LedgerService.post_batch(
+            [
+                LedgerEntry(
+                    user=r.user_id,
+                    currency=r.currency,
+                    amount=r.amount,
+                    metadata={"recharge_id": str(r.pk), "reference": r.reference},
+                    description=f"Rechaj {r.provider} ({r.reference})",
+                )
+                for r in credited
+            ],
+            source=Transaction.SYSTEM,
+            bonus_type=Transaction.RECHARGE,
+        )
+
+        for recharge, tx in zip(credited, transactions):
+            recharge.transaction = tx
+        Recharge.objects.bulk_update(credited, ["transaction"])
+
+        DepositMatcher._notify(credited)
+        return len(credited)
+
+    @staticmethod
+    def _notify(recharges):
+        """
+        bulk_create n'émet pas de post_save : mêmes notifications
+        que notify_recharge, en un seul INSERT.
+        """
+        from notifications.models import Notification
+        from notifications.services.notification_buffer import notify_many
+
+        notify_many([
+            Notification(
+                user_id=r.user_id,
+                title="Recharge réussie 🔋",
+                message=f"Votre compte a été rechargé de {r.amount} {r.currency}.",
+                notification_type=Notification.SUCCESS,
+                transaction=r.transaction,
+            )
+            for r in recharges
+        ])
@@ -0,0 +1,171 @@
+import time
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Max, OuterRef, Subquery
+
+from payments.models import ExchangeRate
+
+# ======================================================
+# CACHE (2 NIVEAUX)
+# ======================================================
+# 1. mémoire du processus : aucun aller-retour réseau pendant LOCAL_TTL
+# 2. cache partagé (Redis) : un seul SELECT pour tous les workers
+#
+# Publier un taux vide le cache partagé au commit ; les autres
+# processus le voient au plus tard après LOCAL_TTL secondes.
+
+RATES_CACHE_KEY = "exchange_rates:latest"
+LOCAL_TTL = getattr(settings, "EXCHANGE_RATE_LOCAL_TTL", 30)
+SHARED_TTL = getattr(settings, "EXCHANGE_RATE_CACHE_TTL", 300)
+
+_local = {"rates": None, "expires": 0.0}
+
+
+class ExchangeRateService:
+    """
+    Taux de change versionnés (valeur en HTG d'une unité de devise).
+    """
+
+    BASE = "htg"
+
+    # ==========================
+    # LECTURE
+    # ==========================
+    @staticmethod
+    def get_rates():
+        """
+        {devise: taux HTG} des dernières versions.
+        """
+        now = time.monotonic()
+        if _local["rates"] is not None and _local["expires"] > now:
+            return _local["rates"]
+
+        rates = cache.get(RATES_CACHE_KEY)
+        if rates is None:
+            rates = ExchangeRateService._load_rates()
+            cache.set(RATES_CACHE_KEY, rates, SHARED_TTL)
+
+        _local["rates"] = rates
+        _local["expires"] = now + LOCAL_TTL
+        return rates
+
+    @staticmethod
+    def _load_rates():
+        latest = (
+            ExchangeRate.objects
+            .filter(currency=OuterRef("currency"))
+            .order_by("-version")
+            .values("version")[:1]
+        )
+        rates = dict(
+            ExchangeRate.objects
+            .filter(version=Subquery(latest))
+            .values_list("currency", "rate")
+        )
+        rates[ExchangeRateService.BASE] = Decimal("1")
+        return rates
+
+    @staticmethod
+    def clear_cache():
+        _local["rates"] = None
+        cache.delete(RATES_CACHE_KEY)
+
+    # ==========================
+    # CONVERSION
+    # ==========================
+    @staticmethod
+    def factors(target=BASE, rates=None):
+        """
+        {devise: facteur} tel que montant * facteur = montant en `target`.
+        """
+        rates = rates or ExchangeRateService.get_rates()
+        target_rate = rates.get(target.lower())
+        if not target_rate:
+            raise ValueError(f"Aucun taux pour {target}")
+
+        return {c: rate / target_rate for c, rate in rates.items()}
+
+    @staticmethod
+    def convert_many(amounts_by_currency, target=BASE):
+        """
+        {devise: montant} ➜ {devise: montant converti en `target`}.
+        Les facteurs sont calculés une seule fois ; les devises
+        sans taux sont ignorées.
+        """
+        factors = ExchangeRateService.factors(target)
+        converted = {}
+
+        for currency, amount in amounts_by_currency.items():
+            factor = factors.get(currency.lower())
+            if factor is not None:
+                converted[currency] = Decimal(amount) * factor
+
+        return converted
+
+    @staticmethod
+    def total(amounts_by_currency, target=BASE):
+        return sum(
+            ExchangeRateService.convert_many(amounts_by_currency, target).values(),
+            start=Decimal("0"),
+        )
+
+    @staticmethod
+    def total_portfolios(portfolios, target=BASE):
+        """
+        {clé: {devise: montant}} ➜ {clé: total en `target`}, en une passe
+        (ex. des milliers d'utilisateurs pour un relevé ou une analyse).
+        """
+        factors = ExchangeRateService.factors(target)
+
+        return {
+            key: sum(
+                (
+                    Decimal(amount) * factors[currency.lower()]
+                    for currency, amount in amounts.items()
+                    if currency.lower() in factors
+                ),
+                start=Decimal("0"),
+            )
+            for key, amounts in portfolios.items()
+        }
+
+    # ==========================
+    # PUBLICATION
+    # ==========================
+    @staticmethod
+    def publish(currency, rate, *, source=ExchangeRate.SOURCE_ADMIN, created_by=None):
+        """
+        Crée la version suivante du taux d'une devise.
+        """
+        currency = currency.lower()
+        rate = Decimal(str(rate))
+        if rate <= 0:
+            raise ValueError("Taux invalide")
+
+        for _ in range(3):
+            try:
+                with transaction.atomic():
+                    current = (
+                        ExchangeRate.objects
+                        .filter(currency=currency)
+                        .aggregate(v=Max("version"))["v"]
+                    ) or 0
+
+                    obj = ExchangeRate.objects.create(
+                        currency=currency,
+                        rate=rate,
+                        version=current + 1,
+                        source=source,
+                        created_by=created_by,
+                    )
+            except IntegrityError:
+                # Publication concurrente de la même version : on rejoue
+                continue
+
+            transaction.on_commit(ExchangeRateService.clear_cache)
+            return obj
+
+        raise ValueError(f"Publication du taux {currency} impossible")
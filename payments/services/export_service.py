@@ -0,0 +1,112 @@
+import csv
+import json
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+
+from payments.models import Transaction
+from payments.utils.minor_units import from_minor
+
+# ======================================================
+# 📤 EXPORT DU LEDGER (FLUX, MÉMOIRE CONSTANTE)
+# ======================================================
+# Les lignes sont lues par paquets avec .iterator() (curseur serveur
+# sur PostgreSQL) en tuples bruts, sans instancier de modèles, et
+# chaque ligne est émise dès qu'elle est lue.
+
+EXPORT_FIELDS = (
+    "id",
+    "user_id",
+    "created_at",
+    "transaction_type",
+    "bonus_type",
+    "source",
+    "status",
+    "amount",
+    "currency",
+    "description",
+)
+
+EXPORT_FORMATS = ("csv", "jsonl")
+
+CHUNK_SIZE = 2000
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def filter_transactions(
+    queryset=None,
+    *,
+    start=None,
+    end=None,
+    currency=None,
+    transaction_type=None,
+):
+    """
+    Filtres d'export. `start` / `end` sont des dates incluses ;
+    les bornes restent sur created_at pour profiter de l'index.
+    """
+    qs = Transaction.objects.all() if queryset is None else queryset
+
+    if start:
+        qs = qs.filter(created_at__gte=_day_start(start))
+    if end:
+        qs = qs.filter(created_at__lt=_day_start(end + timedelta(days=1)))
+    if currency:
+        qs = qs.filter(currency__iexact=currency)
+    if transaction_type:
+        qs = qs.filter(transaction_type=transaction_type)
+
+    return qs
+
+
+# Le montant est lu en unités mineures (valeur exacte, même sur SQLite)
+_COLUMNS = ["amount_minor" if f == "amount" else f for f in EXPORT_FIELDS]
+_ID, _CREATED, _AMOUNT, _CURRENCY = (
+    EXPORT_FIELDS.index(f) for f in ("id", "created_at", "amount", "currency")
+)
+
+
+def _rows(queryset):
+    rows = (
+        queryset
+        .order_by("created_at", "id")
+        .values_list(*_COLUMNS)
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+
+    for row in rows:
+        row = list(row)
+        row[_ID] = str(row[_ID])
+        row[_CREATED] = row[_CREATED].isoformat()
+        row[_AMOUNT] = from_minor(row[_AMOUNT], row[_CURRENCY])
+        yield row
+
+
+class _Echo:
+    """
+    Pseudo-fichier : csv.writer écrit une ligne, on la renvoie telle quelle.
+    """
+    def write(self, value):
+        return value
+
+
+def iter_csv(queryset):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+
+    for row in _rows(queryset):
+        yield writer.writerow(row)
+
+
+def iter_jsonl(queryset):
+    for row in _rows(queryset):
+        yield json.dumps(dict(zip(EXPORT_FIELDS, row)), default=str, ensure_ascii=False) + "\n"
+
+
+def iter_export(queryset, fmt="csv"):
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Format d'export inconnu : {fmt}")
+    return iter_csv(queryset) if fmt == "csv" else iter_jsonl(queryset)
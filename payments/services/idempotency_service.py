@@ -0,0 +1,136 @@
+import hashlib
+import json
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, models, transaction
+from django.utils import timezone
+
+from payments.models import IdempotencyKey
+
+# ======================================================
+# 🔁 IDEMPOTENCE DES ÉCRITURES
+# ======================================================
+# La clé est posée dans la même transaction que le travail :
+#   - en cas d'échec, tout est annulé et le client peut rejouer ;
+#   - une requête concurrente avec la même clé bute sur l'index
+#     unique (user, scope, key) puis relit le résultat enregistré.
+# Un nouvel essai coûte une seule lecture indexée.
+
+IDEMPOTENCY_TTL = timedelta(seconds=getattr(settings, "IDEMPOTENCY_KEY_TTL", 24 * 3600))
+
+
+class IdempotencyConflict(Exception):
+    """
+    Clé réutilisée pour une autre requête (422) ou requête
+    d'origine encore en cours (409).
+    """
+    def __init__(self, message, status_code=409):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def fingerprint(*parts) -> str:
+    raw = json.dumps(parts, sort_keys=True, cls=DjangoJSONEncoder, separators=(",", ":"))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+# ==========================
+# RÉSULTATS DE SERVICE
+# ==========================
+def dump_result(result):
+    """
+    Instance(s) de modèle ➜ références {model, pk} ; le reste tel quel.
+    """
+    if isinstance(result, models.Model):
+        return {"model": result._meta.label_lower, "pk": str(result.pk)}
+    if isinstance(result, (list, tuple)):
+        return {"items": [dump_result(item) for item in result]}
+    return {"value": result}
+
+
+def load_result(payload):
+    if "items" in payload:
+        return [load_result(item) for item in payload["items"]]
+    if "model" in payload:
+        return apps.get_model(payload["model"]).objects.get(pk=payload["pk"])
+    return payload.get("value")
+
+
+class IdempotencyService:
+
+    @staticmethod
+    def run(user, scope, key, request_fingerprint, func, *, dump=dump_result, load=load_result):
+        """
+        Exécute func() une seule fois par (user, scope, key).
+
+        `dump(result)` retourne le dict à enregistrer, ou None si le
+        résultat ne doit pas l'être (ex. formulaire invalide) : la clé
+        est alors libérée. Sans clé, func() est simplement appelée.
+        """
+        if not key:
+            return func()
+
+        stored = IdempotencyService._replay(user, scope, key, request_fingerprint)
+        if stored is not None:
+            return load(stored)
+
+        with transaction.atomic():
+            record = IdempotencyService._claim(user, scope, key, request_fingerprint)
+            if record is not None:
+                result = func()
+                payload = dump(result)
+
+                if payload is None:
+                    record.delete()
+                else:
+                    record.response = payload
+                    record.save(update_fields=["response"])
+                return result
+
+        # Même clé posée entre-temps par une requête concurrente
+        stored = IdempotencyService._replay(user, scope, key, request_fingerprint)
+        if stored is None:
+            raise IdempotencyConflict("Requête déjà en cours de traitement", 409)
+        return load(stored)
+
+    @staticmethod
+    def _replay(user, scope, key, request_fingerprint):
+        row = (
+            IdempotencyKey.objects
+            .filter(user=user, scope=scope, key=key, expires_at__gt=timezone.now())
+            .values_list("fingerprint", "response")
+            .first()
+        )
+        if row is None:
+            return None
+
+        stored_fingerprint, response = row
+        if stored_fingerprint != request_fingerprint:
+            raise IdempotencyConflict("Clé d'idempotence déjà utilisée pour une autre requête", 422)
+        return response
+
+    @staticmethod
+    def _claim(user, scope, key, request_fingerprint):
+        now = timezone.now()
+        lookup = {"user": user, "scope": scope, "key": key}
+
+        # Une clé expirée peut être réutilisée
+        IdempotencyKey.objects.filter(expires_at__lte=now, **lookup).delete()
+
+        try:
+            with transaction.atomic():
+                return IdempotencyKey.objects.create(
+                    fingerprint=request_fingerprint,
+                    expires_at=now + IDEMPOTENCY_TTL,
+                    **lookup,
+                )
+        except IntegrityError:
+            return None
+
+    @staticmethod
+    def purge_expired():
+        deleted, _ = IdempotencyKey.objects.filter(expires_at__lte=timezone.now()).delete()
+        return deleted
@@ -0,0 +1,93 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from django.db import transaction
+
+from payments.crypto_utils import FERNET_KEY_ID, rotate_privkeys
+from payments.models import JobCheckpoint, Wallet
+from payments.utils.wallet_cache import invalidate_wallets
+
+# ======================================================
+# 🔑 ROTATION DES CLÉS FERNET (CLÉS PRIVÉES DES WALLETS)
+# ======================================================
+# Parcours des wallets par pk croissant (keyset, jamais d'OFFSET) :
+# chaque lot est re-chiffré avec MultiFernet.rotate(), écrit en un
+# bulk_update et le point de reprise avance dans la même transaction.
+# Le checkpoint est propre à la clé primaire : une nouvelle rotation
+# repart du début, une rotation interrompue reprend où elle en était.
+#
+# Le chiffrement est CPU-bound : avec `workers` > 1, chaque lot est
+# réparti sur un pool de processus pendant que le process principal
+# garde la connexion DB.
+
+KEY_ROTATION_CHUNK_SIZE = 1000
+
+
+def _split(rows, parts):
+    size = -(-len(rows) // parts)
+    return [rows[i:i + size] for i in range(0, len(rows), size)]
+
+
+class KeyRotationService:
+
+    @staticmethod
+    def checkpoint_name():
+        return f"rotate_wallet_keys:{FERNET_KEY_ID}"
+
+    @staticmethod
+    def rotate_wallets(chunk_size=KEY_ROTATION_CHUNK_SIZE, workers=1, restart=False, progress=None):
+        """
+        Re-chiffre toutes les clés privées avec la clé primaire.
+        Retourne le nombre de wallets traités par cet appel.
+        `progress(total)` est appelé après chaque lot.
+        """
+        checkpoint, _ = JobCheckpoint.objects.get_or_create(
+            name=KeyRotationService.checkpoint_name()
+        )
+        if restart:
+            checkpoint.last_key, checkpoint.last_position = "", 0
+            checkpoint.save(update_fields=["last_key", "last_position", "updated_at"])
+
+        pool = ProcessPoolExecutor(workers) if workers > 1 else None
+        total = 0
+
+        try:
+            while True:
+                wallets = Wallet.objects.exclude(encrypted_private_key="").order_by("pk")
+                if checkpoint.last_key:
+                    wallets = wallets.filter(pk__gt=checkpoint.last_key)
+
+                rows = list(
+                    wallets
+                    .values_list("pk", "encrypted_private_key", "user_id", "network")[:chunk_size]
+                    .iterator(chunk_size=chunk_size)
+                )
+                if not rows:
+                    return total
+
+                tokens = [(pk, token) for pk, token, _, _ in rows]
+                if pool:
+                    rotated = [
+                        row
+                        for part in pool.map(rotate_privkeys, _split(tokens, workers))
+                        for row in part
+                    ]
+                else:
+                    rotated = rotate_privkeys(tokens)
+
+                with transaction.atomic():
+                    Wallet.objects.bulk_update(
+                        [Wallet(pk=pk, encrypted_private_key=token) for pk, token in rotated],
+                        ["encrypted_private_key"],
+                    )
+                    invalidate_wallets([(user_id, network) for _, _, user_id, network in rows])
+
+                    checkpoint.last_key = str(rows[-1][0])
+                    checkpoint.last_position += len(rows)
+                    checkpoint.save(update_fields=["last_key", "last_position", "updated_at"])
+
+                total += len(rows)
+                if progress:
+                    progress(total)
+        finally:
+            if pool:
+                pool.shutdown()
@@ -0,0 +1,171 @@
+from collections import defaultdict
+from decimal import Decimal
+from typing import NamedTuple, Optional
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from payments.models import Balance, BalanceCurrency, Transaction
+from payments.services.system_account_service import SystemAccountService
+from payments.utils.minor_units import from_minor, to_minor
+
+
+# ============================================================
+# ÉCRITURE LEDGER
+# ============================================================
+
+class LedgerEntry(NamedTuple):
+    """
+    Une ligne à poster : montant signé (> 0 crédit, < 0 débit).
+    `user` peut être une instance ou directement un user_id.
+    """
+    user: object
+    currency: str
+    amount: Decimal
+    metadata: Optional[dict] = None
+    description: Optional[str] = None
+    bonus_type: Optional[str] = None
+
+
+class LedgerService:
+    """
+    Postage groupé de mouvements ledger.
+
+    Au lieu de N × (Transaction.objects.create + BalanceService.credit/debit),
+    un lot coûte un nombre constant de requêtes :
+    - 1 SELECT (+ 1 INSERT si besoin) pour les Balance,
+    - 1 INSERT ... ON CONFLICT DO NOTHING pour les BalanceCurrency,
+    - 1 UPDATE agrégé par devise (variations nettes par balance,
+      calculées en unités mineures entières),
+    - 1 bulk INSERT des Transaction.
+
+    Note : bulk_create n'émet pas de post_save, les notifications
+    par transaction ne sont donc pas déclenchées pour un lot.
+    """
+
+    CURRENCIES = {code for code, _ in BalanceCurrency.CURRENCY_TYPES}
+
+    # ==========================
+    # VALIDATION
+    # ==========================
+    @staticmethod
+    def _normalize(entry):
+        """
+        Retourne (entrée normalisée, montant signé en unités mineures).
+        """
+        if not isinstance(entry, LedgerEntry):
+            entry = LedgerEntry(*entry)
+
+        currency = (entry.currency or "").lower()
+        if currency not in LedgerService.CURRENCIES:
+            raise ValidationError(f"Devise non supportée : {entry.currency}")
+
+        minor = to_minor(entry.amount, currency)
+        if minor == 0:
+            raise ValidationError("Montant invalide")
+
+        user_id = getattr(entry.user, "pk", entry.user)
+
+        return entry._replace(user=user_id, currency=currency), minor
+
+    # ==========================
+    # BALANCES
+    # ==========================
+    @staticmethod
+    def ensure_balances(user_ids):
+        """
+        {user_id: balance_id}, en créant les Balance manquantes en un INSERT.
+        """
+        found = dict(
+            Balance.objects
+            .filter(user_id__in=user_ids)
+            .values_list("user_id", "id")
+        )
+
+        missing = [uid for uid in user_ids if uid not in found]
+        if missing:
+            Balance.objects.bulk_create(
+                [Balance(user_id=uid) for uid in missing],
+                ignore_conflicts=True,
+            )
+            found.update(
+                Balance.objects
+                .filter(user_id__in=missing)
+                .values_list("user_id", "id")
+            )
+
+        return found
+
+    # ==========================
+    # POSTAGE
+    # ==========================
+    @staticmethod
+    @transaction.atomic
+    def post_batch(
+        entries,
+        *,
+        source=Transaction.SYSTEM,
+        bonus_type=Transaction.BONUS,
+        description=None,
+        system_account=None,
+    ):
+        """
+        Poste un lot d'écritures (user, currency, montant signé, metadata)
+        de façon atomique : soit tout passe, soit rien.
+
+        `system_account` (SystemAccountShard.TREASURY, REVENUE...) reçoit
+        la contrepartie nette par devise, sur un seul shard.
+
+        Lève ValidationError pour une écriture invalide et ValueError
+        si un débit rend un solde négatif.
+        Retourne la liste des Transaction créées (dans l'ordre des entrées).
+        """
+        entries = [LedgerService._normalize(e) for e in entries]
+        if not entries:
+            return []
+
+        balance_ids = LedgerService.ensure_balances({e.user for e, _ in entries})
+
+        # 1️⃣ Variations nettes par (devise, balance)
+        deltas = defaultdict(lambda: defaultdict(int))
+        for e, minor in entries:
+            deltas[e.currency][balance_ids[e.user]] += minor
+
+        BalanceCurrency.objects.bulk_create(
+            [
+                BalanceCurrency(balance_id=bid, currency=currency)
+                for currency, per_balance in deltas.items()
+                for bid in per_balance
+            ],
+            ignore_conflicts=True,
+        )
+
+        # 2️⃣ Un UPDATE agrégé par devise
+        for currency, per_balance in deltas.items():
+            BalanceCurrency.objects.apply_deltas(currency, per_balance)
+
+        # Contrepartie système : shard choisi d'après le premier user du lot
+        if system_account:
+            net = defaultdict(int)
+            for e, minor in entries:
+                net[e.currency] -= minor
+            SystemAccountService.post_deltas(system_account, net, key=entries[0][0].user)
+
+        # 3️⃣ Ledger
+        return Transaction.objects.bulk_create([
+            Transaction(
+                user_id=e.user,
+                amount=from_minor(abs(minor), e.currency),
+                amount_minor=abs(minor),
+                currency=e.currency,
+                transaction_type=(
+                    Transaction.CREDIT if minor > 0 else Transaction.DEBIT
+                ),
+                bonus_type=e.bonus_type or bonus_type,
+                source=source,
+                status=Transaction.STATUS_COMPLETED,
+                metadata=e.metadata or {},
+                description=e.description or description,
+            )
+            for e, minor in entries
+        ])
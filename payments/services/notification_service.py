@@ -1,6 +1,8 @@
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
 
+from notifications.services.push import user_group
+
 
 class NotificationService:
     """
@@ -8,11 +10,13 @@ class NotificationService:
     """
 
     @staticmethod
-    def send(user, message, extra=None):
+    def send(user, message, extra=None, title=""):
         channel_layer = get_channel_layer()
 
+        # Même groupe / handler que NotificationConsumer
         payload = {
-            "type": "send_notification",
+            "type": "notify",
+            "title": title,
             "message": message,
         }
 
@@ -20,7 +24,7 @@ class NotificationService:
             payload["extra"] = extra
 
         async_to_sync(channel_layer.group_send)(
-            f"notifications_{user.id}",
+            user_group(user.id),
             payload
         )
 
@@ -0,0 +1,102 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from payments.models import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+# ======================================================
+# 📮 OUTBOX TRANSACTIONNELLE
+# ======================================================
+# enqueue() écrit l'événement dans la transaction de l'appelant :
+# il n'existe que si le changement d'état est commité. Le worker
+# traite chaque événement dans sa propre transaction (effet + statut
+# "done" commités ensemble) ; un échec est rejoué avec un délai
+# croissant, puis abandonné après OUTBOX_MAX_ATTEMPTS.
+
+OUTBOX_HANDLERS = {
+    "payment.completed": "payments.services.payment_service.apply_completed_payment",
+}
+
+OUTBOX_BATCH_SIZE = getattr(settings, "OUTBOX_BATCH_SIZE", 100)
+OUTBOX_MAX_ATTEMPTS = 8
+
+
+def _backoff(attempts):
+    return timedelta(seconds=min(2 ** attempts * 5, 3600))
+
+
+class OutboxService:
+
+    @staticmethod
+    def enqueue(topic, payload, dedup_key=None):
+        """
+        Enregistre un effet à appliquer ; ignoré si `dedup_key` existe déjà.
+        Le worker est réveillé au commit.
+        """
+        if topic not in OUTBOX_HANDLERS:
+            raise ValueError(f"Aucun handler outbox pour {topic}")
+
+        OutboxEvent.objects.bulk_create(
+            [OutboxEvent(topic=topic, payload=payload, dedup_key=dedup_key)],
+            ignore_conflicts=True,
+        )
+        transaction.on_commit(OutboxService._wake_worker)
+
+    @staticmethod
+    def _wake_worker():
+        from payments.tasks import drain_outbox
+
+        try:
+            drain_outbox.delay()
+        except Exception:
+            # Broker indisponible : la tâche périodique prendra le relais
+            logger.warning("Outbox : réveil du worker impossible", exc_info=True)
+
+    @staticmethod
+    def drain(batch_size=OUTBOX_BATCH_SIZE):
+        """
+        Traite jusqu'à `batch_size` événements prêts.
+        Retourne le nombre d'événements traités (réussis ou non).
+        """
+        processed = 0
+
+        while processed < batch_size:
+            with transaction.atomic():
+                event = (
+                    OutboxEvent.objects
+                    .select_for_update(skip_locked=True)
+                    .filter(status=OutboxEvent.STATUS_PENDING, available_at__lte=timezone.now())
+                    .order_by("available_at", "id")
+                    .first()
+                )
+                if event is None:
+                    break
+
+                OutboxService._process(event)
+                processed += 1
+
+        return processed
+
+    @staticmethod
+    def _process(event):
+        try:
+            with transaction.atomic():
+                import_string(OUTBOX_HANDLERS[event.topic])(event.payload)
+        except Exception as e:
+            event.attempts += 1
+            event.last_error = repr(e)[:2000]
+            event.available_at = timezone.now() + _backoff(event.attempts)
+            if event.attempts >= OUTBOX_MAX_ATTEMPTS:
+                event.status = OutboxEvent.STATUS_FAILED
+            logger.exception(f"Outbox : échec de {event}")
+        else:
+            event.status = OutboxEvent.STATUS_DONE
+            event.processed_at = timezone.now()
+
+        event.save(update_fields=["status", "attempts", "last_error", "available_at", "processed_at"])
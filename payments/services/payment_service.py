@@ -3,6 +3,8 @@ from django.utils import timezone
 from django.core.exceptions import ValidationError
 
 from payments.models import Payment, Transaction
+from payments.services.idempotency_service import IdempotencyService, fingerprint
+from payments.services.outbox_service import OutboxService
 
 
 class PaymentService:
@@ -17,9 +19,10 @@ class PaymentService:
     # =====================================================
     @staticmethod
     @db_transaction.atomic
-    def create_payment(*, user, amount, currency, payment_type, metadata=None):
+    def create_payment(*, user, amount, currency, payment_type, metadata=None, idempotency_key=None):
         """
         Crée un paiement en statut 'pending'.
+        Avec `idempotency_key`, un nouvel essai renvoie le paiement d'origine.
 
         Exemples de metadata :
         {
@@ -33,17 +36,21 @@ class PaymentService:
         if amount <= 0:
             raise ValidationError("Le montant doit être supérieur à 0")
 
-        payment = Payment.objects.create(
-            user=user,
-            amount=amount,
-            currency=currency,
-            payment_type=payment_type,
-            status=Payment.STATUS_PENDING,
-            metadata=metadata or {},
+        return IdempotencyService.run(
+            user,
+            "payment",
+            idempotency_key,
+            fingerprint(amount, currency, payment_type, metadata),
+            lambda: Payment.objects.create(
+                user=user,
+                amount=amount,
+                currency=currency,
+                payment_type=payment_type,
+                status=Payment.STATUS_PENDING,
+                metadata=metadata or {},
+            ),
         )
 
-        return payment
-
     # =====================================================
     # TRANSACTION TECHNIQUE
     # =====================================================
@@ -80,21 +87,30 @@ class PaymentService:
     @db_transaction.atomic
     def mark_completed(payment: Payment):
         """
-        Marque le paiement comme complété et déclenche la logique métier.
+        Marque le paiement comme complété.
+
+        La logique métier (amende, péage, contrat...) et la notification
+        ne tournent plus dans la transaction de la requête : un événement
+        outbox est écrit ici et appliqué par le worker (apply_completed_payment).
         """
 
         if payment.status == Payment.STATUS_COMPLETED:
             return payment
 
         payment.status = Payment.STATUS_COMPLETED
-        payment.payment_date = timezone.now()
-        payment.save(update_fields=["status", "payment_date"])
+        payment.is_paid = True
+        payment.paid_at = timezone.now()
+        payment.save(update_fields=["status", "is_paid", "paid_at"])
 
         if payment.transaction:
             payment.transaction.status = Transaction.STATUS_COMPLETED
             payment.transaction.save(update_fields=["status"])
 
-        PaymentService._apply_business_effect(payment)
+        OutboxService.enqueue(
+            "payment.completed",
+            {"payment_id": str(payment.pk)},
+            dedup_key=f"payment.completed:{payment.pk}",
+        )
         return payment
 
     @staticmethod
@@ -229,7 +245,7 @@ class PaymentService:
             return
 
         toll = (
-            TOLL.objects
+            Toll.objects
             .select_for_update()
             .filter(id=toll_id)
             .first()
@@ -237,4 +253,40 @@ class PaymentService:
         if not toll:
             return
 
-        toll.update_payment_status()
\ No newline at end of file
+        toll.update_payment_status()
+
+
+# =====================================================
+# OUTBOX
+# =====================================================
+def apply_completed_payment(payload):
+    """
+    Handler outbox "payment.completed" : effet métier puis notification,
+    dans la transaction du worker. Rejouable : les handlers ne
+    modifient que ce qui n'est pas encore payé.
+    """
+    from notifications.models import Notification
+    from notifications.services.notification_buffer import flush_notifications, notify
+
+    payment = (
+        Payment.objects
+        .select_related("user", "transaction")
+        .filter(pk=payload["payment_id"], status=Payment.STATUS_COMPLETED)
+        .first()
+    )
+    if not payment:
+        return
+
+    PaymentService._apply_business_effect(payment)
+
+    notify(
+        user=payment.user,
+        title="Paiement réussi ✅",
+        message=f"Votre paiement de {payment.amount} {payment.currency} a été confirmé.",
+        notification_type=Notification.SUCCESS,
+        transaction=payment.transaction,
+    )
+
+    # Insérée avant de rendre la main : l'événement ne passe DONE qu'avec
+    # la notification dans la même transaction (livraison au moins une fois)
+    flush_notifications()
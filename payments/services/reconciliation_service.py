@@ -0,0 +1,171 @@
+from collections import defaultdict
+from typing import NamedTuple
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Case, F, Sum, When
+from django.db.models.functions import Lower
+
+from payments.models import BalanceCurrency, Transaction
+from payments.utils.minor_units import MinorAmountField, from_minor
+
+# ======================================================
+# 🧮 RÉCONCILIATION SOLDES / LEDGER
+# ======================================================
+# Pour chaque tranche d'utilisateurs (keyset sur user.id), deux
+# requêtes agrégées seulement :
+#   - les soldes BalanceCurrency.amount_minor,
+#   - SUM(crédits) - SUM(débits) des Transaction réussies,
+# groupés par (user, devise), puis comparés en mémoire.
+#
+# Les deux lectures ne sont pas dans le même instantané : un écart
+# est revérifié sous verrou des soldes avant d'être signalé.
+
+RECONCILE_CHUNK_SIZE = 5000
+
+
+class Drift(NamedTuple):
+    user_id: int
+    currency: str
+    balance_minor: int
+    ledger_minor: int
+
+    @property
+    def drift_minor(self):
+        return self.balance_minor - self.ledger_minor
+
+    @property
+    def drift(self):
+        return from_minor(self.drift_minor, self.currency)
+
+
+_SIGNED = Case(
+    When(transaction_type=Transaction.DEBIT, then=-F("amount_minor")),
+    default=F("amount_minor"),
+    output_field=MinorAmountField(),
+)
+
+
+class ReconciliationService:
+
+    # ==========================
+    # LECTURE AGRÉGÉE
+    # ==========================
+    @staticmethod
+    def _balances(user_filter, currency=None):
+        qs = BalanceCurrency.objects.filter(**{f"balance__{k}": v for k, v in user_filter.items()})
+        if currency:
+            qs = qs.filter(currency=currency)
+
+        totals = defaultdict(int)
+        for user_id, cur, minor in qs.values_list("balance__user_id", Lower("currency"), "amount_minor"):
+            totals[(user_id, cur)] += minor
+        return totals
+
+    @staticmethod
+    def _ledger(user_filter, currency=None):
+        qs = Transaction.objects.filter(status=Transaction.STATUS_COMPLETED, **user_filter)
+        if currency:
+            qs = qs.filter(currency__iexact=currency)
+
+        return {
+            (row["user_id"], row["cur"]): row["net"] or 0
+            for row in (
+                qs.annotate(cur=Lower("currency"))
+                .values("user_id", "cur")
+                .annotate(net=Sum(_SIGNED))
+            )
+        }
+
+    @staticmethod
+    def _compare(balances, ledger):
+        for key in balances.keys() | ledger.keys():
+            balance_minor = balances.get(key, 0)
+            ledger_minor = ledger.get(key, 0)
+            if balance_minor != ledger_minor:
+                yield Drift(*key, balance_minor, ledger_minor)
+
+    @staticmethod
+    def _user_chunks(chunk_size):
+        """
+        (premier id, dernier id) de chaque tranche d'utilisateurs.
+        """
+        users = get_user_model().objects.order_by("pk").values_list("pk", flat=True)
+        last = 0
+
+        while True:
+            ids = list(users.filter(pk__gt=last)[:chunk_size])
+            if not ids:
+                return
+            yield ids[0], ids[-1]
+            last = ids[-1]
+
+    # ==========================
+    # RAPPROCHEMENT
+    # ==========================
+    @staticmethod
+    def iter_drifts(chunk_size=RECONCILE_CHUNK_SIZE, currency=None, fix=False):
+        """
+        Génère les écarts (Drift) confirmés, tranche par tranche.
+        Avec `fix=True`, une écriture ADJUSTMENT est ajoutée au ledger
+        pour chaque écart, afin que la somme du ledger égale le solde.
+        """
+        currency = currency.lower() if currency else None
+
+        for first, last in ReconciliationService._user_chunks(chunk_size):
+            user_filter = {"user_id__gte": first, "user_id__lte": last}
+            suspects = list(ReconciliationService._compare(
+                ReconciliationService._balances(user_filter, currency),
+                ReconciliationService._ledger(user_filter, currency),
+            ))
+
+            if suspects:
+                yield from ReconciliationService._confirm(suspects, currency, fix)
+
+    @staticmethod
+    @transaction.atomic
+    def _confirm(suspects, currency, fix):
+        """
+        Relit les utilisateurs suspects soldes verrouillés (les écritures
+        ledger passent par un UPDATE de ces lignes) et corrige au besoin.
+        """
+        user_filter = {"user_id__in": {d.user_id for d in suspects}}
+
+        list(
+            BalanceCurrency.objects
+            .select_for_update()
+            .filter(balance__user_id__in=user_filter["user_id__in"])
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+
+        drifts = list(ReconciliationService._compare(
+            ReconciliationService._balances(user_filter, currency),
+            ReconciliationService._ledger(user_filter, currency),
+        ))
+
+        if fix and drifts:
+            ReconciliationService._write_adjustments(drifts)
+
+        return drifts
+
+    @staticmethod
+    def _write_adjustments(drifts):
+        Transaction.objects.bulk_create([
+            Transaction(
+                user_id=d.user_id,
+                amount=from_minor(abs(d.drift_minor), d.currency),
+                amount_minor=abs(d.drift_minor),
+                currency=d.currency,
+                transaction_type=Transaction.CREDIT if d.drift_minor > 0 else Transaction.DEBIT,
+                bonus_type=Transaction.ADJUSTMENT,
+                source=Transaction.SYSTEM,
+                status=Transaction.STATUS_COMPLETED,
+                description="Ajustement de réconciliation",
+                metadata={
+                    "balance_minor": d.balance_minor,
+                    "ledger_minor": d.ledger_minor,
+                },
+            )
+            for d in drifts
+        ])
@@ -1,10 +1,16 @@
 import random
 from decimal import Decimal
-from django.db import transaction
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 
-from payments.models import Balance, BalanceCurrency, Transaction
+from payments.models import RewardCampaign, RewardClaim, SystemAccountShard, Transaction
 from payments.services.balance_service import BalanceService
+from payments.services.ledger_service import LedgerEntry, LedgerService
+from payments.services.system_account_service import SystemAccountService
+from payments.utils.minor_units import to_minor
+from payments.tasks import notify_reward_campaign_chunk
 
 # ======================================================
 # CONSTANTES
@@ -33,22 +39,33 @@ TASK_REWARDS = {
 # ======================================================
 # UTILITAIRES
 # ======================================================
-def _get_balance(user):
-    balance, _ = Balance.objects.get_or_create(user=user)
-    return balance
+def _credit_from_treasury(user, amount):
+    """
+    Crédit utilisateur + contrepartie sur un shard de la trésorerie.
+    """
+    BalanceService.credit(user, amount, JMU)
+    SystemAccountService.post(
+        SystemAccountShard.TREASURY, JMU, -to_minor(amount, JMU), key=user.pk
+    )
 
 
-def _already_rewarded_today(user, reward_key):
+def _claim_reward(user, reward_key):
     """
-    Empêche plusieurs récompenses identiques le même jour
+    Empêche plusieurs récompenses identiques le même jour :
+    insert-or-skip sur l'index unique (user, reward_key, day).
+    Retourne False si la récompense a déjà été réclamée aujourd'hui.
     """
-    return Transaction.objects.filter(
-        user=user,
-        currency=JMU,
-        metadata__reward_key=reward_key,
-        created_at__date=timezone.now().date(),
-        status=Transaction.STATUS_COMPLETED,
-    ).exists()
+    try:
+        with transaction.atomic():
+            RewardClaim.objects.create(
+                user=user,
+                reward_key=reward_key,
+                day=timezone.localdate(),
+            )
+    except IntegrityError:
+        return False
+
+    return True
 
 
 # ======================================================
@@ -58,11 +75,10 @@ def _already_rewarded_today(user, reward_key):
 def reward_user_random_jmu(user, *, allow_multiple_per_day=False):
     reward_key = "RANDOM"
 
-    if not allow_multiple_per_day and _already_rewarded_today(user, reward_key):
+    if not allow_multiple_per_day and not _claim_reward(user, reward_key):
         return None
 
     amount = random.choice(RANDOM_REWARDS)
-    balance = _get_balance(user)
 
     tx = Transaction.objects.create(
         user=user,
@@ -79,7 +95,7 @@ def reward_user_random_jmu(user, *, allow_multiple_per_day=False):
         },
     )
 
-    BalanceService.credit(user, amount, JMU)
+    _credit_from_treasury(user, amount)
     return tx
 
 
@@ -97,11 +113,10 @@ def reward_user_for_task(
     if task_code not in TASK_REWARDS:
         return None
 
-    if not allow_multiple_per_day and _already_rewarded_today(user, task_code):
+    if not allow_multiple_per_day and not _claim_reward(user, task_code):
         return None
 
     amount = TASK_REWARDS[task_code]
-    balance = _get_balance(user)
     # Determination de la traduction
     TASK_LABELS = {
     "SIGNUP": "Enskripsyon",
@@ -154,7 +169,7 @@ def reward_user_for_task(
         metadata=metadata,
     )
 
-    BalanceService.credit(user, amount, JMU)
+    _credit_from_treasury(user, amount)
     return tx
 
 
@@ -171,7 +186,6 @@ def reward_user_manual(
     metadata=None,
 ):
     amount = Decimal(amount)
-    balance = _get_balance(user)
 
     tx = Transaction.objects.create(
         user=user,
@@ -187,5 +201,139 @@ def reward_user_manual(
         },
     )
 
-    BalanceService.credit(user, amount, JMU)
-    return tx
\ No newline at end of file
+    _credit_from_treasury(user, amount)
+    return tx
+
+# ======================================================
+# 📣 CAMPAGNE (ÉMISSION EN MASSE)
+# ======================================================
+def _iter_user_id_chunks(users, start_after, chunk_size):
+    """
+    Découpe la source (QuerySet d'utilisateurs ou liste d'ids)
+    en lots d'ids croissants strictement > start_after.
+    """
+    if hasattr(users, "values_list"):
+        ids = (
+            users.filter(id__gt=start_after)
+            .order_by("id")
+            .values_list("id", flat=True)
+            .iterator(chunk_size=chunk_size)
+        )
+    else:
+        ids = (uid for uid in sorted(set(users)) if uid > start_after)
+
+    chunk = []
+    for uid in ids:
+        chunk.append(uid)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+def issue_campaign(
+    users,
+    *,
+    campaign_key,
+    amount=None,
+    reason=None,
+    currency=JMU,
+    chunk_size=1000,
+    progress=None,
+    skipped=None,
+):
+    """
+    Crédite une récompense à un grand nombre d'utilisateurs.
+
+    `users` : QuerySet d'utilisateurs ou itérable de user_id (ex : CSV).
+    Chaque lot est traité dans UNE transaction :
+    - RewardClaim en bulk (anti-doublon),
+    - écritures ledger + soldes via LedgerService.post_batch,
+    - avancement du point de reprise (last_user_id).
+    Une seule notification groupée est mise en file par lot.
+
+    Relancer avec le même `campaign_key` reprend là où on s'était arrêté.
+    `progress(campaign)` est appelé après chaque lot.
+    Les user_id inconnus (CSV périmé, compte supprimé) sont ignorés et
+    passés à `skipped(ids)`.
+    """
+    User = get_user_model()
+    campaign = RewardCampaign.objects.filter(key=campaign_key).first()
+
+    if campaign is None:
+        if amount is None:
+            raise ValidationError("Montant requis pour une nouvelle campagne")
+
+        campaign = RewardCampaign.objects.create(
+            key=campaign_key,
+            amount=Decimal(str(amount)),
+            currency=currency.lower(),
+            reason=reason or "",
+        )
+
+    if campaign.status == RewardCampaign.STATUS_COMPLETED:
+        return campaign
+
+    campaign.status = RewardCampaign.STATUS_RUNNING
+    campaign.save(update_fields=["status"])
+
+    day = timezone.localdate(campaign.created_at)
+    metadata = {"reward_type": "campaign", "campaign": campaign.key}
+
+    for chunk in _iter_user_id_chunks(users, campaign.last_user_id, chunk_size):
+        with transaction.atomic():
+            existing = set(
+                User.objects
+                .filter(pk__in=chunk)
+                .values_list("pk", flat=True)
+            )
+            unknown = [uid for uid in chunk if uid not in existing]
+
+            already = set(
+                RewardClaim.objects
+                .filter(reward_key=campaign.reward_key, day=day, user_id__in=chunk)
+                .values_list("user_id", flat=True)
+            )
+            todo = [uid for uid in chunk if uid in existing and uid not in already]
+
+            RewardClaim.objects.bulk_create(
+                [
+                    RewardClaim(user_id=uid, reward_key=campaign.reward_key, day=day)
+                    for uid in todo
+                ],
+                ignore_conflicts=True,
+            )
+
+            LedgerService.post_batch(
+                [
+                    LedgerEntry(uid, campaign.currency, campaign.amount, metadata)
+                    for uid in todo
+                ],
+                source=Transaction.SYSTEM,
+                bonus_type=Transaction.BONUS,
+                description=campaign.reason,
+                system_account=SystemAccountShard.TREASURY,
+            )
+
+            campaign.last_user_id = chunk[-1]
+            campaign.processed_count += len(todo)
+            campaign.save(update_fields=["last_user_id", "processed_count"])
+
+            if todo:
+                transaction.on_commit(
+                    lambda ids=todo: notify_reward_campaign_chunk.delay(campaign.id, ids)
+                )
+
+        if unknown and skipped:
+            skipped(unknown)
+
+        if progress:
+            progress(campaign)
+
+    campaign.status = RewardCampaign.STATUS_COMPLETED
+    campaign.completed_at = timezone.now()
+    campaign.save(update_fields=["status", "completed_at"])
+
+    return campaign
@@ -0,0 +1,232 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import Lower, TruncDate
+from django.utils import timezone
+
+from payments.models import (
+    JobCheckpoint,
+    LedgerDailyRollup,
+    LedgerMonthlyRollup,
+    Transaction,
+)
+from payments.utils.minor_units import from_minor
+
+# ======================================================
+# 📊 AGRÉGATS DU LEDGER
+# ======================================================
+# Chaque lot lit les transactions complétées après le point de reprise
+# (completed_at : une transaction "pending" complétée tard n'est pas
+# dépassée), en déduit les (user, jour de created_at) touchés et recalcule
+# entièrement ces jours, puis les mois correspondants à partir des
+# lignes journalières. Recalculer plutôt qu'additionner rend un lot
+# rejouable sans double comptage.
+#
+# On s'arrête à `now - ROLLUP_LAG` : une transaction encore en cours
+# de commit avec un completed_at plus ancien serait sinon dépassée.
+
+ROLLUP_CHECKPOINT = "ledger_rollups"
+ROLLUP_LAG = timedelta(minutes=5)
+ROLLUP_BATCH_SIZE = 5000
+
+_KEY = ("user_id", "currency", "transaction_type", "bonus_type")
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _month_start(day):
+    return day.replace(day=1)
+
+
+def _next_month(month):
+    return (month + timedelta(days=32)).replace(day=1)
+
+
+class RollupService:
+
+    # ==========================
+    # RAFRAÎCHISSEMENT
+    # ==========================
+    @staticmethod
+    def refresh(batch_size=ROLLUP_BATCH_SIZE, lag=ROLLUP_LAG):
+        """
+        Traite un lot après le point de reprise.
+        Retourne le nombre de (user, jour) recalculés (0 = à jour).
+        """
+        upper = timezone.now() - lag
+
+        with transaction.atomic():
+            JobCheckpoint.objects.get_or_create(name=ROLLUP_CHECKPOINT)
+            checkpoint = JobCheckpoint.objects.select_for_update().get(name=ROLLUP_CHECKPOINT)
+
+            pending = Transaction.objects.filter(
+                status=Transaction.STATUS_COMPLETED,
+                completed_at__lte=upper,
+            )
+            if checkpoint.last_timestamp:
+                pending = pending.filter(completed_at__gt=checkpoint.last_timestamp)
+
+            # Fin du lot : horodatage de la batch_size-ième ligne
+            # (les ex aequo sont inclus pour ne pas couper un instant)
+            end = (
+                pending
+                .order_by("completed_at")
+                .values_list("completed_at", flat=True)[batch_size - 1:batch_size]
+                .first()
+            ) or upper
+
+            dirty = set(
+                pending
+                .filter(completed_at__lte=end)
+                .annotate(day=TruncDate("created_at"))
+                .values_list("user_id", "day")
+                .distinct()
+            )
+
+            if dirty:
+                RollupService._rebuild_daily(dirty)
+                RollupService._rebuild_monthly(
+                    {(user_id, _month_start(day)) for user_id, day in dirty}
+                )
+
+            checkpoint.last_timestamp = end
+            checkpoint.save(update_fields=["last_timestamp", "updated_at"])
+
+        return len(dirty)
+
+    @staticmethod
+    def refresh_all(batch_size=ROLLUP_BATCH_SIZE, lag=ROLLUP_LAG):
+        """
+        Enchaîne les lots jusqu'au rattrapage (une transaction par lot).
+        """
+        total = 0
+        while True:
+            done = RollupService.refresh(batch_size, lag)
+            if not done:
+                return total
+            total += done
+
+    @staticmethod
+    def _rebuild_daily(dirty):
+        users_by_day = defaultdict(set)
+        for user_id, day in dirty:
+            users_by_day[day].add(user_id)
+
+        for day, user_ids in users_by_day.items():
+            rows = (
+                Transaction.objects
+                .filter(
+                    status=Transaction.STATUS_COMPLETED,
+                    user_id__in=user_ids,
+                    created_at__gte=_day_start(day),
+                    created_at__lt=_day_start(day + timedelta(days=1)),
+                )
+                .annotate(cur=Lower("currency"))
+                .values("user_id", "cur", "transaction_type", "bonus_type")
+                .annotate(total=Sum("amount_minor"), n=Count("id"))
+            )
+
+            LedgerDailyRollup.objects.filter(user_id__in=user_ids, day=day).delete()
+            LedgerDailyRollup.objects.bulk_create([
+                LedgerDailyRollup(
+                    user_id=row["user_id"],
+                    currency=row["cur"],
+                    transaction_type=row["transaction_type"],
+                    bonus_type=row["bonus_type"],
+                    day=day,
+                    amount_minor=row["total"] or 0,
+                    tx_count=row["n"],
+                )
+                for row in rows
+            ])
+
+    @staticmethod
+    def _rebuild_monthly(dirty):
+        users_by_month = defaultdict(set)
+        for user_id, month in dirty:
+            users_by_month[month].add(user_id)
+
+        for month, user_ids in users_by_month.items():
+            rows = (
+                LedgerDailyRollup.objects
+                .filter(user_id__in=user_ids, day__gte=month, day__lt=_next_month(month))
+                .values(*_KEY)
+                .annotate(total=Sum("amount_minor"), n=Sum("tx_count"))
+            )
+
+            LedgerMonthlyRollup.objects.filter(user_id__in=user_ids, month=month).delete()
+            LedgerMonthlyRollup.objects.bulk_create([
+                LedgerMonthlyRollup(
+                    user_id=row["user_id"],
+                    currency=row["currency"],
+                    transaction_type=row["transaction_type"],
+                    bonus_type=row["bonus_type"],
+                    month=month,
+                    amount_minor=row["total"] or 0,
+                    tx_count=row["n"] or 0,
+                )
+                for row in rows
+            ])
+
+    # ==========================
+    # LECTURE
+    # ==========================
+    @staticmethod
+    def monthly_statement(user, months=12, currency=None, today=None):
+        """
+        [{period, currency, credit, debit, net, count}] des `months`
+        derniers mois (mois courant inclus), lu dans les agrégats.
+        """
+        first = _month_start(today or timezone.localdate())
+        for _ in range(months - 1):
+            first = _month_start(first - timedelta(days=1))
+
+        qs = LedgerMonthlyRollup.objects.filter(user=user, month__gte=first)
+        if currency:
+            qs = qs.filter(currency=currency.lower())
+
+        return RollupService._summarize(
+            qs.values_list("month", "currency", "transaction_type", "amount_minor", "tx_count")
+        )
+
+    @staticmethod
+    def daily_series(user, currency, start, end=None):
+        """
+        Flux net par jour sur [start, end] pour une courbe de solde.
+        """
+        end = end or timezone.localdate()
+        qs = LedgerDailyRollup.objects.filter(
+            user=user,
+            currency=currency.lower(),
+            day__gte=start,
+            day__lte=end,
+        )
+
+        return RollupService._summarize(
+            qs.values_list("day", "currency", "transaction_type", "amount_minor", "tx_count")
+        )
+
+    @staticmethod
+    def _summarize(rows):
+        periods = defaultdict(lambda: {"credit": 0, "debit": 0, "count": 0})
+
+        for period, currency, tx_type, amount_minor, count in rows:
+            entry = periods[(period, currency)]
+            entry["credit" if tx_type == Transaction.CREDIT else "debit"] += amount_minor
+            entry["count"] += count
+
+        return [
+            {
+                "period": period,
+                "currency": currency,
+                "credit": from_minor(entry["credit"], currency),
+                "debit": from_minor(entry["debit"], currency),
+                "net": from_minor(entry["credit"] - entry["debit"], currency),
+                "count": entry["count"],
+            }
+            for (period, currency), entry in sorted(periods.items())
+        ]
@@ -0,0 +1,81 @@
+import random
+import zlib
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from payments.models import SystemAccountBalance, SystemAccountShard
+from payments.utils.minor_units import from_minor, minor_value
+
+# ======================================================
+# 🏦 COMPTES SYSTÈME SHARDÉS
+# ======================================================
+# Contrepartie des écritures "système" (récompenses, péages...).
+# Chaque (compte, devise) est réparti sur SYSTEM_ACCOUNT_SHARDS lignes ;
+# une écriture ne touche qu'une ligne, choisie par hash de `key`
+# (user_id, lot...) : N workers en parallèle se répartissent les verrous
+# au lieu d'attendre tous la même ligne. Le solde = somme des shards.
+
+SYSTEM_ACCOUNT_SHARDS = getattr(settings, "SYSTEM_ACCOUNT_SHARDS", 16)
+
+
+def shard_for(key=None, shards=SYSTEM_ACCOUNT_SHARDS):
+    """
+    Shard stable pour `key` (crc32, identique d'un process à l'autre) ;
+    aléatoire si aucune clé n'est fournie.
+    """
+    if key is None:
+        return random.randrange(shards)
+    return zlib.crc32(str(key).encode()) % shards
+
+
+class SystemAccountService:
+
+    @staticmethod
+    def post(account, currency, minor, key=None):
+        """
+        Ajoute `minor` (unités mineures, signé) au compte système :
+        un UPDATE sur un seul shard (+ INSERT à la première utilisation).
+        À appeler dans la transaction de l'écriture utilisateur.
+        """
+        if not minor:
+            return
+
+        currency = currency.lower()
+        # Tiré une seule fois : sans clé, deux appels donneraient deux shards
+        shard = shard_for(key)
+        rows = SystemAccountShard.objects.filter(account=account, currency=currency, shard=shard)
+        shift = {"amount_minor": F("amount_minor") + minor_value(minor), "updated_at": timezone.now()}
+
+        if not rows.update(**shift):
+            SystemAccountShard.objects.bulk_create(
+                [SystemAccountShard(account=account, currency=currency, shard=shard)],
+                ignore_conflicts=True,
+            )
+            if not rows.update(**shift):
+                # Pas ValueError : ce n'est pas un solde insuffisant côté appelant
+                raise RuntimeError(
+                    f"Compte système {account}/{currency} : shard {shard} introuvable"
+                )
+
+    @staticmethod
+    def post_deltas(account, deltas, key=None):
+        """
+        {devise: int signé} ; devises triées pour un ordre de verrouillage stable.
+        """
+        for currency in sorted(deltas):
+            SystemAccountService.post(account, currency, deltas[currency], key)
+
+    @staticmethod
+    def balance(account, currency):
+        """
+        Solde (Decimal) d'un compte système : somme de ses shards.
+        """
+        minor = (
+            SystemAccountBalance.objects
+            .filter(account=account, currency=currency.lower())
+            .values_list("amount_minor", flat=True)
+            .first()
+        )
+        return from_minor(minor or 0, currency)
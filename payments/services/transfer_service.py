@@ -0,0 +1,208 @@
+from collections import defaultdict
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from payments.models import BalanceCurrency, FundTransfer, Transaction
+from payments.services.ledger_service import LedgerService
+from payments.utils.minor_units import from_minor, to_minor
+
+
+class TransferService:
+    """
+    Moteur de transferts utilisateur ➜ utilisateur(s).
+
+    Toutes les lignes BalanceCurrency concernées sont verrouillées
+    en UNE requête (SELECT ... FOR UPDATE ORDER BY id) : deux transferts
+    A➜B et B➜A prennent les verrous dans le même ordre et ne peuvent
+    donc pas s'interbloquer.
+    """
+
+    # ==========================
+    # VERROUS
+    # ==========================
+    @staticmethod
+    def _lock_rows(user_ids, currency):
+        """
+        {user_id: BalanceCurrency} verrouillés dans l'ordre des clés primaires.
+        """
+        balance_ids = LedgerService.ensure_balances(set(user_ids))
+        users_by_balance = {bid: uid for uid, bid in balance_ids.items()}
+
+        BalanceCurrency.objects.bulk_create(
+            [BalanceCurrency(balance_id=bid, currency=currency) for bid in users_by_balance],
+            ignore_conflicts=True,
+        )
+
+        rows = (
+            BalanceCurrency.objects
+            .select_for_update()
+            .filter(balance_id__in=users_by_balance, currency=currency)
+            .order_by("pk")
+        )
+        return {users_by_balance[row.balance_id]: row for row in rows}
+
+    # ==========================
+    # TRANSFERT 1 ➜ N
+    # ==========================
+    @staticmethod
+    @transaction.atomic
+    def payout(
+        sender,
+        payouts,
+        currency,
+        *,
+        method=FundTransfer.CRYPTO,
+        description=None,
+        metadata=None,
+    ):
+        """
+        Transfère depuis `sender` vers plusieurs destinataires
+        en une seule opération atomique.
+
+        `payouts` : liste de (receiver, montant).
+        Lève ValueError si le solde de l'expéditeur est insuffisant.
+        Retourne la liste des FundTransfer créés.
+        """
+        currency = currency.lower()
+        lines = []
+
+        for receiver, amount in payouts:
+            minor = to_minor(amount, currency)
+            if minor <= 0:
+                raise ValidationError("Montant invalide")
+            if receiver.pk == sender.pk:
+                raise ValidationError("Transfert vers soi-même interdit")
+            lines.append((receiver, minor))
+
+        if not lines:
+            return []
+
+        rows = TransferService._lock_rows(
+            [sender.pk] + [r.pk for r, _ in lines], currency
+        )
+
+        total = sum(minor for _, minor in lines)
+        if rows[sender.pk].amount_minor < total:
+            raise ValueError("Solde insuffisant")
+
+        # 1️⃣ Soldes : un seul UPDATE agrégé sur des lignes déjà verrouillées
+        deltas = defaultdict(int)
+        deltas[rows[sender.pk].balance_id] -= total
+        for receiver, minor in lines:
+            deltas[rows[receiver.pk].balance_id] += minor
+
+        BalanceCurrency.objects.apply_deltas(currency, deltas)
+
+        # 2️⃣ Ledger (débit + crédit par ligne)
+        txs = []
+        for receiver, minor in lines:
+            amount = from_minor(minor, currency)
+            txs.append(Transaction(
+                user=sender,
+                amount=amount,
+                amount_minor=minor,
+                currency=currency,
+                transaction_type=Transaction.DEBIT,
+                bonus_type=Transaction.TRANSFER,
+                source=Transaction.USER,
+                status=Transaction.STATUS_COMPLETED,
+                metadata=metadata or {},
+                description=description or f"Transfert vers {receiver}",
+            ))
+            txs.append(Transaction(
+                user=receiver,
+                amount=amount,
+                amount_minor=minor,
+                currency=currency,
+                transaction_type=Transaction.CREDIT,
+                bonus_type=Transaction.TRANSFER,
+                source=Transaction.USER,
+                status=Transaction.STATUS_COMPLETED,
+                metadata=metadata or {},
+                description=description or f"Transfert reçu de {sender}",
+            ))
+
+        Transaction.objects.bulk_create(txs)
+
+        # 3️⃣ FundTransfer
+        transfers = FundTransfer.objects.bulk_create([
+            FundTransfer(
+                sender=sender,
+                receiver=receiver,
+                amount=from_minor(minor, currency),
+                currency=currency,
+                method=method,
+                status=FundTransfer.STATUS_COMPLETED,
+                sender_transaction=txs[2 * i],
+                receiver_transaction=txs[2 * i + 1],
+                description=description,
+            )
+            for i, (receiver, minor) in enumerate(lines)
+        ])
+
+        TransferService._notify(transfers)
+        return transfers
+
+    # ==========================
+    # PAIE DES EMPLOYÉS
+    # ==========================
+    @staticmethod
+    def pay_employees(business, amount, currency, *, description=None):
+        """
+        Paie tous les employés (liés à un compte) d'un BusinessProfile.
+
+        `amount` : montant unique, ou {employee_id: montant}.
+        """
+        from users.models import Employee
+
+        employees = (
+            Employee.objects
+            .filter(business=business, user__isnull=False)
+            .select_related("user")
+            .order_by("pk")
+        )
+
+        payouts = []
+        for employee in employees:
+            value = amount.get(employee.pk) if isinstance(amount, dict) else amount
+            if value:
+                payouts.append((employee.user, value))
+
+        return TransferService.payout(
+            business.user,
+            payouts,
+            currency,
+            description=description or f"Salè {business.business_name}",
+            metadata={"payroll": True, "business_id": business.pk},
+        )
+
+    # ==========================
+    # NOTIFICATIONS
+    # ==========================
+    @staticmethod
+    def _notify(transfers):
+        """
+        Notifications de transfert en un seul INSERT (au commit).
+        """
+        from notifications.models import Notification
+        from notifications.services.notification_buffer import notify_many
+
+        notifications = []
+        for t in transfers:
+            notifications.append(Notification(
+                user=t.sender,
+                title="Transfert envoyé",
+                message=f"Vous avez envoyé {t.amount} {t.currency} à {t.receiver.email}.",
+                notification_type=Notification.WARNING,
+                transaction=t.sender_transaction,
+            ))
+            notifications.append(Notification(
+                user=t.receiver,
+                title="Fonds reçus 🎉",
+                message=f"Vous avez reçu {t.amount} {t.currency} de {t.sender.email}.",
+                notification_type=Notification.SUCCESS,
+                transaction=t.receiver_transaction,
+            ))
+
+        notify_many(notifications)
@@ -2,11 +2,16 @@ import uuid
 import secrets
 from decimal import Decimal
 
+from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from django.db import transaction as db_transaction
+from django.db import router, transaction as db_transaction
 
-from payments.models import Wallet, Balance, Transaction, LEDGER_PRECISION
+from payments.models import Wallet, Balance, Transaction, PooledWalletAddress, LEDGER_PRECISION
 from payments.services.balance_service import BalanceService
+from payments.services.idempotency_service import IdempotencyService, fingerprint
+from payments.services.transfer_service import TransferService
+from payments.utils.wallet_cache import WALLET_CACHE_FIELDS, WALLET_CACHE_TTL, cache_key as wallet_cache_key
 
 
 # ============================================================
@@ -39,6 +44,63 @@ def generate_wallet_address(network: str) -> str:
     raise ValidationError(f"Réseau non supporté : {network}")
 
 
+# ============================================================
+# RÉSERVE D'ADRESSES PRÉ-GÉNÉRÉES
+# ============================================================
+
+WALLET_POOL_SIZE = getattr(settings, "WALLET_POOL_SIZE", 500)
+
+
+def fill_address_pool(network: str, target: int = WALLET_POOL_SIZE) -> int:
+    """
+    Complète la réserve d'un réseau jusqu'à `target` adresses libres.
+    Un seul INSERT groupé ; les doublons éventuels sont ignorés.
+    Retourne la variation du nombre d'adresses libres (recompté après
+    l'INSERT : avec ignore_conflicts, bulk_create renvoie aussi les
+    lignes écartées).
+    """
+    network = network.lower()
+    free = PooledWalletAddress.objects.filter(network=network)
+    before = free.count()
+    missing = target - before
+    if missing <= 0:
+        return 0
+
+    PooledWalletAddress.objects.bulk_create(
+        [
+            PooledWalletAddress(
+                network=network,
+                public_key=generate_wallet_uuid(),
+                address=generate_wallet_address(network),
+            )
+            for _ in range(missing)
+        ],
+        ignore_conflicts=True,
+    )
+    return free.count() - before
+
+
+def _claim_address(network: str):
+    """
+    (public_key, address) réclamée atomiquement dans la réserve :
+    SKIP LOCKED laisse les créations concurrentes prendre d'autres lignes.
+    Réserve vide ➜ génération immédiate (la tâche de fond la remplira).
+    """
+    pooled = (
+        PooledWalletAddress.objects
+        .select_for_update(skip_locked=True)
+        .filter(network=network)
+        .order_by("id")
+        .first()
+    )
+
+    if pooled is None:
+        return generate_wallet_uuid(), generate_wallet_address(network)
+
+    pooled.delete()
+    return pooled.public_key, pooled.address
+
+
 # ============================================================
 # CRÉATION DE WALLET
 # ============================================================
@@ -62,23 +124,53 @@ def create_wallet_for_user(user, network: str) -> Wallet:
     if existing_wallet:
         return existing_wallet
 
-    while True:
-        public_key = generate_wallet_uuid()
-        if not Wallet.objects.filter(public_key=public_key).exists():
-            break
+    public_key, address = _claim_address(network)
 
     wallet = Wallet.objects.create(
         user=user,
         balance=balance,
         network=network,
         public_key=public_key,
-        address=generate_wallet_address(network),
+        address=address,
         is_active=True,
     )
 
     return wallet
 
 
+def get_wallet_for_user(user, network: str) -> Wallet:
+    """
+    Wallet actif de l'utilisateur, lu depuis le cache (tableaux de bord).
+    Le créateur n'est appelé que si l'utilisateur n'en a pas encore.
+
+    Depuis le cache, seuls les champs publics (WALLET_CACHE_FIELDS) sont
+    chargés ; les autres (clé privée chiffrée...) sont lus en base au
+    premier accès, comme avec .only().
+    """
+    key = wallet_cache_key(user.pk, network)
+    cached = cache.get(key)
+
+    if cached is not None:
+        # from_db attend les valeurs dans l'ordre des champs du modèle
+        fields = [f.attname for f in Wallet._meta.concrete_fields if f.attname in cached]
+        return Wallet.from_db(
+            router.db_for_read(Wallet),
+            fields,
+            [cached[field] for field in fields],
+        )
+
+    wallet = (
+        Wallet.objects
+        .filter(user=user, network=network.lower(), is_active=True)
+        .first()
+    ) or create_wallet_for_user(user, network)
+
+    public = {field: getattr(wallet, field) for field in WALLET_CACHE_FIELDS}
+    db_transaction.on_commit(lambda: cache.set(key, public, WALLET_CACHE_TTL))
+
+    return wallet
+
+
 # ============================================================
 # CREDIT WALLET (via BALANCE)
 # ============================================================
@@ -169,7 +261,6 @@ def debit_wallet(
 # TRANSFERT UTILISATEUR ➜ UTILISATEUR
 # ============================================================
 
-@db_transaction.atomic
 def transfer_wallet(
     *,
     sender,
@@ -178,47 +269,36 @@ def transfer_wallet(
     currency: str,
     metadata=None,
     description=None,
+    idempotency_key=None,
 ):
     """
     Transfert atomique entre deux utilisateurs
-    (2 balances + 2 transactions)
+    (2 balances + 2 transactions), via TransferService :
+    verrous pris dans l'ordre des clés primaires.
+
+    Avec `idempotency_key`, un nouvel essai renvoie les transactions
+    d'origine sans refaire le transfert.
     """
 
     if sender == receiver:
         raise ValidationError("Transfert vers soi-même interdit")
 
-    currency = currency.lower()
-    amount = Decimal(str(amount)).quantize(LEDGER_PRECISION)
-
-    if amount <= 0:
-        raise ValidationError("Montant invalide")
-
-    # 1️⃣ Débit expéditeur
-    BalanceService.debit(sender, amount, currency)
-
-    sender_tx = Transaction.objects.create(
-        user=sender,
-        amount=amount,
-        currency=currency,
-        transaction_type=Transaction.DEBIT,
-        source=Transaction.USER,
-        status=Transaction.STATUS_COMPLETED,
-        metadata=metadata or {},
-        description=description or f"Transfert vers {receiver}",
-    )
-
-    # 2️⃣ Crédit destinataire
-    BalanceService.credit(receiver, amount, currency)
-
-    receiver_tx = Transaction.objects.create(
-        user=receiver,
-        amount=amount,
-        currency=currency,
-        transaction_type=Transaction.CREDIT,
-        source=Transaction.USER,
-        status=Transaction.STATUS_COMPLETED,
-        metadata=metadata or {},
-        description=description or f"Transfert reçu de {sender}",
+    def _transfer():
+        transfer, = TransferService.payout(
+            sender,
+            [(receiver, amount)],
+            currency,
+            metadata=metadata,
+            description=description,
+        )
+        return transfer.sender_transaction, transfer.receiver_transaction
+
+    sender_tx, receiver_tx = IdempotencyService.run(
+        sender,
+        "wallet_transfer",
+        idempotency_key,
+        fingerprint(getattr(receiver, "pk", receiver), amount, currency, metadata, description),
+        _transfer,
     )
 
-    return sender_tx, receiver_tx
\ No newline at end of file
+    return sender_tx, receiver_tx
@@ -0,0 +1,97 @@
+from celery import shared_task
+
+
+@shared_task
+def notify_reward_campaign_chunk(campaign_id, user_ids):
+    """
+    Une notification groupée par lot de campagne
+    (un INSERT au lieu d'un signal post_save par transaction).
+    """
+    from notifications.models import Notification
+    from notifications.services.notification_buffer import notify_many
+    from payments.models import RewardCampaign
+
+    campaign = RewardCampaign.objects.filter(pk=campaign_id).first()
+    if not campaign:
+        return 0
+
+    message = (
+        f"{campaign.reason} : {campaign.amount.normalize()} "
+        f"{campaign.currency.upper()} ajoute sou kont ou."
+    )
+
+    notify_many([
+        Notification(
+            user_id=uid,
+            title="🎁 Bonis",
+            message=message,
+            notification_type=Notification.BONUS,
+        )
+        for uid in user_ids
+    ])
+
+    return len(user_ids)
+
+
+@shared_task
+def refresh_ledger_rollups():
+    """
+    Rafraîchit les agrégats jour / mois du ledger depuis le point de reprise.
+    """
+    from payments.services.rollup_service import RollupService
+
+    return RollupService.refresh_all()
+
+
+@shared_task
+def purge_idempotency_keys():
+    """
+    Supprime les clés d'idempotence expirées.
+    """
+    from payments.services.idempotency_service import IdempotencyService
+
+    return IdempotencyService.purge_expired()
+
+
+@shared_task
+def drain_outbox():
+    """
+    Applique les effets en attente de l'outbox ; se relance tant
+    que des lots complets restent à traiter.
+    """
+    from payments.services.outbox_service import OUTBOX_BATCH_SIZE, OutboxService
+
+    processed = OutboxService.drain(OUTBOX_BATCH_SIZE)
+    if processed >= OUTBOX_BATCH_SIZE:
+        drain_outbox.delay()
+    return processed
+
+
+@shared_task
+def refill_wallet_address_pool():
+    """
+    Complète la réserve d'adresses de chaque réseau supporté.
+    """
+    from payments.services.wallet_service import SUPPORTED_NETWORKS, fill_address_pool
+
+    return {network: fill_address_pool(network) for network in SUPPORTED_NETWORKS}
+
+
+@shared_task
+def watch_chain_deposits(network=None):
+    """
+    Avance le curseur de bloc de chaque réseau surveillé ; se relance
+    pour un réseau tant qu'il reste un lot complet de retard.
+    """
+    from django.conf import settings
+
+    from payments.services.chain_watcher import ChainWatcher
+
+    credited = {}
+    for name in [network] if network else settings.CHAIN_WATCHERS:
+        watcher = ChainWatcher(name)
+        scanned, report = watcher.poll()
+        credited[name] = report.credited
+        if scanned >= watcher.max_blocks:
+            watch_chain_deposits.delay(name)
+    return credited
@@ -1,6 +1,8 @@
 from decimal import Decimal, InvalidOperation
 from django import template
 
+from payments.utils.formatting import format_balance
+
 register = template.Library()
 
 @register.filter
@@ -14,4 +16,14 @@ def crypto(value, precision=18):
 
         return f"{value:.{int(precision)}f}"
     except (InvalidOperation, ValueError, TypeError):
-        return "0"
\ No newline at end of file
+        return "0"
+
+@register.filter
+def minor_units(value, currency):
+    """
+    {{ bc.amount_minor|minor_units:bc.currency }}
+    """
+    try:
+        return format_balance(int(value or 0), currency=currency)
+    except (ValueError, TypeError):
+        return "0"
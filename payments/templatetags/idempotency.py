@@ -0,0 +1,19 @@
+import uuid
+
+from django import template
+from django.utils.html import format_html
+
+from payments.idempotency import IDEMPOTENCY_FIELD
+
+register = template.Library()
+
+
+@register.simple_tag
+def idempotency_field():
+    """
+    Champ caché Idempotency-Key : une nouvelle clé à chaque affichage
+    du formulaire, la même si le navigateur renvoie le POST.
+    """
+    return format_html(
+        '<input type="hidden" name="{}" value="{}">', IDEMPOTENCY_FIELD, uuid.uuid4().hex
+    )
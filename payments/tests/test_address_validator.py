@@ -0,0 +1,67 @@
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase
+
+from payments.utils.address_validator import (
+    keccak256,
+    keccak256_batch,
+    validate_address,
+    validate_addresses,
+)
+
+
+class KeccakTest(SimpleTestCase):
+
+    def test_known_digests_and_batch_matches_single(self):
+        self.assertEqual(
+            keccak256(b"").hex(),
+            "c5d2460186f7233c927e7db2dcc703c0e500b653ca82273b7bfad8045d85a470",
+        )
+        messages = [bytes([i]) * 40 for i in range(20)] + [b"x" * 300, b""]
+        self.assertEqual(keccak256_batch(messages), [keccak256(m) for m in messages])
+
+
+class AddressValidatorTest(SimpleTestCase):
+
+    def test_eip55(self):
+        # Vecteurs de la spécification EIP-55
+        valid = [
+            "0x5aAeb6053F3E94C9b9A09f33669435E7Ef1BeAed",
+            "0xfB6916095ca1df60bB79Ce92cE3Ea74c37c5d359",
+            "0xdbF03B407c01E7cD3CBea99509d93f8DDDC8C6FB",
+            "0xD1220A0cf47c7B9Be7A2E6BA89F429762e7b9aDb",
+        ]
+        results = validate_addresses(valid + [v.lower() for v in valid], "eth")
+
+        self.assertTrue(all(r.valid for r in results))
+        self.assertEqual([r.normalized for r in results], valid * 2)
+
+        bad = validate_addresses(["0x5aaeb6053F3E94C9b9A09f33669435E7Ef1BeAed", "0x12"], "bsc")
+        self.assertEqual([r.valid for r in bad], [False, False])
+        self.assertIn("EIP-55", bad[0].error)
+
+    def test_bitcoin_and_tron(self):
+        btc = validate_addresses([
+            "1BvBMSEYstWetqTFn5Au4m4GFg7xJaNVN2",
+            "3J98t1WpEZ73CNmQviecrnyiWrnqRhWNLy",
+            "BC1QW508D6QEJXTDG4Y5R3ZARVARY0C5XW7KV8F3T4",
+            "bc1p0xlxvlhemja6c4dqv22uapctqupfhlxm9h8z3k2e72q4k9hcz7vqzk5jj0",
+            "1BvBMSEYstWetqTFn5Au4m4GFg7xJaNVN3",
+            "bc1qw508d6qejxtdg4y5r3zarvary0c5xw7kv8f3t5",
+        ], "btc")
+        self.assertEqual([r.valid for r in btc], [True, True, True, True, False, False])
+        self.assertEqual(btc[2].normalized, "bc1qw508d6qejxtdg4y5r3zarvary0c5xw7kv8f3t4")
+
+        self.assertEqual(validate_address("TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t", "tron"), "TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t")
+        with self.assertRaises(ValidationError):
+            validate_address("TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6u", "TRON")
+
+    def test_batch_keeps_order_and_duplicates(self):
+        addresses = ["", " 0x5aaeb6053f3e94c9b9a09f33669435e7ef1beaed ", "bad", None] * 3
+        results = validate_addresses(addresses, "polygon")
+
+        self.assertEqual(len(results), len(addresses))
+        self.assertEqual([r.valid for r in results[:4]], [False, True, False, False])
+        self.assertEqual(results[1], results[5])
+
+        with self.assertRaises(ValidationError):
+            validate_addresses(["x"], "doge")
@@ -0,0 +1,90 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.utils import get_user_balances
+from payments.services.balance_service import BalanceService
+from payments.services.transfer_service import TransferService
+from payments.utils.balance_cache import get_cached_totals
+
+User = get_user_model()
+
+
+class BalanceCacheTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.alice = User.objects.create_user(
+            email="alice@test.com", password="test1234", phone="+50935000001"
+        )
+        self.bob = User.objects.create_user(
+            email="bob@test.com", password="test1234", phone="+50935000002"
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            BalanceService.credit(self.alice, "10.50", "htg")
+
+    def test_warm_cache_skips_aggregate(self):
+        get_user_balances(self.alice)
+
+        with self.assertNumQueries(0):
+            balances = get_user_balances(self.alice)
+
+        self.assertEqual(balances["solde_htg"], "10.5")
+        # + le bonus d'inscription en JMU
+        self.assertTrue(balances["solde_total_htg"].startswith("10.5"))
+
+    def test_mutations_invalidate_on_commit(self):
+        get_cached_totals(self.alice.pk)
+        get_cached_totals(self.bob.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            TransferService.payout(self.alice, [(self.bob, "2.50")], "htg")
+
+        self.assertEqual(get_cached_totals(self.alice.pk)["htg"], 800)
+        self.assertEqual(get_cached_totals(self.bob.pk)["htg"], 250)
+
+    def test_rollback_keeps_cached_value(self):
+        get_cached_totals(self.alice.pk)
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(ValueError):
+                BalanceService.debit(self.alice, 50, "htg")
+
+        self.assertEqual(callbacks, [])
+        self.assertEqual(get_cached_totals(self.alice.pk)["htg"], 1050)
+
+    def test_balance_api_keeps_shape_and_adds_total(self):
+        client = APIClient()
+        client.force_authenticate(self.alice)
+
+        response = client.get("/api/payments/balance/", secure=True)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data), {"currencies", "created_at", "total_htg"})
+        htg = next(c for c in response.data["currencies"] if c["currency"] == "htg")
+        self.assertEqual(htg["amount"], "10.50")
+        self.assertEqual(htg["amount_minor"], 1050)
+        self.assertIn("updated_at", htg)
+        self.assertAlmostEqual(
+            Decimal(response.data["total_htg"]), Decimal("10.50"), delta=Decimal("1e-12")
+        )
+
+    def test_balance_summary_reads_cache(self):
+        client = APIClient()
+        client.force_authenticate(self.alice)
+        get_cached_totals(self.alice.pk)
+
+        with self.assertNumQueries(0):
+            response = client.get("/api/payments/balance/summary/", secure=True)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            {"currency": "htg", "amount": "10.50", "amount_minor": 1050, "scale": 2},
+            response.data["currencies"],
+        )
+        self.assertAlmostEqual(
+            Decimal(response.data["total_htg"]), Decimal("10.50"), delta=Decimal("1e-12")
+        )
@@ -0,0 +1,107 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from unittest import skipIf
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+from payments.models import Balance, BalanceCurrency
+from payments.services.balance_service import BalanceService
+
+User = get_user_model()
+
+WRITERS = 60
+
+
+# =====================================================
+# MUTATIONS ATOMIQUES
+# =====================================================
+class AtomicBalanceMutationTest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="atomic@test.com", password="test1234", phone="+50930000001"
+        )
+        self.balance, _ = Balance.objects.get_or_create(user=self.user)
+
+    def test_credit_returns_new_amount(self):
+        self.assertEqual(self.balance.credit(100, "HTG"), Decimal("100"))
+        self.assertEqual(self.balance.credit(50, "htg"), Decimal("150"))
+
+    def test_debit_returns_new_amount(self):
+        self.balance.credit(100, "htg")
+        self.assertEqual(self.balance.debit(40, "htg"), Decimal("60"))
+
+    def test_conditional_debit_leaves_balance_untouched(self):
+        self.balance.credit(10, "htg")
+
+        with self.assertRaises(ValueError):
+            self.balance.debit(11, "htg")
+
+        bc = BalanceCurrency.objects.get(balance=self.balance, currency="htg")
+        self.assertEqual(bc.amount, Decimal("10"))
+
+    def test_debit_unknown_currency_is_insufficient(self):
+        with self.assertRaises(ValueError):
+            self.balance.debit(1, "usd")
+
+
+# =====================================================
+# STRESS TEST CONCURRENCE (PostgreSQL / MySQL)
+# =====================================================
+@skipIf(
+    connection.vendor == "sqlite",
+    "SQLite verrouille la base entière : pas d'écrivains réellement parallèles",
+)
+class ConcurrentBalanceMutationTest(TransactionTestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="stress@test.com", password="test1234", phone="+50930000002"
+        )
+        BalanceService.get_or_create_balance(self.user)
+
+    def _run_parallel(self, fn):
+        barrier = threading.Barrier(WRITERS)
+        errors = []
+
+        def worker():
+            try:
+                barrier.wait()
+                fn()
+            except ValueError as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=WRITERS) as pool:
+            for _ in range(WRITERS):
+                pool.submit(worker)
+
+        return errors
+
+    def _amount(self):
+        return BalanceCurrency.objects.get(
+            balance__user=self.user, currency="htg"
+        ).amount
+
+    def test_no_lost_updates_on_parallel_credits(self):
+        errors = self._run_parallel(
+            lambda: BalanceService.credit(self.user, 1, "htg")
+        )
+
+        self.assertEqual(errors, [])
+        self.assertEqual(self._amount(), Decimal(WRITERS))
+
+    def test_parallel_debits_never_overdraw(self):
+        funded = WRITERS - 10
+        BalanceService.credit(self.user, funded, "htg")
+
+        errors = self._run_parallel(
+            lambda: BalanceService.debit(self.user, 1, "htg")
+        )
+
+        self.assertEqual(len(errors), WRITERS - funded)
+        self.assertEqual(self._amount(), Decimal("0"))
@@ -0,0 +1,170 @@
+import json
+import threading
+from unittest import mock
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from payments.models import JobCheckpoint, Recharge
+from payments.services import chain_watcher
+from payments.services.chain_watcher import TRANSFER_TOPIC, ChainWatcher
+from payments.services.wallet_service import create_wallet_for_user
+
+User = get_user_model()
+
+TOKEN = "0x55d398326f99059ff775485246999027b3197955"
+
+
+class StubNode:
+    """
+    Nœud JSON-RPC minimal : eth_blockNumber et eth_getLogs sur des logs en mémoire.
+    """
+
+    def __init__(self):
+        self.head = 0
+        self.logs = []
+        self.requests = []
+        node = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                node.requests.append(body)
+                reply = [node.answer(c) for c in body] if isinstance(body, list) else node.answer(body)
+                data = json.dumps(reply).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def answer(self, call):
+        if call["method"] == "eth_blockNumber":
+            result = hex(self.head)
+        else:
+            f = call["params"][0]
+            lo, hi = int(f["fromBlock"], 16), int(f["toBlock"], 16)
+            result = [log for log in self.logs if lo <= int(log["blockNumber"], 16) <= hi]
+        return {"jsonrpc": "2.0", "id": call["id"], "result": result}
+
+    def transfer(self, block, to, amount, index=0):
+        self.logs.append({
+            "address": TOKEN,
+            "blockNumber": hex(block),
+            "transactionHash": f"0x{block:064x}",
+            "logIndex": hex(index),
+            "topics": [TRANSFER_TOPIC, "0x" + "0" * 64, "0x" + "0" * 24 + to[2:]],
+            "data": hex(amount),
+            "removed": False,
+        })
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class ChainWatcherTest(TestCase):
+
+    def setUp(self):
+        chain_watcher._ADDRESS_SETS.clear()
+        self.node = StubNode()
+        self.addCleanup(self.node.close)
+
+        self.user = User.objects.create_user(
+            email="chain@test.com", password="test1234", phone="+50934400001"
+        )
+        self.wallet = create_wallet_for_user(self.user, "bsc")
+        self.watcher = ChainWatcher("bsc", config={
+            "rpc_url": self.node.url,
+            "confirmations": 2,
+            "blocks_per_call": 10,
+            "calls_per_batch": 5,
+            "tokens": {TOKEN: ("usd", 18)},
+        })
+
+    def test_cursor_and_batched_logs(self):
+        self.node.head = 100
+        self.assertEqual(self.watcher.poll()[0], 0)
+        self.assertEqual(JobCheckpoint.objects.get(name="chain_watcher:bsc").last_position, 98)
+
+        self.node.head = 200
+        self.node.transfer(105, self.wallet.address, 5 * 10**18)
+        self.node.transfer(120, "0x" + "ab" * 20, 10**18)  # pa adrès nou
+        self.node.transfer(160, self.wallet.address, 10**18)  # apre lo a
+        self.node.requests.clear()
+
+        scanned, report = self.watcher.poll()
+
+        # 1 eth_blockNumber + 1 requête groupée de 5 eth_getLogs
+        self.assertEqual(scanned, 50)
+        self.assertEqual(len(self.node.requests), 2)
+        self.assertEqual(len(self.node.requests[1]), 5)
+        self.assertEqual(report.credited, 1)
+        recharge = Recharge.objects.get(user=self.user)
+        self.assertEqual(recharge.amount, Decimal("5"))
+        self.assertEqual(recharge.currency, "usd")
+        self.assertIsNotNone(recharge.transaction_id)
+
+        self.assertEqual(self.watcher.poll()[1].credited, 1)
+        self.assertEqual(self.watcher.poll()[0], 0)
+        self.assertEqual(JobCheckpoint.objects.get(name="chain_watcher:bsc").last_position, 198)
+        self.assertEqual(Recharge.objects.filter(user=self.user).count(), 2)
+
+        # Rejouer un intervalle ne crédite pas deux fois
+        JobCheckpoint.objects.filter(name="chain_watcher:bsc").update(last_position=98)
+        self.assertEqual(self.watcher.poll()[1].credited, 0)
+
+    def test_new_wallets_are_picked_up(self):
+        self.node.head = 10
+        self.watcher.poll()
+
+        other = User.objects.create_user(
+            email="chain2@test.com", password="test1234", phone="+50934400002"
+        )
+        wallet = create_wallet_for_user(other, "bsc")
+        self.node.head = 20
+        self.node.transfer(12, wallet.address, 2 * 10**18)
+
+        self.assertEqual(self.watcher.poll()[1].credited, 1)
+        self.assertTrue(Recharge.objects.filter(user=other).exists())
+
+    def test_moved_cursor_discards_fetched_logs(self):
+        self.node.head = 10
+        self.watcher.poll()
+        self.node.head = 20
+        self.node.transfer(12, self.wallet.address, 2 * 10**18)
+
+        fetch_logs = self.watcher._fetch_logs
+
+        def fetch_then_other_worker_advances(start, end):
+            logs = fetch_logs(start, end)
+            JobCheckpoint.objects.filter(name="chain_watcher:bsc").update(last_position=end)
+            return logs
+
+        self.watcher._fetch_logs = fetch_then_other_worker_advances
+
+        self.assertEqual(self.watcher.poll(), (0, mock.ANY))
+        self.assertFalse(Recharge.objects.filter(user=self.user).exists())
+
+    def test_dust_transfer_does_not_block_the_cursor(self):
+        self.node.head = 10
+        self.watcher.poll()
+        self.node.head = 20
+        self.node.transfer(12, self.wallet.address, 10**15)  # 0.001 usd : poussière
+        self.node.transfer(13, self.wallet.address, 3 * 10**18 + 123 * 10**13)  # 3.00123
+
+        scanned, report = self.watcher.poll()
+
+        self.assertEqual(scanned, 10)
+        self.assertEqual(report.credited, 1)
+        self.assertEqual(Recharge.objects.get(user=self.user).amount, Decimal("3.00"))
+        self.assertEqual(JobCheckpoint.objects.get(name="chain_watcher:bsc").last_position, 18)
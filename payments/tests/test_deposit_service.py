@@ -0,0 +1,104 @@
+import io
+import json
+import os
+import tempfile
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from notifications.services.notification_buffer import flush_notifications
+from payments.models import BalanceCurrency, Recharge, Transaction
+from payments.services.deposit_service import (
+    REJECT_DUPLICATE,
+    REJECT_INVALID,
+    REJECT_UNMATCHED,
+    DepositMatcher,
+    iter_deposit_feed,
+)
+from payments.services.wallet_service import create_wallet_for_user
+
+User = get_user_model()
+
+
+class DepositMatcherTest(TestCase):
+
+    def setUp(self):
+        self.alice = User.objects.create_user(
+            email="dep-a@test.com", password="test1234", phone="+50934400001"
+        )
+        self.bob = User.objects.create_user(
+            email="dep-b@test.com", password="test1234", phone="+50934400002"
+        )
+        self.alice_eth = create_wallet_for_user(self.alice, "eth").address
+        self.bob_btc = create_wallet_for_user(self.bob, "btc").address
+        # Notifications d'inscription : hors du lot mesuré
+        flush_notifications()
+
+    def _htg(self, user):
+        return BalanceCurrency.objects.get(balance__user=user, currency="htg").amount
+
+    def test_jsonl_feed_is_matched_and_credited_once(self):
+        lines = [
+            {"reference": "tx-1", "address": self.alice_eth.upper().replace("0X", "0x"), "amount": "100", "currency": "HTG"},
+            {"reference": "tx-2", "address": self.bob_btc, "amount": "25.50", "currency": "htg", "method": "mobile"},
+            {"reference": "tx-2", "address": self.bob_btc, "amount": "25.50", "currency": "htg"},
+            {"reference": "tx-3", "address": "0xunknown", "amount": "5", "currency": "htg"},
+            {"reference": "tx-4", "address": self.bob_btc, "amount": "-1", "currency": "htg"},
+        ]
+        feed = io.StringIO("\n".join(json.dumps(l) for l in lines) + "\nnot json\n")
+
+        # Notifications insérées au commit (tampon), comptées dans le lot :
+        # un INSERT, la mise à jour des compteurs de non lues, puis une
+        # lecture des compteurs pour le push
+        with self.assertNumQueries(20), self.captureOnCommitCallbacks(execute=True):
+            report = DepositMatcher.ingest(iter_deposit_feed(feed), provider="moncash")
+
+        self.assertEqual(report.credited, 2)
+        self.assertEqual(report.count(REJECT_DUPLICATE), 1)
+        self.assertEqual(report.count(REJECT_UNMATCHED), 1)
+        self.assertEqual(report.count(REJECT_INVALID), 2)
+
+        self.assertEqual(self._htg(self.alice), Decimal("100"))
+        self.assertEqual(self._htg(self.bob), Decimal("25.50"))
+
+        recharge = Recharge.objects.get(reference="tx-2")
+        self.assertEqual(recharge.status, Recharge.STATUS_SUCCESS)
+        self.assertEqual(recharge.method, Recharge.MOBILE)
+        self.assertEqual(recharge.transaction.bonus_type, Transaction.RECHARGE)
+
+        # Le même fichier rejoué ne crédite rien
+        feed.seek(0)
+        report = DepositMatcher.ingest(iter_deposit_feed(feed))
+        self.assertEqual(report.credited, 0)
+        self.assertEqual(self._htg(self.alice), Decimal("100"))
+
+    def test_csv_command(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as f:
+            f.write("reference,address,amount,currency\n")
+            f.write(f"bank-1,{self.bob_btc},10,usd\n")
+            path = f.name
+        self.addCleanup(os.remove, path)
+
+        out = io.StringIO()
+        call_command("ingest_deposits", path, "--provider", "bank", "--batch-size", "1", stdout=out)
+
+        self.assertIn("1 dépôts crédités", out.getvalue())
+        self.assertEqual(Recharge.objects.get(reference="bank-1").provider, "bank")
+
+    def test_dust_and_inexact_amounts_are_rejected_per_row(self):
+        rows = [
+            {"reference": "ok", "address": self.bob_btc, "amount": "5", "currency": "usd"},
+            {"reference": "dust", "address": self.bob_btc, "amount": "0.004", "currency": "usd"},
+            {"reference": "inexact", "address": self.bob_btc, "amount": "1.005", "currency": "usd"},
+        ]
+
+        report = DepositMatcher.ingest(rows, provider="bank")
+
+        self.assertEqual(report.credited, 1)
+        self.assertEqual(report.count(REJECT_INVALID), 2)
+        self.assertEqual(list(Recharge.objects.values_list("reference", flat=True)), ["ok"])
+        self.assertEqual(
+            BalanceCurrency.objects.get(balance__user=self.bob, currency="usd").amount, Decimal("5")
+        )
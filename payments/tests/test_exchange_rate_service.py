@@ -0,0 +1,76 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from payments.models import ExchangeRate
+from payments.services.exchange_rate_service import ExchangeRateService
+
+
+class ExchangeRateServiceTest(TestCase):
+
+    def setUp(self):
+        ExchangeRateService.clear_cache()
+
+    def tearDown(self):
+        ExchangeRateService.clear_cache()
+
+    def test_seeded_rates_and_local_cache(self):
+        rates = ExchangeRateService.get_rates()
+
+        self.assertEqual(rates["usd"], Decimal("132.50"))
+        self.assertEqual(rates["htg"], Decimal("1"))
+
+        with self.assertNumQueries(0):
+            ExchangeRateService.get_rates()
+
+    def test_publish_creates_new_version(self):
+        ExchangeRateService.get_rates()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            obj = ExchangeRateService.publish("USD", "140")
+
+        self.assertEqual(obj.version, 2)
+        self.assertEqual(ExchangeRate.objects.filter(currency="usd").count(), 2)
+        self.assertEqual(ExchangeRateService.get_rates()["usd"], Decimal("140"))
+
+    def test_convert_many(self):
+        converted = ExchangeRateService.convert_many(
+            {"htg": Decimal("265"), "usd": Decimal("1"), "xyz": Decimal("9")}, "usd"
+        )
+
+        self.assertEqual(converted, {"htg": Decimal("2"), "usd": Decimal("1")})
+        self.assertEqual(
+            ExchangeRateService.total({"usd": 2, "jmu": 1000}, "htg"),
+            Decimal("266"),
+        )
+
+    def test_total_portfolios(self):
+        totals = ExchangeRateService.total_portfolios({
+            1: {"usd": Decimal("1")},
+            2: {"htg": Decimal("10"), "jmu": Decimal("5000")},
+            3: {},
+        })
+
+        self.assertEqual(totals, {1: Decimal("132.50"), 2: Decimal("15"), 3: Decimal("0")})
+
+    def test_load_exchange_rates_command(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump({"USD": "150", "btc": "9000000"}, f)
+
+        try:
+            with self.captureOnCommitCallbacks(execute=True):
+                call_command("load_exchange_rates", f.name, stdout=StringIO())
+        finally:
+            os.unlink(f.name)
+
+        rates = ExchangeRateService.get_rates()
+        self.assertEqual(rates["usd"], Decimal("150"))
+        self.assertEqual(
+            ExchangeRate.objects.get(currency="btc", version=2).source,
+            ExchangeRate.SOURCE_FILE,
+        )
@@ -0,0 +1,98 @@
+import csv
+import io
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.http import StreamingHttpResponse
+from django.test import TestCase
+from django.utils import timezone
+
+from payments.models import Transaction
+from payments.services.export_service import EXPORT_FIELDS, filter_transactions, iter_export
+
+User = get_user_model()
+
+
+class TransactionExportTest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="export@test.com", password="test1234", phone="+50937000001"
+        )
+        self.other = User.objects.create_user(
+            email="other@test.com", password="test1234", phone="+50937000002"
+        )
+        Transaction.objects.all().delete()
+
+        Transaction.objects.create(user=self.user, amount=Decimal("12.50"), currency="htg")
+        Transaction.objects.create(
+            user=self.user, amount=Decimal("3"), currency="usd",
+            transaction_type=Transaction.DEBIT,
+        )
+        old = Transaction.objects.create(user=self.user, amount=Decimal("1"), currency="htg")
+        Transaction.objects.filter(pk=old.pk).update(
+            created_at=timezone.now() - timedelta(days=10)
+        )
+        Transaction.objects.create(user=self.other, amount=Decimal("99"), currency="htg")
+
+    def _csv(self, queryset):
+        return list(csv.reader(io.StringIO("".join(iter_export(queryset, "csv")))))
+
+    def test_csv_rows_and_filters(self):
+        rows = self._csv(filter_transactions(Transaction.objects.filter(user=self.user)))
+        self.assertEqual(rows[0], list(EXPORT_FIELDS))
+        self.assertEqual(len(rows), 4)
+
+        qs = filter_transactions(
+            Transaction.objects.filter(user=self.user),
+            start=date.today() - timedelta(days=1),
+            currency="HTG",
+        )
+        rows = self._csv(qs)
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1][EXPORT_FIELDS.index("amount")], "12.50")
+
+        qs = filter_transactions(transaction_type=Transaction.DEBIT)
+        self.assertEqual(len(self._csv(qs)), 2)
+
+    def test_jsonl(self):
+        lines = list(iter_export(Transaction.objects.filter(user=self.other), "jsonl"))
+
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])["amount"], "99.00")
+
+    def test_streaming_endpoint_is_scoped_to_user(self):
+        self.client.force_login(self.user)
+
+        response = self.client.get(
+            "/payments/transactions/export/?format=jsonl&currency=htg", secure=True
+        )
+
+        self.assertIsInstance(response, StreamingHttpResponse)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(all(json.loads(l)["user_id"] == self.user.pk for l in lines))
+
+        # user=all est réservé au staff : en-tête + les 3 lignes de l'utilisateur
+        response = self.client.get("/payments/transactions/export/?user=all", secure=True)
+        self.assertEqual(len(b"".join(response.streaming_content).splitlines()), 4)
+
+        response = self.client.get("/payments/transactions/export/?start=hier", secure=True)
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get("/payments/transactions/export/?start=2024-02-30", secure=True)
+        self.assertEqual(response.status_code, 400)
+
+    def test_management_command(self):
+        out = io.StringIO()
+        call_command("export_transactions", "--user", "other@test.com", stdout=out)
+
+        rows = list(csv.reader(io.StringIO(out.getvalue())))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1][EXPORT_FIELDS.index("user_id")], str(self.other.pk))
+
+    def test_management_command_rejects_impossible_date(self):
+        with self.assertRaisesMessage(CommandError, "--start"):
+            call_command("export_transactions", "--start", "2024-02-30", stdout=io.StringIO())
@@ -0,0 +1,129 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from payments.idempotency import REPLAYED_HEADER
+from payments.models import BalanceCurrency, FundTransfer, IdempotencyKey, Recharge
+from payments.services.balance_service import BalanceService
+from payments.services.idempotency_service import IdempotencyConflict, IdempotencyService
+from payments.services.wallet_service import transfer_wallet
+
+User = get_user_model()
+
+
+class IdempotencyServiceTest(TestCase):
+
+    def setUp(self):
+        self.alice = User.objects.create_user(
+            email="idem-a@test.com", password="test1234", phone="+50934100001"
+        )
+        self.bob = User.objects.create_user(
+            email="idem-b@test.com", password="test1234", phone="+50934100002"
+        )
+        BalanceService.credit(self.alice, 100, "htg")
+
+    def test_transfer_wallet_runs_once_per_key(self):
+        first = transfer_wallet(
+            sender=self.alice, receiver=self.bob, amount=30, currency="htg",
+            idempotency_key="k-1",
+        )
+        with self.assertNumQueries(3):
+            replay = transfer_wallet(
+                sender=self.alice, receiver=self.bob, amount=30, currency="htg",
+                idempotency_key="k-1",
+            )
+
+        self.assertEqual([t.pk for t in first], [t.pk for t in replay])
+        self.assertEqual(FundTransfer.objects.filter(sender=self.alice).count(), 1)
+        self.assertEqual(
+            BalanceCurrency.objects.get(balance__user=self.alice, currency="htg").amount,
+            Decimal("70"),
+        )
+
+        with self.assertRaises(IdempotencyConflict) as ctx:
+            transfer_wallet(
+                sender=self.alice, receiver=self.bob, amount=31, currency="htg",
+                idempotency_key="k-1",
+            )
+        self.assertEqual(ctx.exception.status_code, 422)
+
+    def test_failed_call_releases_key_and_expired_key_is_reusable(self):
+        def boom():
+            raise ValueError("Solde insuffisant")
+
+        with self.assertRaises(ValueError):
+            IdempotencyService.run(self.alice, "test", "k-2", "fp", boom)
+        self.assertFalse(IdempotencyKey.objects.filter(key="k-2").exists())
+
+        kwargs = dict(
+            sender=self.alice, receiver=self.bob, amount=5, currency="htg",
+            idempotency_key="k-3",
+        )
+        first, _ = transfer_wallet(**kwargs)
+        IdempotencyKey.objects.filter(key="k-3").update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        again, _ = transfer_wallet(**kwargs)
+        self.assertNotEqual(first.pk, again.pk)
+        self.assertEqual(IdempotencyService.purge_expired(), 0)
+
+
+class IdempotentEndpointsTest(TestCase):
+
+    def setUp(self):
+        self.alice = User.objects.create_user(
+            email="idem-c@test.com", password="test1234", phone="+50934100003"
+        )
+        self.bob = User.objects.create_user(
+            email="idem-d@test.com", password="test1234", phone="+50934100004"
+        )
+        BalanceService.credit(self.alice, 100, "htg")
+
+    def test_fund_transfer_form_retry(self):
+        self.client.force_login(self.alice)
+        response = self.client.get("/payments/transfer/new/", secure=True)
+        self.assertContains(response, 'name="idempotency_key"')
+
+        data = {
+            "receiver": self.bob.pk,
+            "amount": "10",
+            "currency": "htg",
+            "method": FundTransfer.MOBILE,
+            "idempotency_key": "form-1",
+        }
+        first = self.client.post("/payments/transfer/new/", data, secure=True)
+        second = self.client.post("/payments/transfer/new/", data, secure=True)
+
+        self.assertEqual(first.status_code, 302)
+        self.assertEqual(second.status_code, 302)
+        self.assertEqual(second["Location"], first["Location"])
+        self.assertEqual(second[REPLAYED_HEADER], "true")
+        self.assertEqual(FundTransfer.objects.filter(sender=self.alice).count(), 1)
+
+    def test_recharge_api_retry(self):
+        client = APIClient()
+        client.force_authenticate(self.alice)
+        payload = {"amount": "25", "currency": "htg", "provider": "moncash", "reference": "R-1"}
+
+        first = client.post(
+            "/api/payments/recharges/", payload, format="json", secure=True,
+            HTTP_IDEMPOTENCY_KEY="api-1",
+        )
+        second = client.post(
+            "/api/payments/recharges/", payload, format="json", secure=True,
+            HTTP_IDEMPOTENCY_KEY="api-1",
+        )
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second.data["id"], first.data["id"])
+        self.assertEqual(Recharge.objects.filter(user=self.alice).count(), 1)
+
+        other = client.post(
+            "/api/payments/recharges/", {**payload, "amount": "30"}, format="json",
+            secure=True, HTTP_IDEMPOTENCY_KEY="api-1",
+        )
+        self.assertEqual(other.status_code, 422)
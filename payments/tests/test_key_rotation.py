@@ -0,0 +1,58 @@
+from unittest import mock
+
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from payments import crypto_utils
+from payments.models import JobCheckpoint, Wallet
+from payments.services.key_rotation_service import KeyRotationService
+from payments.services.wallet_service import create_wallet_for_user
+
+User = get_user_model()
+
+
+class KeyRotationTest(TestCase):
+
+    def setUp(self):
+        self.old = Fernet(Fernet.generate_key())
+        self.new = Fernet(crypto_utils.FERNET_KEY.encode())
+        patcher = mock.patch.object(crypto_utils, "fernet", MultiFernet([self.new, self.old]))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        for i in range(5):
+            user = User.objects.create_user(
+                email=f"rot{i}@test.com", password="test1234", phone=f"+5093460000{i}"
+            )
+            wallet = create_wallet_for_user(user, "eth")
+            wallet.encrypted_private_key = self.old.encrypt(f"priv-{i}".encode()).decode()
+            wallet.save()
+
+    def _assert_rotated(self):
+        for token in Wallet.objects.values_list("encrypted_private_key", flat=True):
+            self.assertTrue(self.new.decrypt(token.encode()).startswith(b"priv-"))
+
+    def test_rotation_resumes_from_checkpoint(self):
+        def crash(total):
+            raise RuntimeError("worker tué")
+
+        with self.assertRaises(RuntimeError):
+            KeyRotationService.rotate_wallets(chunk_size=2, progress=crash)
+
+        checkpoint = JobCheckpoint.objects.get(name=KeyRotationService.checkpoint_name())
+        self.assertEqual(checkpoint.last_position, 2)
+
+        rotated = set(Wallet.objects.filter(pk__lte=checkpoint.last_key).values_list("pk", flat=True))
+        for wallet in Wallet.objects.exclude(pk__in=rotated):
+            with self.assertRaises(InvalidToken):
+                self.new.decrypt(wallet.encrypted_private_key.encode())
+
+        self.assertEqual(KeyRotationService.rotate_wallets(chunk_size=2), 3)
+        self.assertEqual(KeyRotationService.rotate_wallets(chunk_size=2), 0)
+        self._assert_rotated()
+
+    def test_process_pool(self):
+        self.assertEqual(KeyRotationService.rotate_wallets(chunk_size=4, workers=2), 5)
+        self._assert_rotated()
+        self.assertEqual(KeyRotationService.rotate_wallets(restart=True), 5)
@@ -0,0 +1,102 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.pagination import encode_cursor, keyset_paginate
+from payments.models import Transaction
+
+User = get_user_model()
+
+
+class KeysetPaginationTest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="keyset@test.com", password="test1234", phone="+50936000001"
+        )
+        Transaction.objects.filter(user=self.user).delete()
+
+        Transaction.objects.bulk_create([
+            Transaction(user=self.user, amount=i + 1, currency="htg")
+            for i in range(25)
+        ])
+
+        # 10 lignes avec le même horodatage : le départage se fait sur l'id
+        now = timezone.now()
+        qs = Transaction.objects.filter(user=self.user).order_by("amount")
+        ids = list(qs.values_list("id", flat=True))
+        Transaction.objects.filter(id__in=ids[:10]).update(created_at=now)
+        for i, pk in enumerate(ids[10:]):
+            Transaction.objects.filter(id=pk).update(created_at=now - timedelta(seconds=i + 1))
+
+        self.qs = Transaction.objects.filter(user=self.user)
+
+    def test_walks_every_row_once_without_count(self):
+        seen, cursor = [], None
+
+        while True:
+            with self.assertNumQueries(1):
+                page = keyset_paginate(self.qs, cursor, page_size=7)
+            seen += [t.pk for t in page]
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+
+        self.assertEqual(len(seen), 25)
+        self.assertEqual(set(seen), set(self.qs.values_list("pk", flat=True)))
+
+    def test_invalid_cursor_returns_first_page(self):
+        first = keyset_paginate(self.qs, None, page_size=5)
+        garbage = keyset_paginate(self.qs, "n0t-a-cursor", page_size=5)
+
+        self.assertEqual([t.pk for t in first], [t.pk for t in garbage])
+
+    def test_tampered_pk_returns_first_page(self):
+        first = keyset_paginate(self.qs, None, page_size=5)
+        cursor = encode_cursor(timezone.now(), "not-a-pk")
+
+        page = keyset_paginate(self.qs, cursor, page_size=5)
+        self.assertEqual([t.pk for t in page], [t.pk for t in first])
+
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.get(f"/api/payments/transactions/?cursor={cursor}", secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 20)
+
+    def test_load_more_partial(self):
+        self.client.force_login(self.user)
+
+        response = self.client.get("/payments/transactions/", secure=True)
+        self.assertContains(response, "Chaje plis")
+
+        cursor = response.context["page"].next_cursor
+        response = self.client.get(
+            f"/payments/transactions/?cursor={cursor}", secure=True, HTTP_HX_REQUEST="true"
+        )
+        self.assertTemplateUsed(response, "payments/partials/transaction_rows.html")
+        self.assertTemplateNotUsed(response, "payments/transactions/transaction_list.html")
+        self.assertEqual(len(response.context["page"]), 5)
+
+    def test_api_cursor_pagination(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.get("/api/payments/transactions/?page_size=20", secure=True)
+        self.assertEqual(len(response.data["results"]), 20)
+        self.assertIsNotNone(response.data["next"])
+
+        response = client.get(response.data["next"], secure=True)
+        self.assertEqual(len(response.data["results"]), 5)
+        self.assertIsNone(response.data["next"])
+
+    def test_other_lists_render(self):
+        self.client.force_login(self.user)
+
+        for url in ("/payments/transfer/", "/payments/recharges/"):
+            response = self.client.get(url, secure=True)
+            self.assertEqual(response.status_code, 200, url)
+            self.assertIn("page", response.context)
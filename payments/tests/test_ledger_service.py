@@ -0,0 +1,83 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from payments.models import BalanceCurrency, Transaction
+from payments.services.balance_service import BalanceService
+from payments.services.ledger_service import LedgerEntry, LedgerService
+
+User = get_user_model()
+
+
+class LedgerServiceTest(TestCase):
+
+    def setUp(self):
+        self.alice = User.objects.create_user(
+            email="alice@test.com", password="test1234", phone="+50931000001"
+        )
+        self.bob = User.objects.create_user(
+            email="bob@test.com", password="test1234", phone="+50931000002"
+        )
+
+    def _amount(self, user, currency):
+        return BalanceCurrency.objects.get(
+            balance__user=user, currency=currency
+        ).amount
+
+    def test_post_batch_applies_net_deltas(self):
+        BalanceService.credit(self.alice, 10, "htg")
+        before = Transaction.objects.count()
+
+        txs = LedgerService.post_batch([
+            (self.alice, "HTG", Decimal("5"), {"k": 1}),
+            (self.alice, "htg", Decimal("-3"), None),
+            (self.bob, "htg", Decimal("7"), None),
+            LedgerEntry(self.bob, "usd", Decimal("2")),
+        ])
+
+        self.assertEqual(len(txs), 4)
+        self.assertEqual(Transaction.objects.count(), before + 4)
+        self.assertEqual(txs[1].transaction_type, Transaction.DEBIT)
+        self.assertEqual(txs[1].amount, Decimal("3"))
+        self.assertEqual(self._amount(self.alice, "htg"), Decimal("12"))
+        self.assertEqual(self._amount(self.bob, "htg"), Decimal("7"))
+        self.assertEqual(self._amount(self.bob, "usd"), Decimal("2"))
+
+    def test_post_batch_constant_queries(self):
+        users = [
+            User.objects.create_user(
+                email=f"u{i}@test.com", password="x", phone=f"+5093200{i:04d}"
+            )
+            for i in range(20)
+        ]
+        entries = [(u, "htg", Decimal("1"), None) for u in users]
+
+        with self.assertNumQueries(6):
+            LedgerService.post_batch(entries)
+
+    def test_overdraft_rolls_back_whole_batch(self):
+        BalanceService.credit(self.alice, 1, "htg")
+        before = Transaction.objects.count()
+
+        with self.assertRaises(ValueError):
+            LedgerService.post_batch([
+                (self.bob, "htg", Decimal("5"), None),
+                (self.alice, "htg", Decimal("-2"), None),
+            ])
+
+        self.assertEqual(Transaction.objects.count(), before)
+        self.assertEqual(self._amount(self.alice, "htg"), Decimal("1"))
+        self.assertFalse(
+            BalanceCurrency.objects.filter(
+                balance__user=self.bob, currency="htg", amount__gt=0
+            ).exists()
+        )
+
+    def test_invalid_entries_rejected(self):
+        with self.assertRaises(ValidationError):
+            LedgerService.post_batch([(self.alice, "eur", 1, None)])
+
+        with self.assertRaises(ValidationError):
+            LedgerService.post_batch([(self.alice, "htg", 0, None)])
@@ -0,0 +1,101 @@
+from decimal import Decimal
+from unittest import skipIf
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from payments.models import BalanceCurrency, Transaction
+from payments.serializers import BalanceSerializer
+from payments.services.balance_service import BalanceService
+from payments.services.ledger_service import LedgerService
+from payments.utils.formatting import format_balance
+from payments.utils.minor_units import from_minor, to_minor
+
+User = get_user_model()
+
+
+class MinorUnitsTest(SimpleTestCase):
+
+    def test_round_trip_per_currency(self):
+        self.assertEqual(to_minor(Decimal("12.34"), "HTG"), 1234)
+        self.assertEqual(to_minor(3, "usd"), 300)
+        self.assertEqual(to_minor("0.000000000000000001", "jmu"), 1)
+        self.assertEqual(from_minor(1234, "htg"), Decimal("12.34"))
+        self.assertEqual(from_minor(1, "jmu"), Decimal("1E-18"))
+
+    def test_rounding_beyond_scale(self):
+        self.assertEqual(to_minor("0.125", "htg"), 12)
+        self.assertEqual(to_minor("0.135", "htg"), 14)
+
+    def test_jmu_fits_beyond_bigint(self):
+        self.assertEqual(to_minor("10", "jmu"), 10 * 10 ** 18)
+        self.assertEqual(to_minor(10 ** 12, "jmu"), 10 ** 30)
+
+        with self.assertRaises(ValidationError):
+            to_minor(10 ** 21, "jmu")
+
+    def test_format_balance_accepts_minor_units(self):
+        self.assertEqual(format_balance(1250, currency="htg"), "12.5")
+        self.assertEqual(format_balance(5, currency="jmu"), "5.00E-18")
+        self.assertEqual(format_balance(0, currency="usd"), "0")
+
+
+class MinorUnitsLedgerTest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="minor@test.com", password="test1234", phone="+50934000001"
+        )
+
+    def _row(self, currency):
+        return BalanceCurrency.objects.get(balance__user=self.user, currency=currency)
+
+    def test_columns_stay_in_sync(self):
+        BalanceService.credit(self.user, "10.25", "htg")
+        BalanceService.debit(self.user, "0.05", "htg")
+        LedgerService.post_batch([(self.user, "htg", Decimal("-1.20"), None)])
+
+        row = self._row("htg")
+        self.assertEqual(row.amount_minor, 900)
+        self.assertEqual(row.amount, Decimal("9"))
+        self.assertTrue(BalanceService.has_sufficient_balance(self.user, 9, "htg"))
+        self.assertFalse(BalanceService.has_sufficient_balance(self.user, "9.01", "htg"))
+
+    @skipIf(connection.vendor == "sqlite", "SQLite stocke un NUMERIC > 2^63 en REAL (approché)")
+    def test_realistic_jmu_balance_round_trips(self):
+        # Bonus d'inscription éventuel déjà crédité
+        start = BalanceCurrency.objects.filter(
+            balance__user=self.user, currency="jmu"
+        ).values_list("amount_minor", flat=True).first() or 0
+
+        BalanceService.credit(self.user, "1000000", "jmu")
+        LedgerService.post_batch([(self.user, "jmu", Decimal("0.000000000000000001"), None)])
+        BalanceService.debit(self.user, "250000.5", "jmu")
+
+        row = self._row("jmu")
+        expected = start + to_minor("749999.500000000000000001", "jmu")
+        self.assertIsInstance(row.amount_minor, int)
+        self.assertEqual(row.amount_minor, expected)
+        self.assertEqual(row.amount, from_minor(expected, "jmu"))
+        self.assertTrue(BalanceService.has_sufficient_balance(self.user, "749999.5", "jmu"))
+
+    def test_transaction_amount_minor(self):
+        tx = Transaction.objects.create(
+            user=self.user, amount=Decimal("4.5"), currency="usd"
+        )
+        self.assertEqual(tx.amount_minor, 450)
+
+        tx, = LedgerService.post_batch([(self.user, "jmu", Decimal("0.000000000000000002"), None)])
+        self.assertEqual(tx.amount_minor, 2)
+
+    def test_api_exposes_exact_amount(self):
+        BalanceService.credit(self.user, "7.10", "usd")
+
+        data = BalanceSerializer(self.user.balance).data
+        usd = next(c for c in data["currencies"] if c["currency"] == "usd")
+
+        self.assertEqual(usd["amount"], "7.10")
+        self.assertEqual(usd["amount_minor"], 710)
+        self.assertEqual(usd["scale"], 2)
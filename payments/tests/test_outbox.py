@@ -0,0 +1,74 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from notifications.models import Notification
+from payments.models import OutboxEvent, Payment
+from payments.services.outbox_service import OUTBOX_HANDLERS, OUTBOX_MAX_ATTEMPTS, OutboxService
+from payments.services.payment_service import PaymentService
+
+User = get_user_model()
+
+
+class OutboxTest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="outbox@test.com", password="test1234", phone="+50934200001"
+        )
+        self.payment = Payment.objects.create(
+            user=self.user,
+            amount=Decimal("150"),
+            currency="htg",
+            method=Payment.MOBILE,
+            payment_type=Payment.TYPE_DOCUMENT,
+        )
+
+    def _notifications(self):
+        return Notification.objects.filter(user=self.user, title__startswith="Paiement réussi")
+
+    def test_mark_completed_defers_effects_to_worker(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            PaymentService.mark_completed(self.payment)
+            PaymentService.mark_completed(self.payment)
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(OutboxEvent.objects.count(), 1)
+        self.assertFalse(self._notifications().exists())
+
+        # Notification écrite dans la transaction du handler, sans attendre le commit
+        with self.captureOnCommitCallbacks(execute=False):
+            self.assertEqual(OutboxService.drain(), 1)
+            self.assertEqual(OutboxEvent.objects.get().status, OutboxEvent.STATUS_DONE)
+            self.assertEqual(self._notifications().count(), 1)
+        self.assertEqual(OutboxEvent.objects.get().status, OutboxEvent.STATUS_DONE)
+
+        self.assertEqual(OutboxService.drain(), 0)
+
+    def test_dedup_key(self):
+        for _ in range(3):
+            OutboxService.enqueue("payment.completed", {"payment_id": "x"}, dedup_key="same")
+
+        self.assertEqual(OutboxEvent.objects.count(), 1)
+
+    def test_failures_back_off_then_give_up(self):
+        OutboxService.enqueue("payment.completed", {"payment_id": "x"})
+
+        with mock.patch.dict(OUTBOX_HANDLERS, {"payment.completed": "builtins.int"}):
+            self.assertEqual(OutboxService.drain(), 1)
+            event = OutboxEvent.objects.get()
+            self.assertEqual(event.attempts, 1)
+            self.assertGreater(event.available_at, timezone.now())
+            self.assertIn("TypeError", event.last_error)
+
+            # Pas encore disponible : le lot suivant ne le reprend pas
+            self.assertEqual(OutboxService.drain(), 0)
+
+            for _ in range(OUTBOX_MAX_ATTEMPTS - 1):
+                OutboxEvent.objects.update(available_at=timezone.now())
+                OutboxService.drain()
+
+        self.assertEqual(OutboxEvent.objects.get().status, OutboxEvent.STATUS_FAILED)
@@ -0,0 +1,58 @@
+import io
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from payments.models import Balance, Transaction
+from payments.services.ledger_service import LedgerService
+from payments.services.reconciliation_service import ReconciliationService
+
+User = get_user_model()
+
+
+class LedgerReconciliationTest(TestCase):
+
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(
+                email=f"recon{i}@test.com", password="test1234", phone=f"+5093900000{i}"
+            )
+            for i in range(3)
+        ]
+        LedgerService.post_batch([(u, "htg", Decimal("100")) for u in self.users])
+        LedgerService.post_batch([(self.users[0], "htg", Decimal("-40"))])
+
+        # Chemin hors ledger, comme le crédit BTG de vehicles/sign.py
+        Balance.objects.get(user=self.users[1]).credit(Decimal("5"), "BTG")
+
+    def _drifts(self, **kwargs):
+        ids = {u.pk for u in self.users}
+        return [d for d in ReconciliationService.iter_drifts(**kwargs) if d.user_id in ids]
+
+    def test_reports_only_off_ledger_movements(self):
+        drifts = self._drifts(chunk_size=2)
+
+        self.assertEqual(len(drifts), 1)
+        drift = drifts[0]
+        self.assertEqual((drift.user_id, drift.currency), (self.users[1].pk, "btg"))
+        self.assertEqual(drift.drift, Decimal("5"))
+        self.assertEqual(drift.ledger_minor, 0)
+
+        self.assertEqual(self._drifts(currency="HTG"), [])
+
+    def test_fix_writes_adjustment_entries(self):
+        self._drifts(fix=True)
+
+        adjustment = Transaction.objects.get(bonus_type=Transaction.ADJUSTMENT, user=self.users[1])
+        self.assertEqual(adjustment.transaction_type, Transaction.CREDIT)
+        self.assertEqual(adjustment.amount_minor, 500000000)
+        self.assertEqual(self._drifts(), [])
+
+    def test_command_report(self):
+        out, err = io.StringIO(), io.StringIO()
+        call_command("reconcile_ledger", "--currency", "btg", stdout=out, stderr=err)
+
+        self.assertIn(f"{self.users[1].pk} | btg", out.getvalue())
+        self.assertIn("1 écarts détectés", err.getvalue())
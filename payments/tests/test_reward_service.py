@@ -0,0 +1,133 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from payments.models import BalanceCurrency, RewardCampaign, RewardClaim, Transaction
+from payments.services.reward_service import (
+    TASK_REWARDS,
+    issue_campaign,
+    reward_user_for_task,
+    reward_user_random_jmu,
+)
+
+User = get_user_model()
+
+
+class RewardClaimTest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="reward@test.com", password="test1234", phone="+50933000001"
+        )
+
+    def test_task_reward_once_per_day(self):
+        first = reward_user_for_task(self.user, "DAILY_LOGIN")
+        second = reward_user_for_task(self.user, "DAILY_LOGIN")
+
+        self.assertIsNotNone(first)
+        self.assertIsNone(second)
+        self.assertEqual(
+            RewardClaim.objects.filter(user=self.user, reward_key="DAILY_LOGIN").count(),
+            1,
+        )
+
+    def test_random_reward_once_per_day(self):
+        self.assertIsNotNone(reward_user_random_jmu(self.user))
+        self.assertIsNone(reward_user_random_jmu(self.user))
+
+    def test_allow_multiple_skips_claim(self):
+        before = Transaction.objects.filter(user=self.user).count()
+
+        reward_user_for_task(self.user, "BONUS", allow_multiple_per_day=True)
+        reward_user_for_task(self.user, "BONUS", allow_multiple_per_day=True)
+
+        self.assertEqual(Transaction.objects.filter(user=self.user).count(), before + 2)
+        self.assertFalse(RewardClaim.objects.filter(reward_key="BONUS").exists())
+
+    def test_unknown_task_does_not_claim(self):
+        self.assertIsNone(reward_user_for_task(self.user, "UNKNOWN"))
+        self.assertFalse(RewardClaim.objects.filter(reward_key="UNKNOWN").exists())
+
+
+class RewardCampaignTest(TestCase):
+
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(
+                email=f"camp{i}@test.com", password="x", phone=f"+5093400{i:04d}"
+            )
+            for i in range(7)
+        ]
+        self.qs = User.objects.filter(pk__in=[u.pk for u in self.users])
+
+    def _campaign_txs(self):
+        return Transaction.objects.filter(metadata__campaign="promo")
+
+    def test_issue_campaign_in_chunks(self):
+        seen = []
+        campaign = issue_campaign(
+            self.qs,
+            campaign_key="promo",
+            amount="0.5",
+            reason="Promo",
+            chunk_size=3,
+            progress=lambda c: seen.append(c.processed_count),
+        )
+
+        self.assertEqual(seen, [3, 6, 7])
+        self.assertEqual(campaign.status, RewardCampaign.STATUS_COMPLETED)
+        self.assertEqual(self._campaign_txs().count(), 7)
+        # SQLite stocke les NUMERIC en flottant : tolérance minime
+        self.assertAlmostEqual(
+            BalanceCurrency.objects.get(balance__user=self.users[0], currency="jmu").amount,
+            Decimal("0.5") + TASK_REWARDS["SIGNUP"],
+            delta=Decimal("1e-12"),
+        )
+
+    def test_resume_after_crash(self):
+        def crash_after_first_chunk(campaign):
+            raise RuntimeError("crash")
+
+        with self.assertRaises(RuntimeError):
+            issue_campaign(
+                self.qs,
+                campaign_key="promo",
+                amount="0.5",
+                chunk_size=3,
+                progress=crash_after_first_chunk,
+            )
+
+        self.assertEqual(self._campaign_txs().count(), 3)
+
+        campaign = issue_campaign(self.qs, campaign_key="promo", chunk_size=3)
+
+        self.assertEqual(campaign.processed_count, 7)
+        self.assertEqual(self._campaign_txs().count(), 7)
+
+    def test_rerun_with_id_list_does_not_double_credit(self):
+        issue_campaign(self.qs, campaign_key="promo", amount="1", chunk_size=5)
+        RewardCampaign.objects.filter(key="promo").update(
+            status=RewardCampaign.STATUS_RUNNING, last_user_id=0
+        )
+
+        issue_campaign([u.pk for u in self.users], campaign_key="promo", chunk_size=5)
+
+        self.assertEqual(self._campaign_txs().count(), 7)
+
+    def test_unknown_user_ids_are_skipped(self):
+        unknown = []
+        missing = max(u.pk for u in self.users) + 1000
+
+        campaign = issue_campaign(
+            [u.pk for u in self.users] + [missing],
+            campaign_key="promo",
+            amount="1",
+            chunk_size=5,
+            skipped=unknown.extend,
+        )
+
+        self.assertEqual(unknown, [missing])
+        self.assertEqual(campaign.processed_count, 7)
+        self.assertEqual(campaign.last_user_id, missing)
+        self.assertEqual(self._campaign_txs().count(), 7)
@@ -0,0 +1,117 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from payments.models import JobCheckpoint, LedgerDailyRollup, LedgerMonthlyRollup, Transaction
+from payments.services.rollup_service import ROLLUP_CHECKPOINT, RollupService
+
+User = get_user_model()
+
+
+class LedgerRollupTest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="rollup@test.com", password="test1234", phone="+50938000001"
+        )
+        Transaction.objects.all().delete()
+        self.now = timezone.now()
+
+    def _tx(self, amount, days_ago=0, tx_type=Transaction.CREDIT, currency="htg",
+            status=Transaction.STATUS_COMPLETED):
+        tx = Transaction.objects.create(
+            user=self.user,
+            amount=Decimal(amount),
+            currency=currency,
+            transaction_type=tx_type,
+            bonus_type=Transaction.TRANSFER,
+            status=status,
+        )
+        # Complétées à leur création : completed_at suit created_at
+        when = self.now - timedelta(days=days_ago, hours=1)
+        Transaction.objects.filter(pk=tx.pk).update(
+            created_at=when,
+            completed_at=when if status == Transaction.STATUS_COMPLETED else None,
+        )
+        tx.refresh_from_db()
+        return tx
+
+    def test_daily_and_monthly_totals(self):
+        self._tx("10.00")
+        self._tx("2.50")
+        self._tx("4.00", tx_type=Transaction.DEBIT)
+        self._tx("1.00", days_ago=40)
+        self._tx("99.00", status=Transaction.STATUS_PENDING)
+
+        RollupService.refresh_all(lag=timedelta(0))
+
+        today = timezone.localtime(self.now - timedelta(hours=1)).date()
+        credit = LedgerDailyRollup.objects.get(
+            user=self.user, day=today, transaction_type=Transaction.CREDIT
+        )
+        self.assertEqual(credit.amount_minor, 1250)
+        self.assertEqual(credit.tx_count, 2)
+        self.assertEqual(LedgerDailyRollup.objects.count(), 3)
+
+        statement = RollupService.monthly_statement(self.user, months=12, currency="htg")
+        self.assertEqual(sum(p["net"] for p in statement), Decimal("9.50"))
+        self.assertEqual(sum(p["count"] for p in statement), 4)
+        self.assertEqual(
+            sum(r.amount_minor for r in LedgerMonthlyRollup.objects.all()),
+            sum(r.amount_minor for r in LedgerDailyRollup.objects.all()),
+        )
+
+    def test_incremental_refresh_and_replay(self):
+        self._tx("7.00", days_ago=3)
+        tx = self._tx("10.00")
+        Transaction.objects.filter(pk=tx.pk).update(created_at=self.now, completed_at=self.now)
+        RollupService.refresh_all(lag=timedelta(0))
+
+        checkpoint = JobCheckpoint.objects.get(name=ROLLUP_CHECKPOINT)
+        self.assertGreaterEqual(checkpoint.last_timestamp, self.now)
+
+        # Nouvelle ligne du même jour : seul ce jour est recalculé,
+        # sans compter deux fois la première ligne
+        Transaction.objects.create(
+            user=self.user, amount=Decimal("5.00"), currency="htg",
+            status=Transaction.STATUS_COMPLETED,
+        )
+        self.assertEqual(RollupService.refresh(lag=timedelta(0)), 1)
+        self.assertEqual(RollupService.refresh(lag=timedelta(0)), 0)
+
+        start = timezone.localdate() - timedelta(days=5)
+        rows = RollupService.daily_series(self.user, "HTG", start)
+        self.assertEqual([r["credit"] for r in rows], [Decimal("7.00"), Decimal("15.00")])
+
+    def test_batches_stop_at_lag_and_batch_size(self):
+        for i in range(5):
+            self._tx("1.00", days_ago=i)
+        recent = self._tx("1.00")
+        Transaction.objects.filter(pk=recent.pk).update(created_at=self.now, completed_at=self.now)
+
+        # Lots de 2 lignes ; la ligne trop récente attend le prochain passage
+        self.assertEqual(RollupService.refresh_all(batch_size=2, lag=timedelta(minutes=5)), 5)
+
+        checkpoint = JobCheckpoint.objects.get(name=ROLLUP_CHECKPOINT)
+        self.assertLess(checkpoint.last_timestamp, self.now)
+        self.assertEqual(LedgerDailyRollup.objects.values("day").distinct().count(), 5)
+
+    def test_late_completion_enters_rollup(self):
+        tx = self._tx("8.00", days_ago=2, status=Transaction.STATUS_PENDING)
+        self._tx("1.00")
+        RollupService.refresh_all(lag=timedelta(0))
+        self.assertFalse(LedgerDailyRollup.objects.filter(amount_minor=800).exists())
+
+        # Complétée après le passage du point de reprise sur son created_at
+        tx.status = Transaction.STATUS_COMPLETED
+        tx.save(update_fields=["status"])
+        self.assertIsNotNone(tx.completed_at)
+
+        self.assertEqual(RollupService.refresh(lag=timedelta(0)), 1)
+        day = timezone.localtime(self.now - timedelta(days=2, hours=1)).date()
+        self.assertEqual(
+            LedgerDailyRollup.objects.get(user=self.user, day=day).amount_minor, 800
+        )
@@ -0,0 +1,80 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from payments.models import SystemAccountBalance, SystemAccountShard
+from payments.services.balance_service import BalanceService
+from payments.services.ledger_service import LedgerEntry, LedgerService
+from payments.services.reward_service import TASK_REWARDS, issue_campaign, reward_user_for_task
+from payments.services.system_account_service import (
+    SYSTEM_ACCOUNT_SHARDS,
+    SystemAccountService,
+    shard_for,
+)
+
+User = get_user_model()
+
+
+class SystemAccountTest(TestCase):
+
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(
+                email=f"sys{i}@test.com", password="test1234", phone=f"+5093450000{i}"
+            )
+            for i in range(6)
+        ]
+
+    def test_shard_choice_is_stable_and_spread(self):
+        self.assertEqual(shard_for(42), shard_for(42))
+        self.assertGreater(len({shard_for(uid) for uid in range(200)}), SYSTEM_ACCOUNT_SHARDS // 2)
+        self.assertLess(shard_for(None), SYSTEM_ACCOUNT_SHARDS)
+
+    def test_rewards_are_counterposted_on_treasury_shards(self):
+        for user in self.users:
+            reward_user_for_task(user, "SIGNUP")
+        issue_campaign(
+            [u.pk for u in self.users], campaign_key="sys-1", amount="0.5", chunk_size=2,
+        )
+
+        issued = TASK_REWARDS["SIGNUP"] * len(self.users) + Decimal("0.5") * len(self.users)
+        self.assertEqual(SystemAccountService.balance(SystemAccountShard.TREASURY, "jmu"), -issued)
+
+        view = SystemAccountBalance.objects.get(account=SystemAccountShard.TREASURY, currency="jmu")
+        self.assertEqual(view.amount, -issued)
+        self.assertEqual(
+            view.shard_count,
+            SystemAccountShard.objects.filter(account=SystemAccountShard.TREASURY).count(),
+        )
+        self.assertGreater(view.shard_count, 1)
+
+    def test_debits_credit_revenue(self):
+        for user in self.users[:2]:
+            BalanceService.credit(user, 100, "htg")
+
+        with self.assertNumQueries(9):
+            LedgerService.post_batch(
+                [LedgerEntry(u, "htg", Decimal("-12.50")) for u in self.users[:2]],
+                system_account=SystemAccountShard.REVENUE,
+            )
+
+        self.assertEqual(
+            SystemAccountService.balance(SystemAccountShard.REVENUE, "htg"), Decimal("25.00")
+        )
+        self.assertEqual(SystemAccountService.balance(SystemAccountShard.TREASURY, "htg"), 0)
+
+    def test_unkeyed_post_creates_and_updates_the_same_shard(self):
+        with mock.patch(
+            "payments.services.system_account_service.random.randrange", side_effect=[3, 7]
+        ):
+            SystemAccountService.post(SystemAccountShard.REVENUE, "htg", 500)
+
+        shard = SystemAccountShard.objects.get(account=SystemAccountShard.REVENUE, currency="htg")
+        self.assertEqual((shard.shard, shard.amount_minor), (3, 500))
+
+    def test_post_raises_when_no_shard_row_is_updated(self):
+        with mock.patch.object(SystemAccountShard.objects, "bulk_create"):
+            with self.assertRaises(RuntimeError):
+                SystemAccountService.post(SystemAccountShard.REVENUE, "htg", 500)
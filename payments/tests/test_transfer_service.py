@@ -0,0 +1,157 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from unittest import skipIf
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+from notifications.models import Notification
+from notifications.services.notification_buffer import flush_notifications
+from payments.models import BalanceCurrency, FundTransfer, Transaction
+from payments.services.balance_service import BalanceService
+from payments.services.transfer_service import TransferService
+from payments.services.wallet_service import transfer_wallet
+from users.models import BusinessProfile, Employee
+
+User = get_user_model()
+
+
+def _amount(user, currency="htg"):
+    return BalanceCurrency.objects.get(balance__user=user, currency=currency).amount
+
+
+# =====================================================
+# TRANSFERTS
+# =====================================================
+class TransferServiceTest(TestCase):
+
+    def setUp(self):
+        self.alice = User.objects.create_user(
+            email="alice@test.com", password="test1234", phone="+50933000001"
+        )
+        self.bob = User.objects.create_user(
+            email="bob@test.com", password="test1234", phone="+50933000002"
+        )
+        self.carol = User.objects.create_user(
+            email="carol@test.com", password="test1234", phone="+50933000003"
+        )
+        BalanceService.credit(self.alice, 100, "htg")
+
+    def test_transfer_wallet_creates_fund_transfer(self):
+        sender_tx, receiver_tx = transfer_wallet(
+            sender=self.alice, receiver=self.bob, amount=30, currency="HTG"
+        )
+
+        self.assertEqual(_amount(self.alice), Decimal("70"))
+        self.assertEqual(_amount(self.bob), Decimal("30"))
+        self.assertEqual(sender_tx.transaction_type, Transaction.DEBIT)
+        self.assertEqual(receiver_tx.user, self.bob)
+
+        transfer = FundTransfer.objects.get(sender=self.alice)
+        self.assertEqual(transfer.sender_transaction, sender_tx)
+        self.assertEqual(transfer.receiver_transaction, receiver_tx)
+        self.assertEqual(transfer.status, FundTransfer.STATUS_COMPLETED)
+
+    def test_payout_to_many_recipients(self):
+        transfers = TransferService.payout(
+            self.alice, [(self.bob, 10), (self.carol, 25)], "htg"
+        )
+        flush_notifications()
+
+        self.assertEqual(len(transfers), 2)
+        self.assertEqual(_amount(self.alice), Decimal("65"))
+        self.assertEqual(_amount(self.bob), Decimal("10"))
+        self.assertEqual(_amount(self.carol), Decimal("25"))
+        self.assertEqual(
+            Notification.objects.filter(user=self.alice, title="Transfert envoyé").count(), 2
+        )
+
+    def test_insufficient_funds_rolls_back_everything(self):
+        before = Transaction.objects.count()
+
+        with self.assertRaises(ValueError):
+            TransferService.payout(
+                self.alice, [(self.bob, 60), (self.carol, 60)], "htg"
+            )
+
+        self.assertEqual(_amount(self.alice), Decimal("100"))
+        self.assertEqual(Transaction.objects.count(), before)
+        self.assertFalse(FundTransfer.objects.exists())
+
+    def test_self_transfer_rejected(self):
+        with self.assertRaises(ValidationError):
+            TransferService.payout(self.alice, [(self.alice, 1)], "htg")
+
+    def test_pay_employees(self):
+        business = BusinessProfile.objects.create(
+            user=self.alice, business_name="Garage Alice"
+        )
+        bob = Employee.objects.create(
+            business=business, user=self.bob, first_name="Bob", last_name="B"
+        )
+        Employee.objects.create(
+            business=business, user=self.carol, first_name="Carol", last_name="C"
+        )
+        Employee.objects.create(
+            business=business, first_name="San", last_name="Kont"
+        )
+
+        transfers = TransferService.pay_employees(
+            business, {bob.pk: 40}, "htg"
+        )
+        self.assertEqual(len(transfers), 1)
+
+        transfers = TransferService.pay_employees(business, 20, "htg")
+        self.assertEqual(len(transfers), 2)
+
+        self.assertEqual(_amount(self.alice), Decimal("20"))
+        self.assertEqual(_amount(self.bob), Decimal("60"))
+        self.assertEqual(_amount(self.carol), Decimal("20"))
+
+
+# =====================================================
+# STRESS TEST INTERBLOCAGE (PostgreSQL / MySQL)
+# =====================================================
+@skipIf(
+    connection.vendor == "sqlite",
+    "SQLite verrouille la base entière : pas d'écrivains réellement parallèles",
+)
+class ConcurrentTransferTest(TransactionTestCase):
+
+    WRITERS = 40
+
+    def setUp(self):
+        self.alice = User.objects.create_user(
+            email="alice@test.com", password="test1234", phone="+50933000011"
+        )
+        self.bob = User.objects.create_user(
+            email="bob@test.com", password="test1234", phone="+50933000012"
+        )
+        BalanceService.credit(self.alice, 1000, "htg")
+        BalanceService.credit(self.bob, 1000, "htg")
+
+    def test_crossed_transfers_do_not_deadlock(self):
+        barrier = threading.Barrier(self.WRITERS)
+        errors = []
+
+        def worker(i):
+            sender, receiver = (self.alice, self.bob) if i % 2 else (self.bob, self.alice)
+            try:
+                barrier.wait()
+                TransferService.payout(sender, [(receiver, 1)], "htg")
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=self.WRITERS) as pool:
+            for i in range(self.WRITERS):
+                pool.submit(worker, i)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(_amount(self.alice), Decimal("1000"))
+        self.assertEqual(_amount(self.bob), Decimal("1000"))
+        self.assertEqual(FundTransfer.objects.count(), self.WRITERS)
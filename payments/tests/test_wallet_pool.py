@@ -0,0 +1,83 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+
+from payments.models import PooledWalletAddress, Wallet
+from payments.services.wallet_service import (
+    create_wallet_for_user,
+    fill_address_pool,
+    get_wallet_for_user,
+)
+from payments.utils.wallet_cache import cache_key as wallet_cache_key
+
+User = get_user_model()
+
+
+class WalletAddressPoolTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="pool@test.com", password="test1234", phone="+50934300001"
+        )
+
+    def test_fill_and_claim(self):
+        self.assertEqual(fill_address_pool("tron", target=5), 5)
+        self.assertEqual(fill_address_pool("tron", target=5), 0)
+        pooled = set(PooledWalletAddress.objects.values_list("address", flat=True))
+
+        wallet = create_wallet_for_user(self.user, "TRON")
+
+        self.assertIn(wallet.address, pooled)
+        self.assertEqual(PooledWalletAddress.objects.filter(network="tron").count(), 4)
+        self.assertEqual(create_wallet_for_user(self.user, "tron"), wallet)
+
+    def test_fill_counts_only_inserted_addresses(self):
+        # Adresses en collision : une seule ligne réellement insérée
+        with mock.patch(
+            "payments.services.wallet_service.generate_wallet_address", return_value="T" + "0" * 40
+        ):
+            self.assertEqual(fill_address_pool("tron", target=5), 1)
+
+        self.assertEqual(PooledWalletAddress.objects.filter(network="tron").count(), 1)
+
+    def test_empty_pool_falls_back_to_generation(self):
+        wallet = create_wallet_for_user(self.user, "polygon")
+
+        self.assertTrue(wallet.address.startswith("0x"))
+        self.assertFalse(PooledWalletAddress.objects.exists())
+
+    def test_dashboard_lookup_is_cached(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            wallet = get_wallet_for_user(self.user, "btc")
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_wallet_for_user(self.user, "btc").pk, wallet.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Wallet.objects.filter(pk=wallet.pk).update(is_active=False)
+            wallet.is_active = False
+            wallet.save()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            replacement = get_wallet_for_user(self.user, "btc")
+        self.assertNotEqual(replacement.pk, wallet.pk)
+
+    def test_cache_holds_no_private_key(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            wallet = get_wallet_for_user(self.user, "btc")
+        Wallet.objects.filter(pk=wallet.pk).update(encrypted_private_key="sekre")
+
+        cached = cache.get(wallet_cache_key(self.user.pk, "btc"))
+        self.assertNotIn("encrypted_private_key", cached)
+        self.assertNotIn("sekre", repr(cached))
+
+        with self.assertNumQueries(0):
+            hit = get_wallet_for_user(self.user, "btc")
+            self.assertEqual((hit.pk, hit.address, hit.network), (wallet.pk, wallet.address, "btc"))
+
+        # Champ non mis en cache : relu en base au premier accès
+        with self.assertNumQueries(1):
+            self.assertEqual(hit.encrypted_private_key, "sekre")
@@ -10,6 +10,7 @@ urlpatterns = [
 
     # Transactions
     path('transactions/', views.transaction_list, name='transaction_list'),
+    path('transactions/export/', views.transaction_export, name='transaction_export'),
     path('transactions/<uuid:pk>/', views.transaction_detail, name='transaction_detail'),
     
     # Transfert
@@ -1,24 +1,379 @@
+import hashlib
+from functools import lru_cache
+from typing import NamedTuple
+
 from django.core.exceptions import ValidationError
 
+# ======================================================
+# 🔎 VALIDATION D'ADRESSES ON-CHAIN (UNITAIRE ET PAR LOT)
+# ======================================================
+# Vraies sommes de contrôle, sans appel réseau :
+#   - EVM (ETH, BSC, POLYGON) : EIP-55 (Keccak-256 de l'adresse en minuscules),
+#   - BTC : base58check (P2PKH / P2SH) et bech32 / bech32m (segwit v0 / v1+),
+#   - TRON : base58check, version 0x41.
+# Les tables (alphabets, constantes Keccak et bech32) sont calculées une
+# fois à l'import ; validate_addresses() ne valide qu'une fois chaque
+# adresse répétée dans un lot.
+
+EVM_NETWORKS = ("ETH", "BSC", "POLYGON")
+SUPPORTED_NETWORKS = EVM_NETWORKS + ("BTC", "TRON")
+
+
+class AddressCheck(NamedTuple):
+    address: str
+    valid: bool
+    # Forme canonique : checksum EIP-55, bech32 en minuscules
+    normalized: str = ""
+    error: str = ""
+
+
+# ==========================
+# KECCAK-256 (PAR LOT)
+# ==========================
+# Sans pycryptodome, le Keccak Python est vectorisé sur le lot : la voie i
+# de N messages est rangée dans UN entier de N × 64 bits (un créneau par
+# message). Chaque XOR / AND / rotation de la permutation traite alors les
+# N messages en une opération sur entier long (boucle C), au lieu de
+# N permutations interprétées.
+try:
+    from Crypto.Hash import keccak as _pycryptodome_keccak
+except ImportError:
+    _pycryptodome_keccak = None
+
+_KECCAK_RATE = 136  # octets, Keccak-256
+KECCAK_BATCH_SIZE = 1024
+
+
+def _round_constants():
+    lfsr, constants = 1, []
+    for _ in range(24):
+        rc = 0
+        for j in range(7):
+            if lfsr & 1:
+                rc |= 1 << ((1 << j) - 1)
+            lfsr <<= 1
+            if lfsr & 0x100:
+                lfsr ^= 0x171
+        constants.append(rc)
+    return constants
+
+
+def _rho_pi():
+    """
+    Pour chaque voie de destination : (source, rotation), étapes ρ et π fusionnées.
+    """
+    steps, x, y = {0: (0, 0)}, 1, 0
+    for t in range(24):
+        steps[y + 5 * ((2 * x + 3 * y) % 5)] = (x + 5 * y, ((t + 1) * (t + 2) // 2) % 64)
+        x, y = y, (2 * x + 3 * y) % 5
+    return tuple(steps[dst] for dst in range(25))
+
+
+_RC = _round_constants()
+_RHO_PI = _rho_pi()
+_CHI = tuple((i, i - i % 5 + (i + 1) % 5, i - i % 5 + (i + 2) % 5) for i in range(25))
+
+
+@lru_cache(maxsize=8)
+def _slot_tables(n):
+    """
+    Tables pour n créneaux de 64 bits : masques de rotation par décalage
+    (bits bas / hauts de chaque créneau) et constantes de ronde répliquées.
+    """
+    def repeat(value):
+        return int.from_bytes(value.to_bytes(8, "little") * n, "little")
+
+    low = {r: repeat((1 << r) - 1) for r in range(64)}
+    full = repeat((1 << 64) - 1)
+    high = {r: full ^ low[r] for r in range(64)}
+    return low, high, [repeat(rc) for rc in _RC]
+
+
+def _keccak_f_packed(a, n):
+    low, high, round_constants = _slot_tables(n)
+
+    def rol(x, r):
+        if not r:
+            return x
+        return ((x << r) & high[r]) | ((x >> (64 - r)) & low[r])
+
+    for rc in round_constants:
+        c = [a[x] ^ a[x + 5] ^ a[x + 10] ^ a[x + 15] ^ a[x + 20] for x in range(5)]
+        d = [c[(x - 1) % 5] ^ rol(c[(x + 1) % 5], 1) for x in range(5)]
+        a = [v ^ d[i % 5] for i, v in enumerate(a)]
+        b = [rol(a[src], rot) for src, rot in _RHO_PI]
+        a = [b[i] ^ (~b[j] & b[k]) for i, j, k in _CHI]
+        a[0] ^= rc
+    return a
+
+
+def _keccak256_packed(messages):
+    """
+    Messages de même longueur ; un passage de permutation par bloc pour tout le lot.
+    """
+    n = len(messages)
+    padded = []
+    for data in messages:
+        block = bytearray(data)
+        block.append(0x01)
+        block.extend(b"\x00" * (-len(block) % _KECCAK_RATE))
+        block[-1] |= 0x80
+        padded.append(bytes(block))
+
+    state = [0] * 25
+    for offset in range(0, len(padded[0]), _KECCAK_RATE):
+        for i in range(_KECCAK_RATE // 8):
+            lo = offset + 8 * i
+            state[i] ^= int.from_bytes(b"".join(p[lo:lo + 8] for p in padded), "little")
+        state = _keccak_f_packed(state, n)
+
+    lanes = [lane.to_bytes(8 * n, "little") for lane in state[:4]]
+    return [b"".join(lane[8 * m:8 * m + 8] for lane in lanes) for m in range(n)]
+
+
+def keccak256_batch(messages):
+    """
+    Keccak-256 (Ethereum, différent de hashlib.sha3_256) d'une liste de messages.
+    pycryptodome si installé, sinon version Python vectorisée par lots.
+    """
+    if _pycryptodome_keccak is not None:
+        return [_pycryptodome_keccak.new(digest_bits=256, data=m).digest() for m in messages]
+
+    digests = [None] * len(messages)
+    by_length = {}
+    for index, data in enumerate(messages):
+        by_length.setdefault(len(data), []).append(index)
+
+    for indexes in by_length.values():
+        for start in range(0, len(indexes), KECCAK_BATCH_SIZE):
+            chunk = indexes[start:start + KECCAK_BATCH_SIZE]
+            for index, digest in zip(chunk, _keccak256_packed([messages[i] for i in chunk])):
+                digests[index] = digest
+    return digests
+
+
+def keccak256(data: bytes) -> bytes:
+    return keccak256_batch([data])[0]
+
+
+# ==========================
+# EVM (EIP-55)
+# ==========================
+_HEX = frozenset("0123456789abcdef")
+
+
+def _apply_checksum(hex40, digest_hex):
+    return "0x" + "".join(
+        ch.upper() if ch > "9" and digest_hex[i] >= "8" else ch
+        for i, ch in enumerate(hex40)
+    )
+
+
+def to_checksum_address(hex40: str) -> str:
+    """
+    `hex40` : 40 caractères hexadécimaux en minuscules (sans 0x).
+    """
+    return _apply_checksum(hex40, keccak256(hex40.encode("ascii")).hex())
 
-def validate_address(address: str, network: str):
-    if not address:
-        raise ValidationError("Adresse vide")
 
-    address = address.strip()
-    network = network.upper()
+def _evm_body(address):
+    """
+    Partie hexadécimale en minuscules ; contrôles de forme seulement.
+    """
+    if len(address) != 42 or address[:2] not in ("0x", "0X"):
+        raise ValueError("Adresse EVM : 0x suivi de 40 caractères hexadécimaux")
 
-    if network in ("ETH", "BSC"):
-        if not (address.startswith("0x") and len(address) == 42):
-            raise ValidationError("Adresse invalide pour Ethereum / BSC")
+    lower = address[2:].lower()
+    if not set(lower) <= _HEX:
+        raise ValueError("Adresse EVM : caractères non hexadécimaux")
+    return lower
 
-    elif network == "BTC":
-        if not address.startswith(("1", "3", "bc1")):
-            raise ValidationError("Adresse invalide pour Bitcoin")
 
-    elif network == "TRON":
-        if not address.startswith("T"):
-            raise ValidationError("Adresse invalide pour TRON")
+def _check_evm_batch(addresses):
+    """
+    Contrôles de forme, puis UN keccak256_batch pour toutes les adresses valides.
+    """
+    results, bodies = {}, {}
+    for address in addresses:
+        try:
+            bodies[address] = _evm_body(address)
+        except ValueError as e:
+            results[address] = AddressCheck(address, False, error=str(e))
 
+    digests = keccak256_batch([body.encode("ascii") for body in bodies.values()])
+    for (address, body), digest in zip(bodies.items(), digests):
+        checksummed = _apply_checksum(body, digest.hex())
+        raw = address[2:]
+        # Tout en minuscules / majuscules : pas de checksum à vérifier
+        if raw not in (body, raw.upper()) and raw != checksummed[2:]:
+            results[address] = AddressCheck(address, False, error="Adresse EVM : checksum EIP-55 invalide")
+        else:
+            results[address] = AddressCheck(address, True, normalized=checksummed)
+
+    return results
+
+
+# ==========================
+# BASE58CHECK
+# ==========================
+_B58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+_B58_INDEX = {ch: i for i, ch in enumerate(_B58_ALPHABET)}
+
+
+def _b58check_decode(address):
+    """
+    Charge utile (version + données) ou None si alphabet / checksum invalide.
+    """
+    number = 0
+    for ch in address:
+        digit = _B58_INDEX.get(ch)
+        if digit is None:
+            return None
+        number = number * 58 + digit
+
+    leading = len(address) - len(address.lstrip("1"))
+    raw = b"\x00" * leading + number.to_bytes((number.bit_length() + 7) // 8, "big")
+    if len(raw) < 5:
+        return None
+
+    payload, checksum = raw[:-4], raw[-4:]
+    if hashlib.sha256(hashlib.sha256(payload).digest()).digest()[:4] != checksum:
+        return None
+    return payload
+
+
+# ==========================
+# BECH32 / BECH32M (BIP-173 / BIP-350)
+# ==========================
+_BECH32_CHARSET = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+_BECH32_INDEX = {ch: i for i, ch in enumerate(_BECH32_CHARSET)}
+_BECH32_GEN = (0x3B6A57B2, 0x26508E6D, 0x1EA119FA, 0x3D4233DD, 0x2A1462B3)
+_BECH32_CONST = 1
+_BECH32M_CONST = 0x2BC830A3
+
+
+def _bech32_polymod(values):
+    chk = 1
+    for value in values:
+        top = chk >> 25
+        chk = (chk & 0x1FFFFFF) << 5 ^ value
+        for i in range(5):
+            if (top >> i) & 1:
+                chk ^= _BECH32_GEN[i]
+    return chk
+
+
+def _convert_bits(data, frombits, tobits):
+    acc = bits = 0
+    out, maxv = [], (1 << tobits) - 1
+    for value in data:
+        acc = (acc << frombits) | value
+        bits += frombits
+        while bits >= tobits:
+            bits -= tobits
+            out.append((acc >> bits) & maxv)
+    if bits >= frombits or (acc << (tobits - bits)) & maxv:
+        return None
+    return out
+
+
+def _check_segwit(address, hrp="bc"):
+    if address.lower() != address and address.upper() != address:
+        raise ValueError("Adresse bech32 : casse mixte")
+
+    address = address.lower()
+    sep = address.rfind("1")
+    if address[:sep] != hrp or len(address) > 90 or len(address) - sep - 1 < 7:
+        raise ValueError("Adresse bech32 : format invalide")
+
+    data = [_BECH32_INDEX.get(ch) for ch in address[sep + 1:]]
+    if None in data:
+        raise ValueError("Adresse bech32 : caractère invalide")
+
+    const = _bech32_polymod([ord(c) >> 5 for c in hrp] + [0] + [ord(c) & 31 for c in hrp] + data)
+    version = data[0]
+    if const != (_BECH32_CONST if version == 0 else _BECH32M_CONST):
+        raise ValueError("Adresse bech32 : checksum invalide")
+
+    program = _convert_bits(data[1:-6], 5, 8)
+    if (
+        program is None
+        or version > 16
+        or not 2 <= len(program) <= 40
+        or (version == 0 and len(program) not in (20, 32))
+    ):
+        raise ValueError("Adresse bech32 : programme segwit invalide")
+
+    return address
+
+
+# ==========================
+# PAR RÉSEAU
+# ==========================
+def _check_btc(address):
+    if address[:3].lower() == "bc1":
+        return _check_segwit(address)
+
+    payload = _b58check_decode(address)
+    if payload is None or len(payload) != 21 or payload[0] not in (0x00, 0x05):
+        raise ValueError("Adresse Bitcoin invalide (base58check)")
+    return address
+
+
+def _check_tron(address):
+    payload = _b58check_decode(address)
+    if payload is None or len(payload) != 21 or payload[0] != 0x41:
+        raise ValueError("Adresse TRON invalide (base58check)")
+    return address
+
+
+_CHECKERS = {
+    "BTC": _check_btc,
+    "TRON": _check_tron,
+}
+
+
+def _check_each(checker, addresses):
+    results = {}
+    for address in addresses:
+        try:
+            results[address] = AddressCheck(address, True, normalized=checker(address))
+        except ValueError as e:
+            results[address] = AddressCheck(address, False, error=str(e))
+    return results
+
+
+# ==========================
+# API
+# ==========================
+def validate_addresses(addresses, network: str):
+    """
+    Valide un lot d'adresses d'un même réseau (chaque adresse distincte
+    une seule fois). Retourne une liste d'AddressCheck dans l'ordre des
+    entrées. Lève ValidationError si le réseau est inconnu.
+    """
+    network = (network or "").upper()
+    if network not in SUPPORTED_NETWORKS:
+        raise ValidationError("Réseau inconnu")
+
+    cleaned = [(raw or "").strip() for raw in addresses]
+    unique = [a for a in dict.fromkeys(cleaned) if a]
+
+    if network in EVM_NETWORKS:
+        results = _check_evm_batch(unique)
     else:
-        raise ValidationError("Réseau inconnu")
\ No newline at end of file
+        results = _check_each(_CHECKERS[network], unique)
+
+    empty = AddressCheck("", False, error="Adresse vide")
+    return [results[a] if a else empty for a in cleaned]
+
+
+def validate_address(address: str, network: str):
+    """
+    Validation unitaire (formulaires) ; lève ValidationError.
+    Retourne la forme canonique de l'adresse.
+    """
+    result = validate_addresses([address], network)[0]
+    if not result.valid:
+        raise ValidationError(result.error)
+    return result.normalized
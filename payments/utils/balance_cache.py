@@ -0,0 +1,69 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Sum
+
+# ======================================================
+# 🧮 CACHE DES SOLDES PAR UTILISATEUR
+# ======================================================
+# Valeur en cache : {devise: total en unités mineures (int)}.
+# La conversion (HTG, affichage) se fait à la lecture : un changement
+# de taux ne demande donc aucune invalidation.
+#
+# Toute mutation ledger réussie invalide la clé APRÈS le commit
+# (on_commit) : un rollback ne touche jamais le cache.
+
+BALANCE_CACHE_TTL = getattr(settings, "BALANCE_CACHE_TTL", 300)
+
+
+def cache_key(user_id) -> str:
+    return f"balance_summary:{user_id}"
+
+
+def get_cached_totals(user_id) -> dict:
+    """
+    {devise: montant en unités mineures} pour un utilisateur.
+    Un seul agrégat SQL en cas de cache manquant.
+    """
+    from payments.models import BalanceCurrency
+
+    key = cache_key(user_id)
+    totals = cache.get(key)
+
+    if totals is None:
+        totals = {
+            currency.lower(): total or 0
+            for currency, total in (
+                BalanceCurrency.objects
+                .filter(balance__user_id=user_id)
+                .values_list("currency")
+                .annotate(total=Sum("amount_minor"))
+            )
+        }
+        cache.set(key, totals, BALANCE_CACHE_TTL)
+
+    return totals
+
+
+def invalidate_users(user_ids):
+    keys = [cache_key(uid) for uid in set(user_ids)]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def invalidate_balances(balance_ids):
+    """
+    Même chose à partir de balance_id (UPDATE agrégés) :
+    la résolution user_id est faite après le commit, hors du chemin critique.
+    """
+    balance_ids = list(set(balance_ids))
+    if not balance_ids:
+        return
+
+    def _delete():
+        from payments.models import Balance
+
+        user_ids = Balance.objects.filter(pk__in=balance_ids).values_list("user_id", flat=True)
+        cache.delete_many([cache_key(uid) for uid in user_ids])
+
+    transaction.on_commit(_delete)
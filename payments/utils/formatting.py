@@ -1,15 +1,22 @@
 from decimal import Decimal
 
-def format_balance(value: Decimal, sci_threshold=Decimal("0.00000001"), precision=2):
+from payments.utils.minor_units import from_minor
+
+def format_balance(value: Decimal, sci_threshold=Decimal("0.00000001"), precision=2, currency=None):
     """
     Formate un solde intelligemment :
     - 0 → "0"
     - très petit → notation scientifique (5.00E-16)
     - normal → décimal lisible
+
+    Avec `currency`, un entier est lu comme un montant en unités mineures.
     """
     if value is None:
         return "0"
 
+    if currency is not None and isinstance(value, int):
+        value = from_minor(value, currency)
+
     if value == 0:
         return "0"
 
@@ -0,0 +1,107 @@
+from decimal import Decimal, ROUND_HALF_EVEN
+
+from django.core.exceptions import ValidationError
+from django.db import models
+
+# ======================================================
+# 🔢 UNITÉS MINEURES (ENTIERS)
+# ======================================================
+# Un montant est stocké comme un entier de "plus petites unités" :
+#   HTG / USD : centimes (échelle 2)
+#   JMU       : 10^-18 (les bonus descendent jusqu'à 1e-18)
+#
+# Un BIGINT plafonnerait un solde JMU à (2^63 - 1) / 10^18 ≈ 9.22 JMU :
+# les colonnes sont des NUMERIC(38, 0) (MinorAmountField), soit jusqu'à
+# 10^20 JMU, au-delà des DecimalField(30, 18) du modèle.
+
+CURRENCY_SCALES = {
+    "jmu": 18,
+    "htg": 2,
+    "usd": 2,
+}
+
+DEFAULT_SCALE = 8
+
+MINOR_MAX_DIGITS = 38
+
+MAX_MINOR = 10 ** MINOR_MAX_DIGITS - 1
+
+_FACTORS = {}
+
+
+def scale_for(currency) -> int:
+    return CURRENCY_SCALES.get((currency or "").lower(), DEFAULT_SCALE)
+
+
+def _factor(currency) -> int:
+    scale = scale_for(currency)
+    factor = _FACTORS.get(scale)
+    if factor is None:
+        factor = _FACTORS[scale] = 10 ** scale
+    return factor
+
+
+def to_minor(amount, currency) -> int:
+    """
+    Montant (Decimal, str, int) ➜ entier en unités mineures.
+    Arrondi bancaire au-delà de l'échelle de la devise.
+    """
+    if isinstance(amount, int):
+        minor = amount * _factor(currency)
+    else:
+        minor = int(
+            (Decimal(str(amount)) * _factor(currency))
+            .to_integral_value(rounding=ROUND_HALF_EVEN)
+        )
+
+    if abs(minor) > MAX_MINOR:
+        raise ValidationError("Montant hors limites")
+
+    return minor
+
+
+def from_minor(minor, currency) -> Decimal:
+    """
+    Entier en unités mineures ➜ Decimal exact (pour l'API / les templates).
+    """
+    if minor is None:
+        return Decimal("0")
+    return Decimal(int(minor)).scaleb(-scale_for(currency))
+
+
+class MinorAmountField(models.DecimalField):
+    """
+    Montant en unités mineures : NUMERIC(38, 0) en base, `int` en Python
+    (les calculs restent exacts et les F() / Sum() inchangés).
+
+    Type interne distinct de DecimalField : le convertisseur SQLite des
+    décimaux (arrondi à 15 chiffres) ne s'applique pas.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs["max_digits"] = MINOR_MAX_DIGITS
+        kwargs["decimal_places"] = 0
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        del kwargs["max_digits"]
+        del kwargs["decimal_places"]
+        return name, path, args, kwargs
+
+    def get_internal_type(self):
+        return "MinorAmountField"
+
+    def db_type(self, connection):
+        return connection.data_types["DecimalField"] % self.db_type_parameters(connection)
+
+    def from_db_value(self, value, expression, connection):
+        return None if value is None else int(value)
+
+
+def minor_value(minor):
+    """
+    Littéral SQL en unités mineures (ex : F("amount_minor") + minor_value(d)) ;
+    passé en Decimal, un entier au-delà de 2^63 reste accepté par le driver.
+    """
+    return models.Value(Decimal(int(minor)), output_field=MinorAmountField())
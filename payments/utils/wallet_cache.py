@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+# ======================================================
+# 🪙 CACHE DU WALLET PAR (UTILISATEUR, RÉSEAU)
+# ======================================================
+# Les tableaux de bord lisent le wallet à chaque affichage ; il ne
+# change presque jamais. Toute écriture sur Wallet invalide la clé
+# après le commit.
+
+# Le cache est partagé : on n'y met que des champs publics, jamais
+# encrypted_private_key. Les autres champs sont relus à la demande.
+
+WALLET_CACHE_TTL = getattr(settings, "WALLET_CACHE_TTL", 3600)
+
+WALLET_CACHE_FIELDS = ("id", "user_id", "balance_id", "network", "address", "public_key", "is_active")
+
+
+def cache_key(user_id, network) -> str:
+    return f"wallet:pub:{user_id}:{(network or '').lower()}"
+
+
+def invalidate_wallet(user_id, network):
+    key = cache_key(user_id, network)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def invalidate_wallets(pairs):
+    """
+    Variante groupée (bulk_update) : [(user_id, network), ...].
+    """
+    keys = [cache_key(user_id, network) for user_id, network in pairs]
+    transaction.on_commit(lambda: cache.delete_many(keys))
@@ -6,10 +6,11 @@ from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
-from django.http import JsonResponse, HttpResponse, HttpResponseBadRequest
+from django.http import JsonResponse, HttpResponse, HttpResponseBadRequest, StreamingHttpResponse
 from django.urls import reverse_lazy
 from django.utils import timezone
-from django.core.paginator import Paginator
+from django.utils.dateparse import parse_date
+from django.utils.decorators import method_decorator
 from django.db import transaction
 from django.conf import settings
 from users.decorators import verified_required
@@ -18,6 +19,11 @@ from .forms import (
     RechargeForm, TransactionForm, FundTransferForm, WalletForm,
     FinePaymentForm, DocumentPaymentForm, TollPaymentForm
 )
+from .idempotency import idempotent_view
+from .services.export_service import EXPORT_FORMATS, filter_transactions, iter_export
+from .services.transfer_service import TransferService
+from core.pagination import KeysetListMixin, keyset_paginate
+from core.utils import get_user_balances
 from fines.models import Fine
 
 # ---------------- WALLET ----------------
@@ -30,6 +36,7 @@ def wallet_detail(request):
 # ---------------- PAIEMENTS SPÉCIFIQUES ----------------
 @login_required
 @verified_required
+@idempotent_view("payment")
 def fine_payment_view(request):
     if request.method == 'POST':
         form = FinePaymentForm(request.POST)
@@ -46,6 +53,7 @@ def fine_payment_view(request):
 
 @login_required
 @verified_required
+@idempotent_view("payment")
 def toll_payment_view(request):
     if request.method == 'POST':
         form = TollPaymentForm(request.POST)
@@ -62,6 +70,7 @@ def toll_payment_view(request):
 
 @login_required
 @verified_required
+@idempotent_view("payment")
 def document_payment_view(request):
     if request.method == 'POST':
         form = DocumentPaymentForm(request.POST)
@@ -114,9 +123,10 @@ def pay_bill_view(request):
     return render(request, "payments/pay_bill.html", {"fines": fines, "balance": balance})
 
 # ---------------- PAYMENT CBV ----------------
-class PaymentListView(LoginRequiredMixin, ListView):
+class PaymentListView(LoginRequiredMixin, KeysetListMixin, ListView):
     model = Payment
     template_name = "payments/payment_list.html"
+    rows_template_name = "payments/partials/payment_rows.html"
     context_object_name = "payments"
 
     def get_queryset(self):
@@ -130,6 +140,7 @@ class PaymentDetailView(LoginRequiredMixin, DetailView):
     def get_object(self):
         return get_object_or_404(Payment, pk=self.kwargs["pk"], user=self.request.user)
 
+@method_decorator(idempotent_view("payment"), name="post")
 class PaymentCreateView(LoginRequiredMixin, CreateView):
     model = Payment
     template_name = "payments/payment_form.html"
@@ -177,10 +188,59 @@ class TransactionDeleteView(LoginRequiredMixin, DeleteView):
 
 @login_required
 def transaction_list(request):
-    transactions = Transaction.objects.filter(user=request.user).order_by('-created_at')
-    paginator = Paginator(transactions, 10)
-    page_obj = paginator.get_page(request.GET.get('page'))
-    return render(request, 'payments/transactions/transaction_list.html', {'page_obj': page_obj})
+    page = keyset_paginate(
+        Transaction.objects.filter(user=request.user),
+        request.GET.get('cursor'),
+        page_size=20,
+    )
+    if request.headers.get("HX-Request"):
+        return render(request, 'payments/partials/transaction_rows.html', {'page': page})
+    return render(request, 'payments/transactions/transaction_list.html', {'page': page})
+
+@login_required
+def transaction_export(request):
+    """
+    Relevé complet en flux (CSV ou JSONL).
+    Filtres : start, end (AAAA-MM-JJ), currency, type.
+    Le staff peut exporter un autre compte (user=<id>) ou tout le ledger (user=all).
+    """
+    fmt = request.GET.get('format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        return HttpResponseBadRequest("Format invalide")
+
+    dates = {}
+    for key in ('start', 'end'):
+        value = request.GET.get(key)
+        try:
+            dates[key] = parse_date(value) if value else None
+        except ValueError:
+            # Bien formée mais impossible (ex : 2024-02-30)
+            dates[key] = None
+        if value and dates[key] is None:
+            return HttpResponseBadRequest(f"Dat invalide : {key}")
+
+    queryset = Transaction.objects.filter(user=request.user)
+    target = request.GET.get('user')
+    if target and request.user.is_staff:
+        if target == 'all':
+            queryset = Transaction.objects.all()
+        elif target.isdigit():
+            queryset = Transaction.objects.filter(user_id=target)
+        else:
+            return HttpResponseBadRequest("Itilizatè invalide")
+
+    queryset = filter_transactions(
+        queryset,
+        start=dates['start'],
+        end=dates['end'],
+        currency=request.GET.get('currency'),
+        transaction_type=request.GET.get('type'),
+    )
+
+    content_type = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    response = StreamingHttpResponse(iter_export(queryset, fmt), content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="tranzaksyon.{fmt}"'
+    return response
 
 @login_required
 def transaction_detail(request, pk):
@@ -188,9 +248,10 @@ def transaction_detail(request, pk):
     return render(request, 'payments/transactions/transaction_detail.html', {'transaction': transaction})
 
 # ---------------- RECHARGE ----------------
-class RechargeListView(LoginRequiredMixin, ListView):
+class RechargeListView(LoginRequiredMixin, KeysetListMixin, ListView):
     model = Recharge
     template_name = "payments/recharges/recharge_list.html"
+    rows_template_name = "payments/partials/recharge_rows.html"
     context_object_name = "recharges"
 
     def get_queryset(self):
@@ -204,6 +265,7 @@ class RechargeDetailView(LoginRequiredMixin, DetailView):
     def get_object(self):
         return get_object_or_404(Recharge, pk=self.kwargs["pk"], user=self.request.user)
 
+@method_decorator(idempotent_view("recharge"), name="post")
 class RechargeCreateView(LoginRequiredMixin, CreateView):
     model = Recharge
     template_name = "payments/recharges/recharge_form.html"
@@ -241,38 +303,41 @@ def recharge_form(request):
     return render(request, "payments/partials/recharge_form.html", {"form": form})
 
 @login_required
+@idempotent_view("fund_transfer")
 def fund_transfer_create(request):
     if request.method == 'POST':
         form = FundTransferForm(request.POST, sender=request.user)
         if form.is_valid():
-            transfer = form.save(commit=False)
-            sender_balance = Balance.objects.filter(user=request.user).first()
-            recipient_balance = Balance.objects.filter(user=transfer.recipient).first()
-
-            if sender_balance and recipient_balance and sender_balance.htg_balance >= transfer.amount:
-                with transaction.atomic():
-                    sender_balance.htg_balance -= Decimal(transfer.amount)
-                    recipient_balance.htg_balance += Decimal(transfer.amount)
-                    sender_balance.save()
-                    recipient_balance.save()
-
-                    transfer.sender = request.user
-                    transfer.save()
-
+            data = form.cleaned_data
+            try:
+                TransferService.payout(
+                    request.user,
+                    [(data['receiver'], data['amount'])],
+                    data['currency'],
+                    method=data['method'],
+                    description=data['description'] or None,
+                )
+            except ValueError:
+                form.add_error('amount', "Solde insuffisant.")
+            else:
                 messages.success(request, "Transfert effectué avec succès.")
                 return redirect('payments:fund_transfer_form')
-            else:
-                form.add_error('amount', "Solde insuffisant.")
     else:
         form = FundTransferForm(sender=request.user)
 
     return render(request, 'payments/transfers/fund_transfer_form.html', {'form': form})
 
+@login_required
 def fund_transfer_list(request):
-    transfers = FundTransfer.objects.filter(sender=request.user).order_by('-requested_at')
-    paginator = Paginator(transfers, 10)
-    page_obj = paginator.get_page(request.GET.get('page'))
-    return render(request, 'payments/transfers/fund_transfer_list.html', {'page_obj': page_obj})
+    page = keyset_paginate(
+        FundTransfer.objects.filter(sender=request.user).select_related('receiver'),
+        request.GET.get('cursor'),
+        page_size=20,
+    )
+    context = {'page': page, 'transfers': page}
+    if request.headers.get("HX-Request"):
+        return render(request, 'payments/partials/fund_transfer_rows.html', context)
+    return render(request, 'payments/transfers/fund_transfer_list.html', context)
 
 def fund_transfer_detail(request, pk):
     transfer = get_object_or_404(FundTransfer, pk=pk, sender=request.user)
@@ -1,10 +1,19 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from .models import Recharge, Transaction, Payment, Balance
-from .serializers import RechargeSerializer, TransactionSerializer, PaymentSerializer, BalanceSerializer
+from .models import Recharge, Transaction, Payment, Balance, BalanceCurrency
+from .serializers import (
+    RechargeSerializer, TransactionSerializer, PaymentSerializer,
+    BalanceSerializer, BalanceSummaryCurrencySerializer,
+)
+from .idempotency import IdempotentCreateMixin
+from .utils.balance_cache import get_cached_totals
+from core.pagination import KeysetPagination
+from core.utils import total_htg
 
-class RechargeViewSet(viewsets.ModelViewSet):
+class RechargeViewSet(IdempotentCreateMixin, viewsets.ModelViewSet):
+    idempotency_scope = "recharge"
+    pagination_class = KeysetPagination
     serializer_class = RechargeSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -24,6 +33,7 @@ class RechargeViewSet(viewsets.ModelViewSet):
 
 
 class TransactionViewSet(viewsets.ReadOnlyModelViewSet):
+    pagination_class = KeysetPagination
     serializer_class = TransactionSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -32,6 +42,7 @@ class TransactionViewSet(viewsets.ReadOnlyModelViewSet):
 
 
 class PaymentViewSet(viewsets.ReadOnlyModelViewSet):
+    pagination_class = KeysetPagination
     serializer_class = PaymentSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -43,6 +54,24 @@ class BalanceViewSet(viewsets.ViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
     def list(self, request):
-        balance, _ = Balance.objects.get_or_create(user=request.user)
-        serializer = BalanceSerializer(balance)
-        return Response(serializer.data)
\ No newline at end of file
+        # Lu en base : la forme historique (updated_at, created_at) n'est
+        # pas dans le cache des soldes. Version en cache : summary()
+        balance, _ = Balance.objects.prefetch_related("currencies").get_or_create(user=request.user)
+        data = BalanceSerializer(balance).data
+        # Champ ajouté : le reste de la réponse est inchangé
+        data["total_htg"] = str(total_htg({c.currency: c.display_amount for c in balance.currencies.all()}))
+        return Response(data)
+
+    @action(detail=False, methods=["get"])
+    def summary(self, request):
+        # Lecture depuis le cache des soldes (invalidé à chaque mutation)
+        totals = get_cached_totals(request.user.pk)
+        currencies = [
+            BalanceCurrency(currency=currency, amount_minor=minor)
+            for currency, minor in sorted(totals.items())
+        ]
+
+        return Response({
+            "currencies": BalanceSummaryCurrencySerializer(currencies, many=True).data,
+            "total_htg": str(total_htg({c.currency: c.display_amount for c in currencies})),
+        })
\ No newline at end of file
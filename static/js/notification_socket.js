@@ -0,0 +1,87 @@
+// ======================================================
+// 🔔 NOTIFICATIONS TEMPS RÉEL (WebSocket)
+// ======================================================
+// Le serveur pousse les nouvelles notifications par lots ; la cloche
+// (#notification-badge) affiche le compteur "unread_count" envoyé avec
+// chaque message, sans recharger ni interroger la liste HTML. Le dernier
+// id connu part de data-last-id (rendu avec la page) : à la connexion
+// (?since=<id>) ou sur "resync", seules les manquées sont renvoyées.
+(function () {
+    const badge = document.getElementById("notification-badge");
+    let socket = null;
+    let retryDelay = 1000;
+    let knownId = badge ? parseInt(badge.dataset.lastId || "0", 10) : 0;
+
+    function lastId() {
+        return knownId;
+    }
+
+    function setBadge(count) {
+        if (!badge) return;
+        badge.textContent = count;
+        badge.classList.toggle("hidden", count <= 0);
+    }
+
+    function showToast(item) {
+        const toast = document.createElement("a");
+        toast.href = item.url || "#";
+        toast.className = "fixed bottom-4 right-4 z-50 bg-gray-900 text-white rounded-lg shadow-lg px-4 py-3 max-w-sm";
+        const title = document.createElement("strong");
+        title.textContent = item.title;
+        const message = document.createElement("p");
+        message.className = "text-sm";
+        message.textContent = item.message;
+        toast.append(title, message);
+        document.body.appendChild(toast);
+        setTimeout(() => toast.remove(), 5000);
+    }
+
+    function receive(items, more, unreadCount) {
+        // Le compteur serveur fait foi, même si tous les éléments sont déjà connus
+        if (typeof unreadCount === "number") setBadge(unreadCount);
+
+        const known = lastId();
+        const fresh = items.filter((item) => item.id > known);
+        if (!fresh.length) return;
+
+        knownId = fresh[fresh.length - 1].id;
+        fresh.filter((item) => !item.is_read).slice(-3).forEach(showToast);
+
+        if (more) catchUp();
+    }
+
+    function catchUp() {
+        if (socket && socket.readyState === WebSocket.OPEN) {
+            socket.send(JSON.stringify({ action: "catchup", since: lastId() }));
+        }
+    }
+
+    function connect() {
+        const scheme = window.location.protocol === "https:" ? "wss://" : "ws://";
+        const since = "?since=" + lastId();
+        socket = new WebSocket(scheme + window.location.host + "/ws/notifications/" + since);
+
+        socket.onopen = function () {
+            retryDelay = 1000;
+        };
+
+        socket.onmessage = function (e) {
+            const data = JSON.parse(e.data);
+            if (data.type === "notifications") {
+                receive(data.items, data.more, data.unread_count);
+            } else if (data.type === "resync") {
+                catchUp();
+            } else if (data.type === "message") {
+                showToast(data);
+            }
+        };
+
+        socket.onclose = function () {
+            // Reconnexion avec délai croissant (max 30 s)
+            setTimeout(connect, retryDelay);
+            retryDelay = Math.min(retryDelay * 2, 30000);
+        };
+    }
+
+    connect();
+})();
@@ -1,16 +1,33 @@
+import logging
+
+from django.db import transaction
+
 from tolls.models import TollDetection
-from tolls.services.toll_processing_service import process_toll_detection
+from vehicles.models import Vehicle
+
+logger = logging.getLogger(__name__)
+
+
+def _wake_settlement():
+    from tolls.tasks import settle_pending_toll_detections
+
+    try:
+        settle_pending_toll_detections.delay()
+    except Exception:
+        # Broker indisponible : la tâche périodique prendra le relais
+        logger.warning("Péages : réveil du règlement impossible", exc_info=True)
+
 
 def register_toll_detection(plate_number, booth):
+    """
+    Enregistre un passage ; le débit est fait par lots par
+    settle_pending_toll_detections, réveillée après le commit (et
+    relancée périodiquement pour les passages encore impayés).
+    """
     detection = TollDetection.objects.create(
-        plate_number=plate_number,
+        vehicle=Vehicle.objects.filter(plate_number=plate_number).first(),
         booth=booth
     )
+    transaction.on_commit(_wake_settlement)
 
-    try:
-        process_toll_detection(detection)
-    except Exception:
-        # log / notification / traitement différé
-        pass
-
-    return detection
\ No newline at end of file
+    return detection
@@ -1,39 +1,135 @@
+from collections import defaultdict
+from decimal import Decimal
+
 from django.db import transaction
-from vehicles.models import Vehicle
-from payments.models import Payment
-from payments.services.balance_service import debit
+from django.utils import timezone
+
+from payments.models import BalanceCurrency, Payment, SystemAccountShard, Transaction
+from payments.services.ledger_service import LedgerEntry, LedgerService
+from tolls.models import TollBooth, TollDetection
+
+
+def _payer(detection):
+    booth = detection.booth
+    if booth.driver_id:
+        return booth.driver
+    vehicle = detection.vehicle or booth.vehicle
+    return vehicle.owner if vehicle else None
 
-def process_toll_detection(detection):
-    if detection.processed:
-        return None
 
-    # 1️⃣ Trouver le véhicule
-    try:
-        vehicle = Vehicle.objects.select_related("owner").get(
-            plate_number=detection.plate_number
+def _post_settlement(settled, entries):
+    """
+    Débite les péages réglés, crée leurs Payment et marque
+    détections / cabines comme payées. Lève ValueError si un solde
+    ne suffit plus.
+    """
+    with transaction.atomic():
+        txs = LedgerService.post_batch(
+            entries,
+            source=Transaction.SYSTEM,
+            bonus_type=Transaction.PAYMENT,
+            system_account=SystemAccountShard.REVENUE,
         )
-    except Vehicle.DoesNotExist:
-        raise ValueError("Véhicule inconnu")
 
-    user = vehicle.owner
-    amount = detection.booth.price  # le péage décide du prix
+        now = timezone.now()
+        Payment.objects.bulk_create([
+            Payment(
+                user_id=tx.user_id,
+                payment_type=Payment.TYPE_TOLL,
+                amount=detection.booth.toll.amount,
+                currency=tx.currency,
+                is_paid=True,
+                transaction=tx,
+                status=Payment.STATUS_COMPLETED,
+                metadata={"toll_id": detection.booth.toll_id, "detection_id": detection.id},
+                paid_at=now,
+            )
+            for detection, tx in zip(settled, txs)
+        ])
+
+        TollDetection.objects.filter(
+            pk__in=[d.pk for d in settled]
+        ).update(processed=True)
+
+        TollBooth.objects.filter(
+            pk__in={d.booth_id for d in settled}
+        ).update(is_paid=True)
 
+
+def settle_toll_detections(detections):
+    """
+    Règle un lot de détections en une seule écriture ledger groupée.
+
+    Les détections sont verrouillées avant la lecture des soldes : deux
+    workers ne règlent jamais la même. Les détections dont le payeur n'a
+    pas assez de solde restent non traitées (elles seront reprises ou
+    converties en dette).
+    Retourne la liste des détections réglées.
+    """
     with transaction.atomic():
-        # 2️⃣ Déduire le solde
-        debit(user, amount)
-
-        # 3️⃣ Créer le paiement
-        payment = Payment.objects.create(
-            user=user,
-            amount=amount,
-            currency="HTG",
-            payment_type="toll",
-            status="completed",
-            reference_id=detection.id
+        detections = list(
+            TollDetection.objects
+            .select_for_update(of=("self",), skip_locked=True)
+            .select_related("booth__toll", "booth__driver", "booth__vehicle__owner", "vehicle__owner")
+            .filter(pk__in=[d.pk for d in detections], processed=False)
         )
 
-        # 4️⃣ Marquer comme traité
-        detection.processed = True
-        detection.save()
+        payers = {d.pk: _payer(d) for d in detections}
+        user_ids = {u.pk for u in payers.values() if u}
+
+        # Soldes disponibles en une requête
+        available = defaultdict(Decimal)
+        for user_id, currency, amount in (
+            BalanceCurrency.objects
+            .filter(balance__user_id__in=user_ids)
+            .values_list("balance__user_id", "currency", "amount")
+        ):
+            available[(user_id, currency)] = amount
+
+        settled, entries = [], []
+        for detection in detections:
+            user = payers[detection.pk]
+            toll = detection.booth.toll
+            key = (user.pk, toll.currency) if user else None
+
+            if not user or available[key] < toll.amount:
+                continue
+
+            available[key] -= toll.amount
+            settled.append(detection)
+            entries.append(LedgerEntry(
+                user=user,
+                currency=toll.currency,
+                amount=-toll.amount,
+                metadata={"toll_id": toll.id, "detection_id": detection.id},
+                description=f"Peyaj {toll.name}",
+            ))
+
+        if not settled:
+            return []
+
+        try:
+            _post_settlement(settled, entries)
+            return settled
+        except ValueError:
+            # Un solde a baissé entre la lecture et l'UPDATE (autre débit
+            # concurrent) : on retombe sur un règlement par détection
+            pass
+
+        done = []
+        for detection, entry in zip(settled, entries):
+            try:
+                _post_settlement([detection], [entry])
+            except ValueError:
+                continue
+            done.append(detection)
+
+    return done
+
+
+def process_toll_detection(detection):
+    if detection.processed:
+        return None
 
-        return payment
\ No newline at end of file
+    settled = settle_toll_detections([detection])
+    return settled[0] if settled else None
@@ -3,7 +3,6 @@ from celery import shared_task
 from django.utils import timezone
 from decimal import Decimal
 from .models import TollDebt
-from .signals import send_debt_warning
 
 
 @shared_task
@@ -25,6 +24,32 @@ def send_debt_reminders():
     """
     Tâche pour envoyer des rappels aux utilisateurs endettés.
     """
+    from .sign import send_debt_warning
+
     debts = TollDebt.objects.filter(is_fully_paid=False)
     for debt in debts:
-        send_debt_warning(debt.user, debt.amount_due)
\ No newline at end of file
+        send_debt_warning(debt.user, debt.amount_due)
+
+@shared_task
+def settle_pending_toll_detections(batch_size=500):
+    """
+    Règle les passages non traités par lots (une écriture ledger par lot).
+    """
+    from .models import TollDetection
+    from .services.toll_processing_service import settle_toll_detections
+
+    last_id = 0
+    settled = 0
+    while True:
+        batch = list(
+            TollDetection.objects
+            .filter(processed=False, id__gt=last_id)
+            .order_by("id")[:batch_size]
+        )
+        if not batch:
+            break
+
+        last_id = batch[-1].id
+        settled += len(settle_toll_detections(batch))
+
+    return settled
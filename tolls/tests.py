@@ -1,3 +1,94 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.conf import settings
 from django.test import TestCase
 
-# Create your tests here.
+from payments.models import Payment
+from payments.services.balance_service import BalanceService
+from payments.services.ledger_service import LedgerService
+from tolls.models import Toll, TollBooth, TollDetection
+from tolls.services.toll_detection_service import register_toll_detection
+from tolls.services.toll_processing_service import settle_toll_detections
+from tolls.tasks import settle_pending_toll_detections
+from vehicles.models import Vehicle
+
+User = get_user_model()
+
+
+class SettleTollDetectionsTest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="peyaj@test.com", password="test1234", phone="+50934600001"
+        )
+        BalanceService.credit(self.user, Decimal("100"), "htg")
+
+        vehicle = Vehicle.objects.create(
+            owner=self.user, plate_number="AA-00001", serial_number="SN-00001",
+            brand="Toyota", model="Hilux", year=2020,
+        )
+        # bulk_create : les signaux de notification de création sont hors sujet
+        toll, = Toll.objects.bulk_create([Toll(name="Pòs 1", amount=Decimal("30"), currency="htg")])
+        self.detections = TollDetection.objects.bulk_create([
+            TollDetection(
+                vehicle=vehicle,
+                booth=TollBooth.objects.create(toll=toll, vehicle=vehicle, booth_number=str(i)),
+            )
+            for i in range(3)
+        ])
+
+    def test_batch_creates_payments(self):
+        settled = settle_toll_detections(self.detections)
+
+        self.assertEqual(len(settled), 3)
+        payments = Payment.objects.filter(user=self.user, payment_type=Payment.TYPE_TOLL)
+        self.assertEqual(payments.count(), 3)
+        self.assertTrue(all(p.transaction_id and p.is_paid for p in payments))
+        self.assertFalse(TollDetection.objects.filter(processed=False).exists())
+
+        # Déjà traitées : rien à régler une seconde fois
+        self.assertEqual(settle_toll_detections(self.detections), [])
+
+    def test_race_falls_back_to_one_by_one(self):
+        real_post_batch = LedgerService.post_batch
+        calls = []
+
+        def racing_post_batch(entries, **kwargs):
+            calls.append(len(entries))
+            if len(calls) == 1:
+                # Débit concurrent entre la lecture des soldes et l'UPDATE
+                raise ValueError("Solde insuffisant")
+            return real_post_batch(entries, **kwargs)
+
+        with mock.patch.object(LedgerService, "post_batch", side_effect=racing_post_batch):
+            settled = settle_toll_detections(self.detections)
+
+        self.assertEqual(calls, [3, 1, 1, 1])
+        self.assertEqual(len(settled), 3)
+        self.assertEqual(Payment.objects.filter(payment_type=Payment.TYPE_TOLL).count(), 3)
+
+
+class SettlePendingTollDetectionsTaskTest(SettleTollDetectionsTest):
+
+    def test_task_is_scheduled(self):
+        entries = {e["task"] for e in settings.CELERY_BEAT_SCHEDULE.values()}
+        self.assertIn("tolls.tasks.settle_pending_toll_detections", entries)
+
+    def test_task_settles_pending_detections(self):
+        self.assertEqual(settle_pending_toll_detections(batch_size=2), 3)
+        self.assertEqual(
+            Payment.objects.filter(user=self.user, payment_type=Payment.TYPE_TOLL).count(), 3
+        )
+        self.assertFalse(TollDetection.objects.filter(processed=False).exists())
+
+    def test_registration_wakes_the_batch_task(self):
+        booth = self.detections[0].booth
+        with mock.patch.object(settle_pending_toll_detections, "delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                detection = register_toll_detection("AA-00001", booth)
+
+        delay.assert_called_once_with()
+        self.assertEqual(detection.vehicle.plate_number, "AA-00001")
+        self.assertFalse(detection.processed)
@@ -1,10 +1,12 @@
+import logging
 import secrets
 import phonenumbers
 from django.core.exceptions import ValidationError
-from django.core.mail import send_mail
 from django.conf import settings
 import requests
 
+logger = logging.getLogger(__name__)
+
 # Utility Functions
 
 def can_access_client(user, client):
@@ -56,9 +58,10 @@ def send_email_safe(
     fail_silently=True,
 ):
     """
-    Envoi d'email sécurisé.
+    Envoi d'email sécurisé, mis en file (envoyé par le worker après le commit).
     Accepte soit un user, soit une adresse email directe.
     """
+    from notifications.services.email_queue import queue_email
 
     recipient = None
 
@@ -72,16 +75,10 @@ def send_email_safe(
         return False
 
     try:
-        send_mail(
-            subject=subject,
-            message=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[recipient],
-            fail_silently=fail_silently,
-        )
+        queue_email(recipient, subject, message)
         return True
     except Exception as e:
-        logger.exception("Erreur lors de l'envoi email : %s", e)
+        logger.exception("Erreur lors de la mise en file email : %s", e)
         if not fail_silently:
             raise
         return False
@@ -7,6 +7,7 @@ from django.http import JsonResponse, HttpResponseBadRequest, HttpResponse
 from django.views.decorators.http import require_POST
 from .utils import can_access_client
 from django.utils.http import url_has_allowed_host_and_scheme
+from django.db import transaction
 from django.db.models import Q
 from django.core.paginator import Paginator
 from .forms import (
@@ -44,7 +45,9 @@ def register_user(request):
             user = form.save(commit=False)
             if referrer:
                 user.referred_by = referrer
-            user.save()
+            # Notifications des signaux d'inscription : un seul INSERT au commit
+            with transaction.atomic():
+                user.save()
 
             messages.success(request, "Kont ou kreye avèk siksè.")
             return redirect("login")
@@ -70,7 +73,9 @@ def register_business(request):
             user = form.save(commit=False)
             if referrer:
                 user.referred_by = referrer
-            user.save()
+            # Notifications des signaux d'inscription : un seul INSERT au commit
+            with transaction.atomic():
+                user.save()
 
             messages.success(request, "Kont biznis lan kreye avèk siksè.")
             return redirect("login")